@@ -0,0 +1,46 @@
+"""invitation and access-edge indexes
+
+Revision ID: 20261017_0013
+Revises: 20251231_0012
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017_0013"
+down_revision = "20251231_0012"
+branch_labels = None
+depends_on = None
+
+PENDING = sa.text("status = 'pending'")
+
+
+def upgrade() -> None:
+	# Keep the most recently updated edge per (recipient, caregiver) before enforcing uniqueness
+	op.execute(
+		"""
+		DELETE FROM recipient_caregiver_access a
+		USING recipient_caregiver_access b
+		WHERE a.recipient_id = b.recipient_id
+		  AND a.caregiver_id = b.caregiver_id
+		  AND (COALESCE(a.updated_at, a.created_at), a.id) < (COALESCE(b.updated_at, b.created_at), b.id)
+		"""
+	)
+	# Also serves recipient_id-only lookups (leading column)
+	op.create_unique_constraint("uq_rca_recipient_caregiver", "recipient_caregiver_access", ["recipient_id", "caregiver_id"])
+	op.create_index("ix_rca_caregiver_id", "recipient_caregiver_access", ["caregiver_id"])
+
+	# Pending lists filter on one side (or invited_email) and order by (created_at, id)
+	op.create_index("ix_invitations_caregiver_pending", "invitations", ["caregiver_id", "created_at", "id"], postgresql_where=PENDING)
+	op.create_index("ix_invitations_recipient_pending", "invitations", ["recipient_id", "created_at", "id"], postgresql_where=PENDING)
+	op.create_index("ix_invitations_invited_email_pending", "invitations", ["invited_email"], postgresql_where=PENDING)
+
+
+def downgrade() -> None:
+	op.drop_index("ix_invitations_invited_email_pending", table_name="invitations")
+	op.drop_index("ix_invitations_recipient_pending", table_name="invitations")
+	op.drop_index("ix_invitations_caregiver_pending", table_name="invitations")
+	op.drop_index("ix_rca_caregiver_id", table_name="recipient_caregiver_access")
+	op.drop_constraint("uq_rca_recipient_caregiver", "recipient_caregiver_access", type_="unique")
@@ -0,0 +1,34 @@
+"""keyset pagination indexes
+
+Revision ID: 20261017_0014
+Revises: 20261017_0013
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017_0014"
+down_revision = "20261017_0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+	# Cursor pages filter on the parent and seek on (created_at, id): with the parent as the
+	# leading column each page is an index range scan that stops after LIMIT rows
+	op.create_index("ix_group_memberships_group_created", "group_memberships", ["group_id", "created_at", "id"])
+	op.create_index("ix_group_payment_codes_group_created", "group_payment_codes", ["group_id", "created_at", "id"])
+	# Partial, like the listings: soft-deleted dependents and non-pending invites are never paged
+	op.create_index("ix_dependents_group_created", "dependents", ["group_id", "created_at", "id"], postgresql_where=sa.text("deleted_at IS NULL"))
+	op.create_index("ix_group_member_invites_group_created_pending", "group_member_invites", ["group_id", "created_at", "id"], postgresql_where=sa.text("status = 'pending'"))
+	op.create_index("ix_users_created_at_id", "users", ["created_at", "id"])
+
+
+def downgrade() -> None:
+	op.drop_index("ix_users_created_at_id", table_name="users")
+	op.drop_index("ix_group_member_invites_group_created_pending", table_name="group_member_invites")
+	op.drop_index("ix_dependents_group_created", table_name="dependents")
+	op.drop_index("ix_group_payment_codes_group_created", table_name="group_payment_codes")
+	op.drop_index("ix_group_memberships_group_created", table_name="group_memberships")
@@ -4,12 +4,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-from starlette.middleware.base import BaseHTTPMiddleware
-import uuid
 
 from backend.core.constants import API_TITLE, Cors, Keys, Errors, Headers
 from backend.core.settings import get_settings
+from backend.core.exceptions import ServiceUnavailableError
 from backend.rate_limit import limiter
+from backend.utils.uploads import UploadSizeLimitMiddleware
+from backend.utils.request_id import RequestIdMiddleware
 try:
     from slowapi.errors import RateLimitExceeded
 except Exception:
@@ -54,14 +55,9 @@ if not _settings.invite_signing_secret:
 if not _settings.email_from:
     logger.warning("EMAIL_FROM is not set; email sender will default to placeholder.")
 
-class RequestIdMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = request.headers.get(Headers.REQUEST_ID) or str(uuid.uuid4())
-        request.state.request_id = request_id
-        response = await call_next(request)
-        response.headers[Headers.REQUEST_ID] = request_id
-        return response
-
+# Reject oversized multipart uploads while streaming, before the form is parsed (inside request-id)
+app.add_middleware(UploadSizeLimitMiddleware)
+# Pure ASGI (headers only): no per-request task + memory stream as with BaseHTTPMiddleware; streaming bodies pass through
 app.add_middleware(RequestIdMiddleware)
 
 # Exception handlers
@@ -70,6 +66,12 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     body = {Keys.MESSAGE: Errors.INVALID_PAYLOAD, Keys.DETAILS: exc.errors(), Keys.REQUEST_ID: getattr(request.state, "request_id", None)}
     return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=body)
 
+@app.exception_handler(ServiceUnavailableError)
+async def service_unavailable_handler(request: Request, exc: ServiceUnavailableError):
+    # Fast rejection when a bounded pool (e.g. password hashing) is saturated
+    body = {Keys.MESSAGE: exc.code, Keys.RETRY_AFTER: str(exc.retry_after), Keys.REQUEST_ID: getattr(request.state, "request_id", None)}
+    return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=body, headers={Headers.RETRY_AFTER: str(exc.retry_after)})
+
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(request: Request, exc: Exception):
     logger.exception("unhandled exception", extra={Keys.REQUEST_ID: getattr(request.state, "request_id", None)})
@@ -129,6 +131,55 @@ def maybe_create_tables() -> None:
         Base.metadata.create_all(bind=engine)
 
 
+@app.on_event("startup")
+def init_token_codec() -> None:
+    from backend.security.tokens import get_token_codec
+
+    # Key HMAC states once; a bad auth_active_kid fails the boot instead of the first login
+    get_token_codec()
+
+
+@app.on_event("startup")
+def init_kdf_policy() -> None:
+    from backend.security.passwords import current_policy
+
+    # Validate the hashing policy once; a scheme or scrypt cost that cannot hash fails the boot
+    current_policy()
+
+
+@app.on_event("startup")
+def init_dlp_clients() -> None:
+    from backend.core.constants import DlpProviders
+    from backend.services.dlp_client_pool import init_dlp_client_pool
+
+    # The local provider needs no clients
+    if (get_settings().dlp_provider or DlpProviders.GOOGLE).lower() == DlpProviders.GOOGLE:
+        init_dlp_client_pool()
+
+
+@app.on_event("startup")
+def init_services() -> None:
+    from backend.container import init_container
+
+    # After the DLP pool: the Google provider inside DlpService captures it at construction
+    init_container()
+
+
+@app.on_event("shutdown")
+async def close_db_resources() -> None:
+    from backend.db.database import dispose_engines
+    from backend.db.runner import shutdown_db_executor
+    from backend.services.dlp_client_pool import close_dlp_client_pool
+    from backend.services.kdf_pool import shutdown_kdf_pool
+    from backend.container import close_container
+
+    await dispose_engines()
+    shutdown_db_executor()
+    close_dlp_client_pool()
+    shutdown_kdf_pool()
+    close_container()
+
+
 # OpenAPI: add global bearer auth
 def _custom_openapi():
     if app.openapi_schema:
@@ -5,6 +5,7 @@ from uuid import uuid4
 
 from backend.core.settings import get_settings
 from backend.core.constants import DocKeys, MimeTypes
+from backend.utils.uploads import ByteSource
 
 
 class VertexRagClient:
@@ -24,7 +25,7 @@ class VertexRagClient:
         *,
         corpus_uri: str,
         file_name: str,
-        content: bytes,
+        content: ByteSource,
         mime_type: Optional[str] = None,
     ) -> Dict[str, Any]:
         # STUB: Return a mock doc id
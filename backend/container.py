@@ -0,0 +1,229 @@
+"""
+Application-scoped service container.
+
+Services and repositories are stateless (they take the session per call), so
+one instance of each serves every request. The container builds them once,
+wires shared repositories into the services that need them, and owns shared
+clients (e.g. the Vertex RAG client behind DocsService). The router
+providers in ``routers/deps.py`` return these instances instead of
+constructing new objects per request.
+
+Lifecycle: ``init_container()`` at app startup (eager, so wiring errors fail
+the boot), ``close_container()`` at shutdown.
+
+Constructor DI is unchanged: services still accept their repositories and
+clients. To swap one in tests, either build a container with
+``ServiceContainer(overrides={"access_repo": FakeRepo()})`` and install it
+with ``set_container``, or temporarily ``with get_container().override(...)``.
+Dependents are rebuilt against the override. ``app.dependency_overrides`` on
+the providers keeps working as well.
+"""
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, TypeVar
+
+from backend.clients import VertexRagClient
+from backend.repositories.access_repo import AccessRepository
+from backend.repositories.dependents_repo import DependentsRepository
+from backend.repositories.group_member_invites_repo import GroupMemberInvitesRepository
+from backend.repositories.group_memberships_repo import GroupMembershipsRepository
+from backend.repositories.groups_repo import GroupsRepository
+from backend.repositories.invitations_repo import InvitationsRepository
+from backend.repositories.payment_codes_repo import PaymentCodesRepository
+from backend.services import DocsService, IngestionService
+from backend.services.access_service import AccessService
+from backend.services.dependents_service import DependentsService
+from backend.services.dlp_service import DlpService
+from backend.services.group_member_invites_service import GroupMemberInvitesService
+from backend.services.groups_service import GroupsService, MembershipsService
+from backend.services.invitations_service import InvitationsService
+from backend.services.payment_codes_service import PaymentCodesService
+
+
+T = TypeVar("T")
+
+
+class ServiceContainer:
+	# Resolved eagerly by start(); every property below must be listed
+	PROVIDED = (
+		"groups_repo",
+		"memberships_repo",
+		"payment_codes_repo",
+		"invitations_repo",
+		"access_repo",
+		"group_member_invites_repo",
+		"dependents_repo",
+		"rag_client",
+		"groups_service",
+		"memberships_service",
+		"payment_codes_service",
+		"invitations_service",
+		"access_service",
+		"docs_service",
+		"ingestion_service",
+		"dlp_service",
+		"group_member_invites_service",
+		"dependents_service",
+	)
+
+	def __init__(self, overrides: Optional[Mapping[str, Any]] = None) -> None:
+		unknown = set(overrides or ()) - set(self.PROVIDED)
+		if unknown:
+			raise ValueError(f"unknown container entries: {sorted(unknown)}")
+		self._overrides: Dict[str, Any] = dict(overrides or {})
+		self._instances: Dict[str, Any] = {}
+		self._lock = threading.RLock()
+
+	def _provide(self, name: str, build: Callable[[], T]) -> T:
+		if name in self._overrides:
+			return self._overrides[name]
+		instance = self._instances.get(name)
+		if instance is None:
+			with self._lock:
+				instance = self._instances.get(name)
+				if instance is None:
+					instance = self._instances[name] = build()
+		return instance
+
+	def start(self) -> None:
+		for name in self.PROVIDED:
+			getattr(self, name)
+
+	def close(self) -> None:
+		with self._lock:
+			instances, self._instances = self._instances, {}
+		for instance in instances.values():
+			close = getattr(instance, "close", None)
+			if callable(close):
+				close()
+
+	@contextmanager
+	def override(self, **instances: Any) -> Iterator["ServiceContainer"]:
+		"""Swap entries for the duration of the block; built dependents are rebuilt against them."""
+		unknown = set(instances) - set(self.PROVIDED)
+		if unknown:
+			raise ValueError(f"unknown container entries: {sorted(unknown)}")
+		with self._lock:
+			saved_overrides, saved_instances = dict(self._overrides), self._instances
+			self._overrides.update(instances)
+			self._instances = {}
+		try:
+			yield self
+		finally:
+			with self._lock:
+				self._overrides, self._instances = saved_overrides, saved_instances
+
+	# Repositories
+	@property
+	def groups_repo(self) -> GroupsRepository:
+		return self._provide("groups_repo", GroupsRepository)
+
+	@property
+	def memberships_repo(self) -> GroupMembershipsRepository:
+		return self._provide("memberships_repo", GroupMembershipsRepository)
+
+	@property
+	def payment_codes_repo(self) -> PaymentCodesRepository:
+		return self._provide("payment_codes_repo", PaymentCodesRepository)
+
+	@property
+	def invitations_repo(self) -> InvitationsRepository:
+		return self._provide("invitations_repo", InvitationsRepository)
+
+	@property
+	def access_repo(self) -> AccessRepository:
+		return self._provide("access_repo", AccessRepository)
+
+	@property
+	def group_member_invites_repo(self) -> GroupMemberInvitesRepository:
+		return self._provide("group_member_invites_repo", GroupMemberInvitesRepository)
+
+	@property
+	def dependents_repo(self) -> DependentsRepository:
+		return self._provide("dependents_repo", DependentsRepository)
+
+	# Shared clients
+	@property
+	def rag_client(self) -> VertexRagClient:
+		return self._provide("rag_client", VertexRagClient)
+
+	# Services
+	@property
+	def groups_service(self) -> GroupsService:
+		return self._provide("groups_service", lambda: GroupsService(groups_repo=self.groups_repo, members_repo=self.memberships_repo))
+
+	@property
+	def memberships_service(self) -> MembershipsService:
+		return self._provide("memberships_service", lambda: MembershipsService(groups_repo=self.groups_repo, memberships_repo=self.memberships_repo))
+
+	@property
+	def payment_codes_service(self) -> PaymentCodesService:
+		return self._provide(
+			"payment_codes_service",
+			lambda: PaymentCodesService(repo=self.payment_codes_repo, members=self.memberships_repo, groups=self.groups_repo),
+		)
+
+	@property
+	def invitations_service(self) -> InvitationsService:
+		return self._provide("invitations_service", lambda: InvitationsService(repo=self.invitations_repo, access_repo=self.access_repo))
+
+	@property
+	def access_service(self) -> AccessService:
+		return self._provide("access_service", lambda: AccessService(repo=self.access_repo))
+
+	@property
+	def docs_service(self) -> DocsService:
+		return self._provide("docs_service", lambda: DocsService(client=self.rag_client))
+
+	@property
+	def ingestion_service(self) -> IngestionService:
+		return self._provide("ingestion_service", IngestionService)
+
+	@property
+	def dlp_service(self) -> DlpService:
+		return self._provide("dlp_service", DlpService)
+
+	@property
+	def group_member_invites_service(self) -> GroupMemberInvitesService:
+		return self._provide(
+			"group_member_invites_service",
+			lambda: GroupMemberInvitesService(repo=self.group_member_invites_repo, memberships=self.memberships_repo),
+		)
+
+	@property
+	def dependents_service(self) -> DependentsService:
+		return self._provide("dependents_service", lambda: DependentsService(repo=self.dependents_repo, memberships=self.memberships_repo))
+
+
+_container: Optional[ServiceContainer] = None
+_container_lock = threading.Lock()
+
+
+def get_container() -> ServiceContainer:
+	global _container
+	if _container is None:
+		with _container_lock:
+			if _container is None:
+				_container = ServiceContainer()
+	return _container
+
+
+def set_container(container: Optional[ServiceContainer]) -> None:
+	"""Install a container (e.g. one built with overrides in tests); None resets to the default."""
+	global _container
+	_container = container
+
+
+def init_container() -> ServiceContainer:
+	container = get_container()
+	container.start()
+	return container
+
+
+def close_container() -> None:
+	global _container
+	if _container is not None:
+		_container.close()
+	_container = None
@@ -74,6 +74,7 @@ class Routes:
     # Health
     HEALTHZ: Final[str] = "/healthz"
     READYZ: Final[str] = "/readyz"
+    METRICS: Final[str] = "/metrics"
     # Common suffixes
     EMBEDDINGS: Final[str] = "/embeddings"
     DOWNLOAD: Final[str] = "/download"
@@ -166,6 +167,7 @@ class Summaries:
     INCIDENT_GET: Final[str] = "Get details of a reported incident"
     HEALTHZ: Final[str] = "Liveness probe"
     READYZ: Final[str] = "Readiness probe"
+    METRICS: Final[str] = "In-process counters and gauges"
     GROUPS_LIST: Final[str] = "List groups for current user"
     GROUP_CREATE: Final[str] = "Create a new group"
     GROUP_GET: Final[str] = "Get a specific group"
@@ -243,13 +245,19 @@ class AccessLevel:
 class Auth:
     JWT_HEADER_ALG: Final[str] = "alg"
     JWT_HEADER_TYP: Final[str] = "typ"
+    JWT_HEADER_KID: Final[str] = "kid"
     JWT_ALG_HS256: Final[str] = "HS256"
     JWT_TYP_JWT: Final[str] = "JWT"
     JWT_CLAIM_SUB: Final[str] = "sub"
     JWT_CLAIM_IAT: Final[str] = "iat"
     JWT_CLAIM_EXP: Final[str] = "exp"
     PASSWORD_SCHEME_PBKDF2_SHA256: Final[str] = "pbkdf2_sha256"
+    PASSWORD_SCHEME_SCRYPT: Final[str] = "scrypt"
+    PASSWORD_SCHEMES: Final[tuple[str, ...]] = (PASSWORD_SCHEME_PBKDF2_SHA256, PASSWORD_SCHEME_SCRYPT)
     PBKDF2_HASH_NAME: Final[str] = "sha256"
+    # Stored for auto-created accounts whose password is never disclosed; never verifies
+    PASSWORD_UNUSABLE_PREFIX: Final[str] = "!"
+    DEPENDENT_TEMP_PASSWORD: Final[str] = "TempPassw0rd!"
 
 
 class Errors:
@@ -261,6 +269,7 @@ class Errors:
     MISSING_TOKEN: Final[str] = "missing_token"
     INVALID_TOKEN: Final[str] = "invalid_token"
     INVALID_PAYLOAD: Final[str] = "invalid_payload"
+    INVALID_CURSOR: Final[str] = "invalid_cursor"
     RECIPIENT_NOT_FOUND: Final[str] = "recipient_not_found"
     CHAT_HISTORY_URI_NOT_SET: Final[str] = "chat_history_uri_not_set"
     GROUP_NOT_FOUND: Final[str] = "group_not_found"
@@ -278,6 +287,7 @@ class Errors:
     PAYMENT_CODE_NOT_FOUND: Final[str] = "payment_code_not_found"
     PAYMENT_CODE_EXPIRED: Final[str] = "payment_code_expired"
     PAYMENT_CODE_REDEEMED_ALREADY: Final[str] = "payment_code_redeemed_already"
+    AUTH_BUSY: Final[str] = "auth_busy"
 
 class ErrorCodes:
     # Upstream/provider errors
@@ -296,6 +306,9 @@ class Defaults:
 class Upload:
     # Max file size for uploads (in MB)
     MAX_UPLOAD_MB: Final[int] = 15
+    BYTES_PER_MB: Final[int] = 1024 * 1024
+    # Allowance for multipart boundaries/part headers on top of the file limit (body size cap)
+    MULTIPART_OVERHEAD_BYTES: Final[int] = 64 * 1024
 
 class Fields:
     ID: Final[str] = "id"
@@ -326,6 +339,7 @@ class Keys:
     MESSAGE: Final[str] = "message"
     ITEMS: Final[str] = "items"
     TOTAL: Final[str] = "total"
+    NEXT_CURSOR: Final[str] = "next_cursor"
     DATA: Final[str] = "data"
     STATUS: Final[str] = "status"
     ACCEPT_URL: Final[str] = "acceptUrl"
@@ -356,6 +370,12 @@ class Keys:
     USER_ID: Final[str] = "userId"
     GROUP_ID: Final[str] = "groupId"
     RESULTS: Final[str] = "results"
+    COUNTERS: Final[str] = "counters"
+    GAUGES: Final[str] = "gauges"
+    HISTOGRAMS: Final[str] = "histograms"
+    COUNT: Final[str] = "count"
+    SUM: Final[str] = "sum"
+    BUCKETS: Final[str] = "buckets"
     SENDER_ID: Final[str] = "sender_id"
     SENDER_EMAIL: Final[str] = "sender_email"
     SENDER_FULL_NAME: Final[str] = "sender_full_name"
@@ -380,11 +400,14 @@ class Keys:
     # Additional keys for redaction/image previews and status
     IMAGE_BASE64: Final[str] = "imageBase64"
     CLIENT_READY: Final[str] = "clientReady"
+    PROVIDER: Final[str] = "provider"
     REDACTED_TYPES_COUNT: Final[str] = "redacted_types_count"
 
 class Headers:
     TOTAL_COUNT: Final[str] = "X-Total-Count"
     REQUEST_ID: Final[str] = "X-Request-Id"
+    RETRY_AFTER: Final[str] = "Retry-After"
+    AUTHORIZATION: Final[str] = "Authorization"
 
 
 class RagKeys:
@@ -410,8 +433,17 @@ class Dlp:
     CUSTOM_SSN_NAME: Final[str] = "CUSTOM_SSN"
     REGEX_SSN: Final[str] = r"\b\d{3}-\d{2}-\d{4}\b"
     PARENT_PATH_TEMPLATE: Final[str] = "projects/{project_id}/locations/{location}"
-    # Safety cap for in-memory text processing (bytes)
+    # Per-request text cap (bytes); larger text is chunked instead of truncated
     MAX_TEXT_BYTES: Final[int] = 1_000_000
+    # Shared client pool (one gRPC channel per client)
+    DEFAULT_CLIENT_POOL_SIZE: Final[int] = 4
+    # Chunked redaction: 4-byte worst-case UTF-8 keeps a chunk under MAX_TEXT_BYTES
+    DEFAULT_CHUNK_CHARS: Final[int] = 200_000
+    DEFAULT_CHUNK_OVERLAP_CHARS: Final[int] = 256
+    DEFAULT_CHUNK_WORKERS: Final[int] = 4
+    CHUNK_THREAD_NAME_PREFIX: Final[str] = "dlp-chunk"
+    # Token emitted by replace_with_info_type_config, e.g. [EMAIL_ADDRESS]
+    REPLACEMENT_TOKEN_REGEX: Final[str] = r"\[([A-Z0-9_]+)\]"
     # Default set of info types to inspect/redact when not explicitly configured
     DEFAULT_INFO_TYPES: Final[list[str]] = [
         "EMAIL_ADDRESS",
@@ -422,6 +454,59 @@ class Dlp:
         "US_DRIVERS_LICENSE_NUMBER",
     ]
 
+class DlpTextModes:
+    # Settings.dlp_text_mode: single = one deidentify call (findings from its output);
+    # two_call = inspect then deidentify (reference path for comparing outputs)
+    SINGLE: Final[str] = "single"
+    TWO_CALL: Final[str] = "two_call"
+
+class DlpProviders:
+    # Settings.dlp_provider: redaction engine behind DlpService
+    GOOGLE: Final[str] = "google"  # Google Cloud DLP (remote)
+    LOCAL: Final[str] = "local"    # in-process pattern engine (offline; staging/load tests/air-gapped)
+
+class DlpPrefilterPolicies:
+    # Settings.dlp_prefilter_policy: what to do when the local scan finds no candidates
+    OFF: Final[str] = "off"      # always call the provider
+    SKIP: Final[str] = "skip"    # return content unchanged, no provider call
+    DEFER: Final[str] = "defer"  # return unchanged now; confirm with the provider in the background
+
+class DlpLocal:
+    # Local candidate patterns (named groups map to DLP info type names)
+    # Only starts where a local-part run starts and takes the run atomically (lookahead +
+    # backreference, no backtracking into it), so one linear pass even over '@'-dense input;
+    # group "local" is trimmed to EMAIL_LOCAL_MAX_CHARS
+    REGEX_EMAIL: Final[str] = r"(?<![\w.%+-])(?=(?P<local>[\w.%+-]+))(?P=local)@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}"
+    REGEX_CARD: Final[str] = r"\b\d(?:[ -]?\d){12,18}\b"
+    REGEX_PHONE: Final[str] = r"(?:\+?1[-.\s]?)?(?:\(\d{3}\)\s?|\b\d{3}[-.\s])\d{3}[-.\s]\d{4}\b"
+    REGEX_DATE_NUMERIC: Final[str] = r"\b(?:\d{1,2}[/-]\d{1,2}[/-](?:\d{4}|\d{2})|\d{4}-\d{2}-\d{2})\b"
+    REGEX_DATE_NAMED: Final[str] = r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}\b"
+    # Long digit runs, optionally after a 1-2 letter prefix (license/record numbers); the prefix
+    # is matched by lookbehind so the scan can start on the first digit
+    REGEX_ID_NUMBER: Final[str] = r"(?:\b|(?<=\b[A-Za-z])|(?<=\b[A-Za-z]{2}))\d{7,12}\b"
+    # Scan gates: the digit-led pass only tries positions starting with one of these,
+    # the named-date pass only capitalized month initials
+    DIGIT_LEAD_LOOKAHEAD: Final[str] = r"(?=[\d(+])"
+    MONTH_LEAD_LOOKAHEAD: Final[str] = r"(?=[JFMASOND])"
+    # Longest local part reported before an '@' (RFC 5321 limit)
+    EMAIL_LOCAL_MAX_CHARS: Final[int] = 64
+    GROUP_INFO_TYPES: Final[dict[str, str]] = {
+        "SSN": "US_SOCIAL_SECURITY_NUMBER",
+        "CARD": "CREDIT_CARD_NUMBER",
+        "PHONE": "PHONE_NUMBER",
+        "EMAIL": "EMAIL_ADDRESS",
+        "DATE": "DATE",
+        "ID": "US_DRIVERS_LICENSE_NUMBER",
+    }
+    # Local provider: configured info type names each local type may be reported as (first configured wins)
+    INFO_TYPE_ALIASES: Final[dict[str, tuple[str, ...]]] = {
+        "US_SOCIAL_SECURITY_NUMBER": ("US_SOCIAL_SECURITY_NUMBER", "CUSTOM_SSN"),
+        "DATE": ("DATE", "DATE_OF_BIRTH"),
+    }
+    # OCR (optional, local image redaction): min word confidence and box padding in pixels
+    OCR_MIN_CONFIDENCE: Final[float] = 30.0
+    OCR_BOX_PADDING_PX: Final[int] = 2
+
 class DlpReq:
     # Request/field keys for Google DLP JSON payloads
     PARENT: Final[str] = "parent"
@@ -432,6 +517,8 @@ class DlpReq:
     TYPE_: Final[str] = "type_"
     DATA: Final[str] = "data"
     INFO_TYPES: Final[str] = "info_types"
+    INFO_TYPE: Final[str] = "info_type"
+    NAME: Final[str] = "name"
     MIN_LIKELIHOOD: Final[str] = "min_likelihood"
     INCLUDE_QUOTE: Final[str] = "include_quote"
     CUSTOM_INFO_TYPES: Final[str] = "custom_info_types"
@@ -443,6 +530,76 @@ class DlpReq:
     TRANSFORMATIONS: Final[str] = "transformations"
     DEIDENTIFY_CONFIG: Final[str] = "deidentify_config"
 
+class Crypto:
+    GCM_NONCE_BYTES: Final[int] = 12
+    GCM_TAG_BYTES: Final[int] = 16
+    AES_256_KEY_BYTES: Final[int] = 32
+
+class DlpCache:
+    # Redaction result cache (content hash + mime + config fingerprint)
+    DEFAULT_MAX_ENTRIES: Final[int] = 512
+    DEFAULT_MAX_BYTES: Final[int] = 64 * 1024 * 1024
+    DEFAULT_TTL_SECONDS: Final[int] = 3600
+    DEFAULT_MAX_DISK_ENTRIES: Final[int] = 4096
+    # Directory scan for TTL/size pruning runs once per this many disk writes
+    DISK_PRUNE_EVERY: Final[int] = 64
+    FILE_SUFFIX: Final[str] = ".dlpc"
+    AAD: Final[bytes] = b"dlp-cache-v1"
+    KEY_INFO: Final[bytes] = b"dlp-cache-key"
+
+class AccessCache:
+    # Per-process (caregiver, recipient) access-edge cache; TTL bounds cross-worker staleness after a revoke
+    DEFAULT_TTL_SECONDS: Final[int] = 30
+    DEFAULT_MAX_ENTRIES: Final[int] = 10_000
+
+class PrincipalCache:
+    # Per-process bearer token -> user snapshot cache used by get_current_user
+    DEFAULT_TTL_SECONDS: Final[int] = 30
+    DEFAULT_MAX_ENTRIES: Final[int] = 10_000
+    # Never copied into the shared snapshot
+    EXCLUDED_FIELDS: Final[frozenset] = frozenset({"password_hash"})
+
+class MetricNames:
+    DLP_CACHE_HITS: Final[str] = "dlp_cache_hits"
+    DLP_CACHE_MISSES: Final[str] = "dlp_cache_misses"
+    DLP_CACHE_DISK_HITS: Final[str] = "dlp_cache_disk_hits"
+    DLP_CACHE_EVICTIONS: Final[str] = "dlp_cache_evictions"
+    DLP_CACHE_ENTRIES: Final[str] = "dlp_cache_entries"
+    DLP_CACHE_BYTES: Final[str] = "dlp_cache_bytes"
+    DLP_PREFILTER_CLEAN: Final[str] = "dlp_prefilter_clean"
+    DLP_PREFILTER_CANDIDATES: Final[str] = "dlp_prefilter_candidates"
+    DLP_PREFILTER_SKIPPED: Final[str] = "dlp_prefilter_skipped"
+    DLP_PREFILTER_DEFERRED: Final[str] = "dlp_prefilter_deferred"
+    DLP_PREFILTER_MISSED: Final[str] = "dlp_prefilter_missed"
+    ACCESS_CACHE_HITS: Final[str] = "access_cache_hits"
+    ACCESS_CACHE_MISSES: Final[str] = "access_cache_misses"
+    ACCESS_CACHE_INVALIDATIONS: Final[str] = "access_cache_invalidations"
+    ACCESS_CACHE_ENTRIES: Final[str] = "access_cache_entries"
+    ACCESS_CACHE_HIT_RATE: Final[str] = "access_cache_hit_rate"
+    PRINCIPAL_CACHE_HITS: Final[str] = "principal_cache_hits"
+    PRINCIPAL_CACHE_MISSES: Final[str] = "principal_cache_misses"
+    PRINCIPAL_CACHE_INVALIDATIONS: Final[str] = "principal_cache_invalidations"
+    PRINCIPAL_CACHE_ENTRIES: Final[str] = "principal_cache_entries"
+    PRINCIPAL_CACHE_HIT_RATE: Final[str] = "principal_cache_hit_rate"
+    KDF_IN_FLIGHT: Final[str] = "kdf_in_flight"
+    # Per engine; format with pool=DbPool.SYNC / DbPool.ASYNC
+    DB_POOL_CHECKED_OUT: Final[str] = "db_pool_{pool}_checked_out"
+    DB_POOL_OVERFLOW: Final[str] = "db_pool_{pool}_overflow"
+    DB_POOL_CAPACITY: Final[str] = "db_pool_{pool}_capacity"
+    DB_POOL_WAIT_MS: Final[str] = "db_pool_{pool}_wait_ms"
+    DB_POOL_SLOW_WAITS: Final[str] = "db_pool_{pool}_slow_waits"
+    DB_POOL_EXHAUSTED: Final[str] = "db_pool_{pool}_exhausted"
+    DB_POOL_PINGS: Final[str] = "db_pool_{pool}_pings"
+    DB_POOL_PING_FAILURES: Final[str] = "db_pool_{pool}_ping_failures"
+    DB_SESSIONS_OPENED: Final[str] = "db_sessions_opened"
+    DB_EARLY_RELEASES: Final[str] = "db_early_releases"
+    DB_COMMITS: Final[str] = "db_commits"
+    DB_REPLICA_READS: Final[str] = "db_replica_reads"
+    DB_REPLICA_PRIMARY_READS: Final[str] = "db_replica_primary_reads"
+    DB_REPLICA_FAILURES: Final[str] = "db_replica_failures"
+    DB_REPLICA_LAG_SECONDS: Final[str] = "db_replica_lag_seconds"
+    KDF_REJECTED: Final[str] = "kdf_rejected"
+
 class Encoding:
     UTF8: Final[str] = "utf-8"
 
@@ -521,12 +678,104 @@ class Pagination:
     DEFAULT_LIMIT: Final[int] = 50
     MAX_LIMIT: Final[int] = 100
     DEFAULT_OFFSET: Final[int] = 0
+    # Truncated HMAC-SHA256 tag on keyset cursors
+    CURSOR_SIG_BYTES: Final[int] = 16
+
+class CursorScopes:
+    # Lists a keyset cursor is bound to (signed with the parent id)
+    MEMBERSHIPS: Final[str] = "memberships"
+    DEPENDENTS: Final[str] = "dependents"
+    PAYMENT_CODES: Final[str] = "payment_codes"
+    GROUP_MEMBER_INVITES: Final[str] = "group_member_invites"
+    USERS: Final[str] = "users"
+
+class DbModes:
+    # How request handlers run repository/service calls (Settings.db_mode)
+    SYNC: Final[str] = "sync"
+    ASYNC: Final[str] = "async"
+    THREADPOOL: Final[str] = "threadpool"
+    DEFAULT_THREADPOOL_SIZE: Final[int] = 8
+    THREADPOOL_NAME_PREFIX: Final[str] = "db-worker"
+    # Session.info flag: rows flushed in the open transaction but not committed yet
+    SESSION_INFO_UNCOMMITTED_WRITES: Final[str] = "uncommitted_writes"
+    # Session.info keys for unit_of_work: nesting depth and callbacks deferred to the outermost commit
+    SESSION_INFO_UOW_DEPTH: Final[str] = "uow_depth"
+    SESSION_INFO_ON_COMMIT: Final[str] = "on_commit"
+
+class DbPool:
+    # SQLAlchemy QueuePool sizing for the sync and async engines (Settings.db_pool_*)
+    DEFAULT_SIZE: Final[int] = 5
+    DEFAULT_MAX_OVERFLOW: Final[int] = 10
+    DEFAULT_TIMEOUT_SECONDS: Final[float] = 30.0
+    DEFAULT_RECYCLE_SECONDS: Final[int] = 1800
+    # Liveness check on checkout: every time, only after the connection sat idle, or never
+    PRE_PING_ALWAYS: Final[str] = "always"
+    PRE_PING_IDLE: Final[str] = "idle"
+    PRE_PING_OFF: Final[str] = "off"
+    DEFAULT_PRE_PING_IDLE_SECONDS: Final[float] = 30.0
+    # Connection record info key: monotonic time of the last checkin
+    INFO_LAST_CHECKIN: Final[str] = "last_checkin"
+    # A checkout that waited longer than this is logged as pool saturation
+    DEFAULT_WAIT_ALARM_MS: Final[float] = 100.0
+    ALARM_LOG_INTERVAL_SECONDS: Final[float] = 60.0
+    WAIT_BUCKETS_MS: Final[tuple] = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+    SYNC: Final[str] = "sync"
+    ASYNC: Final[str] = "async"
+    REPLICA: Final[str] = "replica"
+    REPLICA_ASYNC: Final[str] = "replica_async"
+
+class DbReplica:
+    # Read-replica routing for read-only endpoints (Settings.database_replica_url, db_replica_*)
+    DEFAULT_MAX_LAG_SECONDS: Final[float] = 5.0
+    DEFAULT_LAG_CHECK_SECONDS: Final[float] = 5.0
+    DEFAULT_READ_YOUR_WRITES_SECONDS: Final[float] = 5.0
+    DEFAULT_RETRY_SECONDS: Final[float] = 30.0
+    MAX_TRACKED_PRINCIPALS: Final[int] = 10000
+    # Replay delay; 0 when the replica has applied everything it received (an idle primary is not lag)
+    LAG_SQL: Final[str] = (
+        "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    )
+    LAG_DIALECT: Final[str] = "postgresql"
+    # Session.info key holding the request, so commits can start its principal's read-your-writes window
+    SESSION_INFO_REQUEST: Final[str] = "request"
+    # request.state attribute set by get_current_user
+    STATE_PRINCIPAL_ID: Final[str] = "principal_id"
+
+class Kdf:
+    # Bounded pool for password hashing (PBKDF2 releases the GIL, so threads run it in parallel)
+    EXECUTOR_THREAD: Final[str] = "thread"
+    EXECUTOR_PROCESS: Final[str] = "process"
+    DEFAULT_WORKERS: Final[int] = 2
+    # Hash jobs allowed to wait beyond the running ones before new work is rejected with 503
+    DEFAULT_QUEUE_LIMIT: Final[int] = 16
+    RETRY_AFTER_SECONDS: Final[int] = 1
+    THREAD_NAME_PREFIX: Final[str] = "kdf-worker"
+    # Policy for newly written hashes; older hashes keep verifying and are upgraded on login
+    DEFAULT_PBKDF2_ITERATIONS: Final[int] = 100_000
+    DEFAULT_SCRYPT_N: Final[int] = 2 ** 14
+    DEFAULT_SCRYPT_R: Final[int] = 8
+    DEFAULT_SCRYPT_P: Final[int] = 1
+    SCRYPT_MAXMEM_HEADROOM_BYTES: Final[int] = 1 << 20
+    # hashlib.scrypt rejects maxmem above INT_MAX, so no policy may need more
+    SCRYPT_MAXMEM_LIMIT_BYTES: Final[int] = 2 ** 31 - 1
+    SALT_BYTES: Final[int] = 16
+    DERIVED_KEY_BYTES: Final[int] = 32
+    # scripts/calibrate_kdf.py target
+    DEFAULT_TARGET_MS: Final[int] = 50
+
+class DbDrivers:
+    POSTGRES_ASYNCPG: Final[str] = "postgresql+asyncpg"
 
 class PaymentCodes:
     CODE_BYTES: Final[int] = 12
 
 
 class LogEvents:
+    DB_POOL_SLOW_WAIT: Final[str] = "db_pool_slow_wait"
+    DB_POOL_EXHAUSTED: Final[str] = "db_pool_exhausted"
+    DB_REPLICA_DOWN: Final[str] = "db_replica_down"
+    DB_REPLICA_LAGGING: Final[str] = "db_replica_lagging"
     GROUP_CREATED: Final[str] = "group_created"
     GROUP_UPDATED: Final[str] = "group_updated"
     GROUP_DELETED: Final[str] = "group_deleted"
@@ -550,6 +799,14 @@ class LogEvents:
     DLP_ENABLED: Final[str] = "dlp_enabled"
     DLP_DISABLED: Final[str] = "dlp_disabled"
     DLP_CLIENT_INIT_ERROR: Final[str] = "dlp_client_init_error"
+    DLP_CLIENT_CLOSE_ERROR: Final[str] = "dlp_client_close_error"
+    DLP_TEXT_CHUNKED: Final[str] = "dlp_text_chunked"
+    DLP_CACHE_DISABLED: Final[str] = "dlp_cache_disabled"
+    DLP_CACHE_DISK_ERROR: Final[str] = "dlp_cache_disk_error"
+    DLP_PREFILTER_MISSED: Final[str] = "dlp_prefilter_missed"
+    DLP_PREFILTER_UNCOVERED: Final[str] = "dlp_prefilter_uncovered"
+    DLP_DEFERRED_FAILED: Final[str] = "dlp_deferred_failed"
+    DLP_LOCAL_OCR_UNAVAILABLE: Final[str] = "dlp_local_ocr_unavailable"
     DLP_REDACT_IMAGE_FAILED: Final[str] = "dlp_redact_image_failed"
 
 class TokenTypes:
@@ -9,5 +9,6 @@ from .docs_error import DocsError
 from .ingestion_error import IngestionError
 from .chat_history_error import ChatHistoryError
 from .rag_provider_error import RagProviderError
+from .service_unavailable_error import ServiceUnavailableError
 
 
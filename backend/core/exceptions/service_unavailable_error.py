@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from fastapi import status
+from .app_error import AppError
+
+
+class ServiceUnavailableError(AppError):
+	"""Capacity exhausted; the client should retry after `retry_after` seconds."""
+	def __init__(self, code: str, message: str | None = None, *, retry_after: int = 1, extra=None) -> None:
+		super().__init__(code, message, status_code=status.HTTP_503_SERVICE_UNAVAILABLE, extra=extra)
+		self.retry_after = retry_after
+
+
@@ -0,0 +1,70 @@
+"""
+In-process metrics registry.
+
+Counters (monotonic), gauges (last value) and histograms (count, sum and
+cumulative `le_<bound>` buckets) keyed by `MetricNames` constants, exposed as
+JSON on the ops `/metrics` route. Thread-safe; values are per worker process.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Sequence
+
+from backend.core.constants import Keys
+
+
+class Metrics:
+	def __init__(self) -> None:
+		self._lock = threading.Lock()
+		self._counters: Dict[str, int] = {}
+		self._gauges: Dict[str, float] = {}
+		self._histograms: Dict[str, Dict[str, Any]] = {}
+		self._bounds: Dict[str, Sequence[float]] = {}
+
+	def inc(self, name: str, value: int = 1) -> None:
+		with self._lock:
+			self._counters[name] = self._counters.get(name, 0) + value
+
+	def set_gauge(self, name: str, value: float) -> None:
+		with self._lock:
+			self._gauges[name] = value
+
+	def observe(self, name: str, value: float, buckets: Sequence[float]) -> None:
+		"""Record one sample; buckets are upper bounds, fixed by the first observation of `name`."""
+		with self._lock:
+			hist = self._histograms.get(name)
+			if hist is None:
+				hist = self._histograms[name] = {Keys.COUNT: 0, Keys.SUM: 0.0, Keys.BUCKETS: {f"le_{b:g}": 0 for b in buckets}}
+				self._bounds[name] = tuple(buckets)
+			hist[Keys.COUNT] += 1
+			hist[Keys.SUM] += value
+			counts = hist[Keys.BUCKETS]
+			for bound in self._bounds[name]:
+				if value <= bound:
+					counts[f"le_{bound:g}"] += 1
+
+	def counter(self, name: str) -> int:
+		return self._counters.get(name, 0)
+
+	def snapshot(self) -> Dict[str, Dict[str, Any]]:
+		with self._lock:
+			histograms = {
+				name: {Keys.COUNT: h[Keys.COUNT], Keys.SUM: h[Keys.SUM], Keys.BUCKETS: dict(h[Keys.BUCKETS])}
+				for name, h in self._histograms.items()
+			}
+			return {Keys.COUNTERS: dict(self._counters), Keys.GAUGES: dict(self._gauges), Keys.HISTOGRAMS: histograms}
+
+	def reset(self) -> None:
+		with self._lock:
+			self._counters.clear()
+			self._gauges.clear()
+			self._histograms.clear()
+			self._bounds.clear()
+
+
+metrics = Metrics()
+
+
+def hit_rate(hits: int, misses: int) -> float:
+	total = hits + misses
+	return (hits / total) if total else 0.0
@@ -0,0 +1,145 @@
+"""
+Per-process TTL + LRU store with invalidation epochs.
+
+Backs the caches that sit in front of authorization lookups
+(`security/access_cache.py`, `security/principal_cache.py`). A caller that
+misses reads `epoch` before going to the database and hands it back to
+`put`; any invalidation in between bumps the epoch, so a result loaded before
+a committed write is dropped instead of cached. Entries may carry a tag (e.g.
+a user id) so all of them can be invalidated together. `SharedCache` holds the
+process-wide instance, built from settings on first use.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Generic, Hashable, Optional, Set, Tuple, TypeVar
+
+from backend.core.metrics import hit_rate, metrics
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+C = TypeVar("C")
+
+
+@dataclass(frozen=True)
+class CacheMetricNames:
+	hits: str
+	misses: str
+	hit_rate: str
+	entries: str
+	invalidations: str
+
+
+class EpochTtlCache(Generic[K, V]):
+	def __init__(
+		self,
+		*,
+		ttl_seconds: int,
+		max_entries: int,
+		metric_names: CacheMetricNames,
+		clock: Callable[[], float] = time.monotonic,
+	) -> None:
+		self._ttl = max(1, ttl_seconds)
+		self._max_entries = max(1, max_entries)
+		self._names = metric_names
+		self._clock = clock
+		self._lock = threading.Lock()
+		# key -> (expires_at on self._clock, tag, value); LRU order, oldest first
+		self._entries: "OrderedDict[K, Tuple[float, Optional[str], V]]" = OrderedDict()
+		self._by_tag: Dict[str, Set[K]] = {}
+		self._epoch = 0
+
+	@property
+	def epoch(self) -> int:
+		return self._epoch
+
+	def get(self, key: K) -> Optional[V]:
+		now = self._clock()
+		with self._lock:
+			item = self._entries.get(key)
+			if item is not None and item[0] <= now:
+				self._drop(key)
+				item = None
+			elif item is not None:
+				self._entries.move_to_end(key)
+		names = self._names
+		metrics.inc(names.hits if item is not None else names.misses)
+		metrics.set_gauge(names.hit_rate, hit_rate(metrics.counter(names.hits), metrics.counter(names.misses)))
+		return item[2] if item is not None else None
+
+	def put(self, key: K, value: V, *, epoch: int, tag: Optional[str] = None, expires_at: Optional[float] = None) -> bool:
+		"""Cache for the TTL (or until `expires_at`, on the same clock, if sooner); False if an invalidation happened since `epoch` was read."""
+		deadline = self._clock() + self._ttl
+		if expires_at is not None:
+			deadline = min(deadline, expires_at)
+		with self._lock:
+			if epoch != self._epoch:
+				return False
+			if key in self._entries:
+				self._drop(key)
+			self._entries[key] = (deadline, tag, value)
+			if tag is not None:
+				self._by_tag.setdefault(tag, set()).add(key)
+			while len(self._entries) > self._max_entries:
+				self._drop(next(iter(self._entries)))
+			size = len(self._entries)
+		metrics.set_gauge(self._names.entries, size)
+		return True
+
+	def invalidate(self, key: K) -> None:
+		with self._lock:
+			self._epoch += 1
+			if key in self._entries:
+				self._drop(key)
+		metrics.inc(self._names.invalidations)
+
+	def invalidate_tag(self, tag: str) -> None:
+		with self._lock:
+			self._epoch += 1
+			for key in list(self._by_tag.get(tag, ())):
+				self._drop(key)
+		metrics.inc(self._names.invalidations)
+
+	def clear(self) -> None:
+		with self._lock:
+			self._epoch += 1
+			self._entries.clear()
+			self._by_tag.clear()
+
+	def _drop(self, key: K) -> None:
+		_, tag, _ = self._entries.pop(key)
+		if tag is None:
+			return
+		keys = self._by_tag.get(tag)
+		if keys is not None:
+			keys.discard(key)
+			if not keys:
+				del self._by_tag[tag]
+
+
+class SharedCache(Generic[C]):
+	"""Process-wide instance from `build` on first use; `build` returns None when the cache is disabled."""
+
+	def __init__(self, build: Callable[[], Optional[C]]) -> None:
+		self._build = build
+		self._instance: Optional[C] = None
+		self._initialized = False
+		self._lock = threading.Lock()
+
+	def get(self) -> Optional[C]:
+		if self._initialized:
+			return self._instance
+		with self._lock:
+			if not self._initialized:
+				self._instance = self._build()
+				self._initialized = True
+		return self._instance
+
+	def reset(self) -> None:
+		"""Rebuild from settings on the next get (tests, settings reload)."""
+		with self._lock:
+			self._instance = None
+			self._initialized = False
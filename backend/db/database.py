@@ -1,15 +1,31 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from typing import Optional
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
+from backend.core.constants import DbDrivers, DbPool
 from backend.core.settings import get_settings
+from backend.db.pool import instrument_engine, pool_kwargs
 
 
 settings = get_settings()
-engine = create_engine(settings.database_url, future=True, pool_pre_ping=True)
+engine = create_engine(settings.database_url, future=True, **pool_kwargs(DbPool.SYNC))
+instrument_engine(engine, DbPool.SYNC)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True, expire_on_commit=False)
 
+# Async engine is created lazily so the sync path never needs asyncpg installed
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+
+# Read replica (DATABASE_REPLICA_URL), also lazy; see db/replica.py for routing
+_replica_engine: Optional[Engine] = None
+_replica_session_factory: Optional[sessionmaker[Session]] = None
+_async_replica_engine: Optional[AsyncEngine] = None
+_async_replica_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+
 
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -19,3 +35,75 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def _with_asyncpg(database_url: str) -> str:
+    url = make_url(database_url)
+    return url.set(drivername=DbDrivers.POSTGRES_ASYNCPG).render_as_string(hide_password=False)
+
+
+def async_database_url() -> str:
+    """Return the asyncpg URL: explicit DATABASE_ASYNC_URL or DATABASE_URL with the driver swapped."""
+    return settings.database_async_url or _with_asyncpg(settings.database_url)
+
+
+def async_replica_url() -> str:
+    return settings.database_replica_async_url or _with_asyncpg(settings.database_replica_url)
+
+
+def replica_enabled() -> bool:
+    return bool(settings.database_replica_url)
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(async_database_url(), **pool_kwargs(DbPool.ASYNC, is_async=True))
+        instrument_engine(_async_engine.sync_engine, DbPool.ASYNC)
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+    return _async_session_factory
+
+
+def get_replica_session_factory() -> sessionmaker[Session]:
+    global _replica_engine, _replica_session_factory
+    if _replica_session_factory is None:
+        _replica_engine = create_engine(settings.database_replica_url, future=True, **pool_kwargs(DbPool.REPLICA))
+        instrument_engine(_replica_engine, DbPool.REPLICA)
+        _replica_session_factory = sessionmaker(bind=_replica_engine, autoflush=False, autocommit=False, future=True, expire_on_commit=False)
+    return _replica_session_factory
+
+
+def get_async_replica_session_factory() -> async_sessionmaker[AsyncSession]:
+    global _async_replica_engine, _async_replica_session_factory
+    if _async_replica_session_factory is None:
+        _async_replica_engine = create_async_engine(async_replica_url(), **pool_kwargs(DbPool.REPLICA_ASYNC, is_async=True))
+        instrument_engine(_async_replica_engine.sync_engine, DbPool.REPLICA_ASYNC)
+        _async_replica_session_factory = async_sessionmaker(bind=_async_replica_engine, autoflush=False, expire_on_commit=False)
+    return _async_replica_session_factory
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_session_factory()() as adb:
+        yield adb
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections of every engine, sync and async, primary and replica (app shutdown)."""
+    global _async_engine, _async_session_factory, _replica_engine, _replica_session_factory, _async_replica_engine, _async_replica_session_factory
+    engine.dispose()
+    if _replica_engine is not None:
+        _replica_engine.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _async_replica_engine is not None:
+        await _async_replica_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
+    _replica_engine = None
+    _replica_session_factory = None
+    _async_replica_engine = None
+    _async_replica_session_factory = None
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import String, ForeignKey, UniqueConstraint, DateTime, Date
+from sqlalchemy import String, ForeignKey, UniqueConstraint, DateTime, Date, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.db.base import Base, uuid_pk, ts_created, ts_updated, (
@@ -38,6 +38,8 @@ class GroupMembership(Base):
 	__table_args__ = (
 		UniqueConstraint("group_id", "user_id", name="uq_group_membership_group_user"),
 		UniqueConstraint("user_id", name="uq_group_membership_user_unique"),
+		# Keyset pages per group seek on (created_at, id)
+		Index("ix_group_memberships_group_created", "group_id", "created_at", "id"),
 	)
 	id: Mapped[uuid.UUID] = uuid_pk()
 	group_id: Mapped[uuid.UUID] = mapped_column(ForeignKey(f"{Tables.GROUPS}.{Fields.ID}", ondelete="CASCADE"))
@@ -53,6 +55,9 @@ class GroupMembership(Base):
 class GroupPaymentCode(Base):
 	"""Payment code associated with a group for onboarding and billing flows."""
 	__tablename__ = Tables.GROUP_PAYMENT_CODES
+	__table_args__ = (
+		Index("ix_group_payment_codes_group_created", "group_id", "created_at", "id"),
+	)
 
 	id: Mapped[uuid.UUID] = uuid_pk()
 	group_id: Mapped[uuid.UUID] = mapped_column(ForeignKey(f"{Tables.GROUPS}.{Fields.ID}", ondelete="CASCADE"))
@@ -70,6 +75,10 @@ class GroupPaymentCode(Base):
 class GroupMemberInvite(Base):
 	"""Invite issued to an email to join a group as a member."""
 	__tablename__ = Tables.GROUP_MEMBER_INVITES
+	__table_args__ = (
+		# Partial: only pending invites are listed
+		Index("ix_group_member_invites_group_created_pending", "group_id", "created_at", "id", postgresql_where=text("status = 'pending'")),
+	)
 
 	id: Mapped[uuid.UUID] = uuid_pk()
 	group_id: Mapped[uuid.UUID] = mapped_column(ForeignKey(f"{Tables.GROUPS}.{Fields.ID}", ondelete="CASCADE"))
@@ -85,6 +94,10 @@ class GroupMemberInvite(Base):
 class Dependent(Base):
 	"""Dependent record under a group/guardian; convertible into a full user account."""
 	__tablename__ = Tables.DEPENDENTS
+	__table_args__ = (
+		# Partial: soft-deleted dependents are never listed
+		Index("ix_dependents_group_created", "group_id", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
+	)
 
 	id: Mapped[uuid.UUID] = uuid_pk()
 	group_id: Mapped[uuid.UUID] = mapped_column(ForeignKey(f"{Tables.GROUPS}.{Fields.ID}", ondelete="CASCADE"))
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.db.base import Base, uuid_pk, ts_created, ts_updated, (
@@ -16,6 +16,12 @@ from backend.schemas.common import InvitationStatus
 class Invitation(Base):
 	"""Invitation linking caregivers and recipients, optionally by email prior to signup."""
 	__tablename__ = Tables.INVITATIONS
+	__table_args__ = (
+		# Partial: only pending rows are listed; ordered by (created_at, id)
+		Index("ix_invitations_caregiver_pending", "caregiver_id", "created_at", "id", postgresql_where=text("status = 'pending'")),
+		Index("ix_invitations_recipient_pending", "recipient_id", "created_at", "id", postgresql_where=text("status = 'pending'")),
+		Index("ix_invitations_invited_email_pending", "invited_email", postgresql_where=text("status = 'pending'")),
+	)
 
 	id: Mapped[uuid.UUID] = uuid_pk()
 	caregiver_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey(f"{Tables.USERS}.{Fields.ID}"), nullable=True)
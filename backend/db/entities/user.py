@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.db.base import Base, uuid_pk, ts_created, ts_updated, (
@@ -18,6 +18,10 @@ from backend.core.constants import Tables, Fields
 class User(Base):
 	"""Application user with auth credentials, profile fields, and relations."""
 	__tablename__ = Tables.USERS
+	__table_args__ = (
+		# Keyset pages of /users seek on (created_at, id)
+		Index("ix_users_created_at_id", "created_at", "id"),
+	)
 
 	id: Mapped[uuid.UUID] = uuid_pk()
 	username: Mapped[str] = mapped_column(String(USERNAME_MAX_LEN), unique=True, index=True, nullable=False)
@@ -55,6 +59,10 @@ class User(Base):
 class RecipientCaregiverAccess(Base):
 	"""Edge granting a caregiver access to a recipient with optional access level."""
 	__tablename__ = Tables.RECIPIENT_CAREGIVER_ACCESS
+	__table_args__ = (
+		UniqueConstraint("recipient_id", "caregiver_id", name="uq_rca_recipient_caregiver"),
+		Index("ix_rca_caregiver_id", "caregiver_id"),
+	)
 
 	id: Mapped[uuid.UUID] = uuid_pk()
 	recipient_id: Mapped[uuid.UUID] = mapped_column(ForeignKey(f"{Tables.USERS}.{Fields.ID}"))
@@ -0,0 +1,145 @@
+"""Connection pool sizing, instrumentation and idle-only pre-ping for the sync and async engines.
+
+Sizing comes from ``Settings.db_pool_*``. The pool class times every
+checkout (waiting for a free slot plus connect/ping) into the
+``db_pool_<engine>_wait_ms`` histogram, and pool events keep checked-out /
+overflow / capacity gauges current. Saturation raises two alarms, counted and
+logged at most once per ``DbPool.ALARM_LOG_INTERVAL_SECONDS``:
+- a checkout waited longer than ``db_pool_wait_alarm_ms``;
+- a checkout took the last slot (pool_size + max_overflow in use), so the
+  next request queues for up to ``db_pool_timeout``.
+
+``db_pool_pre_ping=idle`` pings only connections unused for longer than
+``db_pool_pre_ping_idle_seconds`` (the ones a server or proxy may have
+dropped) instead of a ``SELECT 1`` round trip on every checkout. A failed
+ping raises ``DisconnectionError``, and the pool retries with a fresh
+connection, as built-in pre-ping does.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from backend.core.constants import DbPool, LogEvents, MetricNames
+from backend.core.metrics import metrics
+from backend.core.settings import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class _Alarm:
+    """Counts every occurrence; logs at most once per interval."""
+
+    def __init__(self, counter: str, event_name: str) -> None:
+        self.counter = counter
+        self.event_name = event_name
+        self._next_log = 0.0
+        self._lock = threading.Lock()
+
+    def fire(self, message: str, *args: Any) -> None:
+        metrics.inc(self.counter)
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_log:
+                return
+            self._next_log = now + DbPool.ALARM_LOG_INTERVAL_SECONDS
+        logger.warning("%s: " + message, self.event_name, *args)
+
+
+class _PoolInstruments:
+    def __init__(self, name: str) -> None:
+        settings = get_settings()
+        self.name = name
+        self.wait_alarm_ms = float(settings.db_pool_wait_alarm_ms)
+        self.checked_out = MetricNames.DB_POOL_CHECKED_OUT.format(pool=name)
+        self.overflow = MetricNames.DB_POOL_OVERFLOW.format(pool=name)
+        self.capacity = MetricNames.DB_POOL_CAPACITY.format(pool=name)
+        self.wait_ms = MetricNames.DB_POOL_WAIT_MS.format(pool=name)
+        self.pings = MetricNames.DB_POOL_PINGS.format(pool=name)
+        self.ping_failures = MetricNames.DB_POOL_PING_FAILURES.format(pool=name)
+        self.slow_wait = _Alarm(MetricNames.DB_POOL_SLOW_WAITS.format(pool=name), LogEvents.DB_POOL_SLOW_WAIT)
+        self.exhausted = _Alarm(MetricNames.DB_POOL_EXHAUSTED.format(pool=name), LogEvents.DB_POOL_EXHAUSTED)
+
+    def record_usage(self, pool: QueuePool, returning: int = 0) -> None:
+        metrics.set_gauge(self.checked_out, max(0, pool.checkedout() - returning))
+        metrics.set_gauge(self.overflow, max(0, pool.overflow()))
+        metrics.set_gauge(self.capacity, pool.size() + pool._max_overflow)
+
+    def record_wait(self, pool: QueuePool, wait_ms: float) -> None:
+        metrics.observe(self.wait_ms, wait_ms, DbPool.WAIT_BUCKETS_MS)
+        if wait_ms > self.wait_alarm_ms:
+            self.slow_wait.fire("%s pool checkout waited %.0f ms (%s)", self.name, wait_ms, pool.status())
+
+
+_instruments: Dict[str, _PoolInstruments] = {}
+
+
+def _instrumented(base: Type[QueuePool], name: str) -> Type[QueuePool]:
+    def connect(self: QueuePool) -> Any:
+        start = time.perf_counter()
+        connection = base.connect(self)
+        _instruments[name].record_wait(self, (time.perf_counter() - start) * 1000)
+        return connection
+
+    # recreate() (engine.dispose) builds self.__class__, so the timing survives
+    return type(f"Instrumented{base.__name__}", (base,), {"connect": connect})
+
+
+def pool_kwargs(name: str, *, is_async: bool = False) -> Dict[str, Any]:
+    """create_engine / create_async_engine pool arguments from settings."""
+    settings = get_settings()
+    _instruments[name] = _PoolInstruments(name)
+    return {
+        "poolclass": _instrumented(AsyncAdaptedQueuePool if is_async else QueuePool, name),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": (settings.db_pool_pre_ping or DbPool.PRE_PING_IDLE).lower() == DbPool.PRE_PING_ALWAYS,
+    }
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Attach usage gauges, the exhaustion alarm and (pre_ping=idle) idle pings; pass AsyncEngine.sync_engine for async."""
+    settings = get_settings()
+    instruments = _instruments.setdefault(name, _PoolInstruments(name))
+    idle_ping = (settings.db_pool_pre_ping or DbPool.PRE_PING_IDLE).lower() == DbPool.PRE_PING_IDLE
+    idle_seconds = float(settings.db_pool_pre_ping_idle_seconds)
+    dialect = engine.dialect
+    pool = engine.pool
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection: Any, record: Any) -> None:
+        record.info[DbPool.INFO_LAST_CHECKIN] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection: Any, record: Any, proxy: Any) -> None:
+        if idle_ping:
+            last = record.info.get(DbPool.INFO_LAST_CHECKIN)
+            if last is not None and time.monotonic() - last > idle_seconds:
+                metrics.inc(instruments.pings)
+                try:
+                    dialect.do_ping(dbapi_connection)
+                except Exception as err:
+                    metrics.inc(instruments.ping_failures)
+                    # Pool discards this connection and retries the checkout with a new one
+                    raise exc.DisconnectionError() from err
+        current = engine.pool
+        instruments.record_usage(current)
+        if current.checkedout() >= current.size() + current._max_overflow:
+            instruments.exhausted.fire("%s pool at capacity (%s); further checkouts wait up to %ss", name, current.status(), current._timeout)
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection: Any, record: Any) -> None:
+        record.info[DbPool.INFO_LAST_CHECKIN] = time.monotonic()
+        # Fires before the record is back in the pool, so it still counts as checked out
+        instruments.record_usage(engine.pool, returning=1)
+
+    instruments.record_usage(pool)
@@ -0,0 +1,174 @@
+"""Read-replica routing for read-only endpoints.
+
+Handlers that only read take ``get_read_db_runner`` (see ``db/runner.py``).
+On its first call the runner picks the target for the whole request:
+- primary, if the caller's principal committed a write in the last
+  ``db_read_your_writes_seconds`` (read-your-writes);
+- primary, if the replica failed recently or its replay lag exceeds
+  ``db_replica_max_lag_seconds`` (measured at most every
+  ``db_replica_lag_check_seconds`` by one request, cached for the rest);
+- the replica otherwise.
+A connection-level error on the replica marks it down for
+``db_replica_retry_seconds`` and the call is retried on the primary.
+
+Writes are noted at commit time: request runners put the request in
+``Session.info`` and the ``after_commit`` hook below starts the window for
+its principals (user id from ``get_current_user`` and the bearer token, so
+endpoints without ``get_current_user`` are covered as well).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event, exc, text
+from sqlalchemy.orm import Session
+
+from backend.core.constants import DbModes, DbReplica, Headers, LogEvents, Messages, MetricNames
+from backend.core.metrics import metrics
+from backend.core.settings import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the replica is skipped and the read retried on the primary
+REPLICA_UNAVAILABLE_ERRORS = (exc.OperationalError, exc.InterfaceError, exc.TimeoutError)
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        *,
+        max_lag_seconds: float,
+        lag_check_seconds: float,
+        read_your_writes_seconds: float,
+        retry_seconds: float,
+        max_tracked: int = DbReplica.MAX_TRACKED_PRINCIPALS,
+    ) -> None:
+        self.max_lag_seconds = float(max_lag_seconds)
+        self.lag_check_seconds = float(lag_check_seconds)
+        self.read_your_writes_seconds = float(read_your_writes_seconds)
+        self.retry_seconds = float(retry_seconds)
+        self.max_tracked = int(max_tracked)
+        self._lock = threading.Lock()
+        self._writes: Dict[str, float] = {}
+        self._down_until = 0.0
+        self._lag: Optional[float] = None
+        self._next_lag_check = 0.0
+        self._lag_check_claimed = False
+
+    # Read-your-writes
+    def note_write(self, principals: Iterable[str]) -> None:
+        keys = [key for key in principals if key]
+        if not keys or self.read_your_writes_seconds <= 0:
+            return
+        now = time.monotonic()
+        expires = now + self.read_your_writes_seconds
+        with self._lock:
+            if len(self._writes) >= self.max_tracked:
+                self._writes = {key: until for key, until in self._writes.items() if until > now}
+                if len(self._writes) >= self.max_tracked:
+                    # Still full of live windows: drop the oldest half rather than grow without bound
+                    for key in sorted(self._writes, key=self._writes.__getitem__)[: self.max_tracked // 2]:
+                        del self._writes[key]
+            for key in keys:
+                self._writes[key] = expires
+
+    def recently_wrote(self, principals: Iterable[str]) -> bool:
+        now = time.monotonic()
+        writes = self._writes
+        return any(writes.get(key, 0.0) > now for key in principals if key)
+
+    # Health and lag
+    def available(self) -> bool:
+        if time.monotonic() < self._down_until:
+            return False
+        lag = self._lag
+        return lag is None or lag <= self.max_lag_seconds
+
+    def mark_down(self, err: BaseException) -> None:
+        metrics.inc(MetricNames.DB_REPLICA_FAILURES)
+        now = time.monotonic()
+        with self._lock:
+            was_up = now >= self._down_until
+            self._down_until = now + self.retry_seconds
+        if was_up:
+            logger.warning("%s: routing reads to the primary for %.0fs (%s)", LogEvents.DB_REPLICA_DOWN, self.retry_seconds, type(err).__name__)
+
+    def claim_lag_check(self) -> bool:
+        """True for the one caller that should measure lag now; others keep using the cached value."""
+        now = time.monotonic()
+        if now < self._next_lag_check or now < self._down_until:
+            return False
+        with self._lock:
+            if self._lag_check_claimed or now < self._next_lag_check:
+                return False
+            self._lag_check_claimed = True
+        return True
+
+    def record_lag(self, lag: Optional[float]) -> None:
+        with self._lock:
+            was_ok = self._lag is None or self._lag <= self.max_lag_seconds
+            self._lag = lag
+            self._next_lag_check = time.monotonic() + self.lag_check_seconds
+            self._lag_check_claimed = False
+        if lag is None:
+            return
+        metrics.set_gauge(MetricNames.DB_REPLICA_LAG_SECONDS, round(lag, 3))
+        if was_ok and lag > self.max_lag_seconds:
+            logger.warning("%s: replica %.1fs behind (max %.1fs); routing reads to the primary", LogEvents.DB_REPLICA_LAGGING, lag, self.max_lag_seconds)
+
+
+def replica_lag_seconds(db: Session) -> float:
+    """Replay lag of the session's server; 0 for non-Postgres binds (no replication to measure)."""
+    if db.get_bind().dialect.name != DbReplica.LAG_DIALECT:
+        return 0.0
+    return float(db.execute(text(DbReplica.LAG_SQL)).scalar() or 0.0)
+
+
+def request_principals(request: Any) -> Tuple[str, ...]:
+    """Keys identifying the caller: user id (set by get_current_user) and the bearer token signature."""
+    principal_id = getattr(request.state, DbReplica.STATE_PRINCIPAL_ID, None)
+    scheme, _, token = (request.headers.get(Headers.AUTHORIZATION) or "").partition(" ")
+    signature = token.rpartition(".")[2] if scheme.lower() == Messages.TOKEN_TYPE_BEARER else ""
+    return tuple(key for key in (str(principal_id) if principal_id else "", signature) if key)
+
+
+_router: Optional[ReplicaRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_replica_router() -> Optional[ReplicaRouter]:
+    """Process-wide router, or None when no replica is configured."""
+    global _router
+    settings = get_settings()
+    if not settings.database_replica_url:
+        return None
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = ReplicaRouter(
+                    max_lag_seconds=settings.db_replica_max_lag_seconds,
+                    lag_check_seconds=settings.db_replica_lag_check_seconds,
+                    read_your_writes_seconds=settings.db_read_your_writes_seconds,
+                    retry_seconds=settings.db_replica_retry_seconds,
+                )
+    return _router
+
+
+def reset_replica_router() -> None:
+    global _router
+    _router = None
+
+
+@event.listens_for(Session, "after_commit")
+def _note_committed_writes(session: Session) -> None:
+    # Runs before after_transaction_end clears the flag
+    if not session.info.get(DbModes.SESSION_INFO_UNCOMMITTED_WRITES):
+        return
+    request = session.info.get(DbReplica.SESSION_INFO_REQUEST)
+    router = get_replica_router() if request is not None else None
+    if router is not None:
+        router.note_write(request_principals(request))
@@ -0,0 +1,290 @@
+"""Request-scoped DB runners: execute repository/service calls without blocking the event loop.
+
+Services and repositories are written against a sync ``Session``. A runner
+hands them the right session for the configured ``Settings.db_mode``:
+- sync: the psycopg2 ``Session`` is used in place (baseline for A/B runs).
+- threadpool: the psycopg2 ``Session`` is driven from a bounded worker pool, so
+  a slow query ties up one worker instead of the event loop.
+- async: the call runs on an asyncpg ``AsyncSession`` via ``run_sync``, so
+  every round trip awaits instead of blocking the worker.
+
+Routers call ``await run(svc.method, **kwargs)``; the callable receives the
+session as its first positional argument, matching the service signatures.
+The session is opened on the first call. With ``db_release_after_call`` the
+runner ends read-only transactions after each call, and ``await run.release()``
+does it on demand before slow non-DB work, so the connection is only held
+while statements run. With ``db_unit_of_work`` each call is one unit of work
+(one commit, rollback on error; see ``db/session.py``). Read-only handlers take ``get_read_db_runner`` instead,
+which routes to the read replica (see ``db/replica.py``).
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+from collections.abc import AsyncGenerator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Protocol, TypeVar, Union
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.core.constants import DbModes, DbReplica, MetricNames
+from backend.core.metrics import metrics
+from backend.core.settings import get_settings
+from backend.db.database import SessionLocal, get_async_replica_session_factory, get_async_session_factory, get_replica_session_factory
+from backend.db.replica import REPLICA_UNAVAILABLE_ERRORS, ReplicaRouter, get_replica_router, replica_lag_seconds, request_principals
+from backend.db.session import release_connection, unit_of_work
+
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+	"""Shared bounded pool for db_mode=threadpool (sized by Settings.db_threadpool_size)."""
+	global _executor
+	if _executor is None:
+		size = max(1, int(get_settings().db_threadpool_size))
+		_executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix=DbModes.THREADPOOL_NAME_PREFIX)
+	return _executor
+
+
+def shutdown_db_executor() -> None:
+	global _executor
+	if _executor is not None:
+		_executor.shutdown(wait=False)
+	_executor = None
+
+
+class DbRunner(Protocol):
+	async def __call__(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+		...
+
+	async def release(self) -> bool:
+		"""Return the connection to the pool before slow non-DB work (see db/session.py)."""
+		...
+
+
+def _invoke(db: Session, fn: Callable[..., T], as_unit: bool, release_after: bool, *args: Any, **kwargs: Any) -> T:
+	if as_unit:
+		with unit_of_work(db):
+			result = fn(db, *args, **kwargs)
+	else:
+		result = fn(db, *args, **kwargs)
+	if release_after:
+		release_connection(db)
+	return result
+
+
+def _open_session(factory: Callable[..., Any], info: Optional[Dict[str, Any]]) -> Any:
+	metrics.inc(MetricNames.DB_SESSIONS_OPENED)
+	return factory(info=dict(info)) if info else factory()
+
+
+class SyncDbRunner:
+	"""Run calls directly against a sync Session (blocks the loop for each round trip).
+
+	The session is opened on the first call, so requests that never reach the
+	database (e.g. principal cache hits) never build one.
+	"""
+	def __init__(
+		self,
+		db: Optional[Session] = None,
+		*,
+		session_factory: Optional[Callable[..., Session]] = None,
+		info: Optional[Dict[str, Any]] = None,
+		release_after_call: bool = False,
+		unit_of_work: bool = False,
+	) -> None:
+		self.db = db
+		self.session_factory = session_factory or SessionLocal
+		self.info = info
+		self.release_after_call = release_after_call
+		self.unit_of_work = unit_of_work
+
+	async def __call__(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+		if self.db is None:
+			self.db = _open_session(self.session_factory, self.info)
+		return _invoke(self.db, fn, self.unit_of_work, self.release_after_call, *args, **kwargs)
+
+	async def release(self) -> bool:
+		return self.db is not None and release_connection(self.db)
+
+	async def close(self) -> None:
+		if self.db is not None:
+			db, self.db = self.db, None
+			db.close()
+
+
+class ThreadPoolDbRunner:
+	"""Run calls on the bounded DB pool with a request-scoped SessionLocal session.
+
+	Calls from one request are awaited one at a time, so the session is never
+	used by two threads concurrently even though calls may land on different workers.
+	"""
+	def __init__(
+		self,
+		executor: ThreadPoolExecutor,
+		*,
+		session_factory: Optional[Callable[..., Session]] = None,
+		info: Optional[Dict[str, Any]] = None,
+		release_after_call: bool = False,
+		unit_of_work: bool = False,
+	) -> None:
+		self.executor = executor
+		self.session_factory = session_factory or SessionLocal
+		self.info = info
+		self.release_after_call = release_after_call
+		self.unit_of_work = unit_of_work
+		self.db: Optional[Session] = None
+
+	async def __call__(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+		loop = asyncio.get_running_loop()
+		return await loop.run_in_executor(self.executor, functools.partial(self._call, fn, *args, **kwargs))
+
+	def _call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+		if self.db is None:
+			self.db = _open_session(self.session_factory, self.info)
+		return _invoke(self.db, fn, self.unit_of_work, self.release_after_call, *args, **kwargs)
+
+	async def release(self) -> bool:
+		if self.db is None:
+			return False
+		loop = asyncio.get_running_loop()
+		return await loop.run_in_executor(self.executor, release_connection, self.db)
+
+	async def close(self) -> None:
+		if self.db is None:
+			return
+		db, self.db = self.db, None
+		loop = asyncio.get_running_loop()
+		await loop.run_in_executor(self.executor, db.close)
+
+
+class AsyncDbRunner:
+	"""Run calls on an AsyncSession; the sync-style code is driven through greenlets.
+
+	The AsyncSession is opened on the first call, like the sync runners.
+	"""
+	def __init__(
+		self,
+		adb: Optional[AsyncSession] = None,
+		*,
+		session_factory: Optional[Callable[..., AsyncSession]] = None,
+		info: Optional[Dict[str, Any]] = None,
+		release_after_call: bool = False,
+		unit_of_work: bool = False,
+	) -> None:
+		self.adb = adb
+		self.session_factory = session_factory
+		self.info = info
+		self.release_after_call = release_after_call
+		self.unit_of_work = unit_of_work
+
+	async def __call__(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+		if self.adb is None:
+			self.adb = _open_session(self.session_factory or get_async_session_factory(), self.info)
+		return await self.adb.run_sync(_invoke, fn, self.unit_of_work, self.release_after_call, *args, **kwargs)
+
+	async def release(self) -> bool:
+		return self.adb is not None and await self.adb.run_sync(release_connection)
+
+	async def close(self) -> None:
+		if self.adb is not None:
+			adb, self.adb = self.adb, None
+			await adb.close()
+
+
+RequestRunner = Union[SyncDbRunner, ThreadPoolDbRunner, AsyncDbRunner]
+
+
+class ReadDbRunner:
+	"""Read-only calls on the replica, on the primary when db/replica.py says so.
+
+	The target is chosen on the first call and kept for the request, so all of
+	a handler's reads see one snapshot source. A replica connection failure
+	marks it down and the call is retried on the primary.
+	"""
+	def __init__(self, primary: RequestRunner, replica: RequestRunner, router: ReplicaRouter, request: Any) -> None:
+		self.primary = primary
+		self.replica = replica
+		self.router = router
+		self.request = request
+		self._target: Optional[RequestRunner] = None
+
+	async def _choose(self) -> RequestRunner:
+		if self.router.recently_wrote(request_principals(self.request)):
+			return self.primary
+		if self.router.claim_lag_check():
+			try:
+				lag = await self.replica(replica_lag_seconds)
+			except REPLICA_UNAVAILABLE_ERRORS as err:
+				self.router.mark_down(err)
+				lag = None
+			self.router.record_lag(lag)
+		return self.replica if self.router.available() else self.primary
+
+	async def __call__(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+		if self._target is None:
+			self._target = await self._choose()
+		if self._target is self.replica:
+			try:
+				result = await self.replica(fn, *args, **kwargs)
+			except REPLICA_UNAVAILABLE_ERRORS as err:
+				self.router.mark_down(err)
+				self._target = self.primary
+				await self.replica.close()
+			else:
+				metrics.inc(MetricNames.DB_REPLICA_READS)
+				return result
+		metrics.inc(MetricNames.DB_REPLICA_PRIMARY_READS)
+		return await self.primary(fn, *args, **kwargs)
+
+	async def release(self) -> bool:
+		return self._target is not None and await self._target.release()
+
+	async def close(self) -> None:
+		try:
+			await self.replica.close()
+		finally:
+			await self.primary.close()
+
+
+def _request_runner(request: Any, *, replica: bool = False) -> RequestRunner:
+	settings = get_settings()
+	mode = settings.db_mode
+	options: Dict[str, Any] = {
+		"info": {DbReplica.SESSION_INFO_REQUEST: request},
+		"release_after_call": bool(settings.db_release_after_call),
+		"unit_of_work": bool(settings.db_unit_of_work),
+	}
+	if mode == DbModes.ASYNC:
+		return AsyncDbRunner(session_factory=get_async_replica_session_factory() if replica else None, **options)
+	factory = get_replica_session_factory() if replica else None
+	if mode == DbModes.THREADPOOL:
+		return ThreadPoolDbRunner(get_db_executor(), session_factory=factory, **options)
+	return SyncDbRunner(session_factory=factory, **options)
+
+
+async def get_db_runner(request: Request) -> AsyncGenerator[DbRunner, None]:
+	"""FastAPI dependency yielding the runner for the configured db_mode (at most one session per request, opened on first use)."""
+	runner = _request_runner(request)
+	try:
+		yield runner
+	finally:
+		await runner.close()
+
+
+async def get_read_db_runner(request: Request) -> AsyncGenerator[DbRunner, None]:
+	"""Like get_db_runner, for handlers that only read: routed to the read replica when one is configured."""
+	router = get_replica_router()
+	primary = _request_runner(request)
+	runner: Union[RequestRunner, ReadDbRunner] = primary
+	if router is not None:
+		runner = ReadDbRunner(primary, _request_runner(request, replica=True), router, request)
+	try:
+		yield runner
+	finally:
+		await runner.close()
@@ -0,0 +1,115 @@
+"""Session-level transaction helpers: early connection release and unit of work.
+
+A ``Session`` checks out a connection on its first statement and holds it
+until the transaction ends, which without an explicit commit is the end of the
+request. ``release_connection`` ends the transaction early when that is safe:
+nothing pending and nothing flushed but uncommitted. It commits, so with
+``expire_on_commit=False`` loaded objects stay usable; the next statement
+checks out a connection again.
+
+Call it before slow non-DB work (DLP, RAG, SendGrid) so the pool is not held
+by external latency. The runners also call it after every ``run()`` when
+``Settings.db_release_after_call`` is on.
+
+``unit_of_work(db)`` groups several repository writes into one transaction.
+Repositories end their writes with ``commit_or_flush``: inside a unit of work
+that only flushes (ids and constraints are checked, nothing is committed) and
+the outermost block commits once, or rolls back on error. Outside one it
+commits as before. Side effects that must follow the commit (cache
+invalidation) go through ``on_commit``. ``Settings.db_unit_of_work`` makes
+every ``run()`` call a unit of work.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction
+
+from backend.core.constants import DbModes, MetricNames
+from backend.core.metrics import metrics
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_uncommitted_writes(session: Session, flush_context: object) -> None:
+    session.info[DbModes.SESSION_INFO_UNCOMMITTED_WRITES] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml(orm_execute_state: ORMExecuteState) -> None:
+    # Core-style update()/insert()/delete() through the session skip the flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[DbModes.SESSION_INFO_UNCOMMITTED_WRITES] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_uncommitted_writes(session: Session, transaction: SessionTransaction) -> None:
+    # Only the outermost transaction; a released savepoint still leaves the writes open
+    if transaction.parent is None:
+        session.info.pop(DbModes.SESSION_INFO_UNCOMMITTED_WRITES, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _count_commit(session: Session) -> None:
+    metrics.inc(MetricNames.DB_COMMITS)
+
+
+def holds_uncommitted_writes(db: Session) -> bool:
+    return bool(db.new or db.dirty or db.deleted or db.info.get(DbModes.SESSION_INFO_UNCOMMITTED_WRITES))
+
+
+def release_connection(db: Session) -> bool:
+    """End a read-only transaction so its connection returns to the pool; no-op (False) if there are writes to keep."""
+    if not db.in_transaction() or in_unit_of_work(db) or holds_uncommitted_writes(db):
+        return False
+    db.commit()
+    metrics.inc(MetricNames.DB_EARLY_RELEASES)
+    return True
+
+
+def in_unit_of_work(db: Session) -> bool:
+    return db.info.get(DbModes.SESSION_INFO_UOW_DEPTH, 0) > 0
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """Commit the block's writes once on exit (rollback on error); nested blocks join the outermost one."""
+    depth = db.info.get(DbModes.SESSION_INFO_UOW_DEPTH, 0)
+    db.info[DbModes.SESSION_INFO_UOW_DEPTH] = depth + 1
+    if depth:
+        try:
+            yield db
+        finally:
+            db.info[DbModes.SESSION_INFO_UOW_DEPTH] = depth
+        return
+    try:
+        yield db
+        db.commit()
+    except BaseException:
+        db.info.pop(DbModes.SESSION_INFO_ON_COMMIT, None)
+        db.rollback()
+        raise
+    finally:
+        db.info.pop(DbModes.SESSION_INFO_UOW_DEPTH, None)
+    callbacks: List[Callable[[], None]] = db.info.pop(DbModes.SESSION_INFO_ON_COMMIT, [])
+    for callback in callbacks:
+        callback()
+
+
+def commit_or_flush(db: Session, *refresh: object) -> None:
+    """Repository write boundary: flush inside a unit of work, otherwise commit and refresh ``refresh``."""
+    if in_unit_of_work(db):
+        db.flush()
+        return
+    db.commit()
+    for row in refresh:
+        db.refresh(row)
+
+
+def on_commit(db: Session, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the writes so far are committed: now outside a unit of work, after its commit inside one (dropped on rollback)."""
+    if in_unit_of_work(db):
+        db.info.setdefault(DbModes.SESSION_INFO_ON_COMMIT, []).append(callback)
+    else:
+        callback()
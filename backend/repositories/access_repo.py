@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 from typing import Optional
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from backend.db.models import RecipientCaregiverAccess
+from backend.db.session import commit_or_flush, on_commit
+from backend.security.access_cache import invalidate_access_edge
+
+# Unique (recipient_id, caregiver_id); see alembic 20261017_0013
+EDGE_CONSTRAINT = "uq_rca_recipient_caregiver"
 
 
 class AccessRepository:
@@ -23,18 +29,31 @@ class AccessRepository:
 		return db.scalars(select(RecipientCaregiverAccess).where(RecipientCaregiverAccess.caregiver_id == caregiver_id)).all()
 
 	def upsert(self, db: Session, *, recipient_id, caregiver_id, access_level: Optional[str]) -> RecipientCaregiverAccess:
-		existing = self.get(db, recipient_id=recipient_id, caregiver_id=caregiver_id)
-		if existing:
-			existing.access_level = access_level or existing.access_level
-			db.commit()
-			db.refresh(existing)
-			return existing
-		row = RecipientCaregiverAccess(recipient_id=recipient_id, caregiver_id=caregiver_id, access_level=access_level)
-		db.add(row)
-		db.commit()
-		db.refresh(row)
+		# One round trip; the unique edge constraint arbitrates concurrent grants
+		stmt = insert(RecipientCaregiverAccess).values(recipient_id=recipient_id, caregiver_id=caregiver_id, access_level=access_level)
+		stmt = stmt.on_conflict_do_update(
+			constraint=EDGE_CONSTRAINT,
+			set_={
+				"access_level": func.coalesce(stmt.excluded.access_level, RecipientCaregiverAccess.access_level),
+				"updated_at": func.now(),
+			},
+		).returning(RecipientCaregiverAccess)
+		row = db.scalars(stmt, execution_options={"populate_existing": True}).one()
+		commit_or_flush(db, row)
+		on_commit(db, lambda: invalidate_access_edge(caregiver_id, recipient_id))
 		return row
 
+	def ensure(self, db: Session, *, recipient_id, caregiver_id) -> None:
+		"""
+		Stage the edge in the caller's transaction (no commit); existing edges are left untouched.
+		The caller invalidates the access cache once it commits.
+		"""
+		db.execute(
+			insert(RecipientCaregiverAccess)
+			.values(recipient_id=recipient_id, caregiver_id=caregiver_id)
+			.on_conflict_do_nothing(constraint=EDGE_CONSTRAINT)
+		)
+
 	def delete(self, db: Session, *, recipient_id, caregiver_id) -> None:
 		rows = db.scalars(
 			select(RecipientCaregiverAccess).where(
@@ -44,7 +63,6 @@ class AccessRepository:
 		).all()
 		for row in rows:
 			db.delete(row)
-		db.commit()
+		commit_or_flush(db)
+		on_commit(db, lambda: invalidate_access_edge(caregiver_id, recipient_id))
 		return
-
-
@@ -5,7 +5,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select, func
 
 from backend.db.models import GroupMemberInvite
+from backend.db.session import commit_or_flush
 from backend.schemas.common import InvitationStatus
+from backend.utils.pagination import CursorKey, seek
 
 
 class GroupMemberInvitesRepository:
@@ -19,8 +21,7 @@ class GroupMemberInvitesRepository:
 			expires_at=expires_at,
 		)
 		db.add(row)
-		db.commit()
-		db.refresh(row)
+		commit_or_flush(db, row)
 		return row
 
 	def get(self, db: Session, *, invite_id: str) -> Optional[GroupMemberInvite]:
@@ -35,13 +36,16 @@ class GroupMemberInvitesRepository:
 			)
 		)
 
-	def list_pending_paginated(self, db: Session, *, group_id: str, limit: int, offset: int) -> List[GroupMemberInvite]:
+	def list_pending_paginated(self, db: Session, *, group_id: str, limit: int, offset: int, after: Optional[CursorKey] = None) -> List[GroupMemberInvite]:
 		return db.scalars(
-			select(GroupMemberInvite)
-			.where(GroupMemberInvite.group_id == group_id, GroupMemberInvite.status == InvitationStatus.pending.value)
-			.order_by(GroupMemberInvite.created_at)
-			.limit(limit)
-			.offset(offset)
+			seek(
+				select(GroupMemberInvite).where(GroupMemberInvite.group_id == group_id, GroupMemberInvite.status == InvitationStatus.pending.value),
+				GroupMemberInvite.created_at,
+				GroupMemberInvite.id,
+				limit=limit,
+				offset=offset,
+				after=after,
+			)
 		).all()
 
 	def count_pending(self, db: Session, *, group_id: str) -> int:
@@ -56,7 +60,6 @@ class GroupMemberInvitesRepository:
 
 	def set_status(self, db: Session, *, invite: GroupMemberInvite, status: str) -> None:
 		invite.status = status
-		db.commit()
-		db.refresh(invite)
+		commit_or_flush(db, invite)
 
 
@@ -5,7 +5,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select, func
 
 from backend.db.models import GroupMembership, Group, User
+from backend.db.session import commit_or_flush
 from backend.core.constants import GroupRoles
+from backend.utils.pagination import CursorKey, seek
 
 
 class GroupMembershipsRepository:
@@ -41,13 +43,16 @@ class GroupMembershipsRepository:
 			) or 0
 		)
 
-	def list_by_group_paginated(self, db: Session, *, group_id: str, limit: int, offset: int) -> List[GroupMembership]:
+	def list_by_group_paginated(self, db: Session, *, group_id: str, limit: int, offset: int, after: Optional[CursorKey] = None) -> List[GroupMembership]:
 		return db.scalars(
-			select(GroupMembership)
-			.where(GroupMembership.group_id == group_id)
-			.order_by(GroupMembership.created_at)
-			.limit(limit)
-			.offset(offset)
+			seek(
+				select(GroupMembership).where(GroupMembership.group_id == group_id),
+				GroupMembership.created_at,
+				GroupMembership.id,
+				limit=limit,
+				offset=offset,
+				after=after,
+			)
 		).all()
 
 	def add(self, db: Session, *, group_id: str, user_id: str, role: str) -> GroupMembership:
@@ -56,13 +61,11 @@ class GroupMembershipsRepository:
 			# Idempotent: update role if changed and return existing
 			if existing.role != role:
 				existing.role = role
-				db.commit()
-				db.refresh(existing)
+				commit_or_flush(db, existing)
 			return existing
 		row = GroupMembership(group_id=group_id, user_id=user_id, role=role)
 		db.add(row)
-		db.commit()
-		db.refresh(row)
+		commit_or_flush(db, row)
 		return row
 
 	def remove(self, db: Session, *, group_id: str, user_id: str) -> None:
@@ -70,7 +73,7 @@ class GroupMembershipsRepository:
 		if row is None:
 			return
 		db.delete(row)
-		db.commit()
+		commit_or_flush(db)
 		return
 
 	def change_role(self, db: Session, *, group_id: str, user_id: str, role: str) -> Optional[GroupMembership]:
@@ -78,8 +81,7 @@ class GroupMembershipsRepository:
 		if row is None:
 			return None
 		row.role = role
-		db.commit()
-		db.refresh(row)
+		commit_or_flush(db, row)
 		return row
 
 
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select
 
 from backend.db.models import Group, GroupMembership, User
+from backend.db.session import commit_or_flush
 from backend.core.constants import GroupRoles
 
 
@@ -12,12 +13,12 @@ class GroupsRepository:
 	def create(self, db: Session, *, name: str, description: Optional[str], created_by: str) -> Group:
 		group = Group(name=name, description=description, created_by=created_by)
 		db.add(group)
-		db.commit()
-		db.refresh(group)
+		# Flush assigns group.id; group and admin membership then commit together
+		db.flush()
 		# Creator becomes admin member
 		m = GroupMembership(group_id=group.id, user_id=created_by, role=GroupRoles.ADMIN)
 		db.add(m)
-		db.commit()
+		commit_or_flush(db, group)
 		return group
 
 	def list_mine(self, db: Session, *, user_id: str) -> List[Group]:
@@ -36,8 +37,7 @@ class GroupsRepository:
 		group.name = name
 		if description is not None:
 			group.description = description
-		db.commit()
-		db.refresh(group)
+		commit_or_flush(db, group)
 		return group
 
 	def delete(self, db: Session, *, group_id: str) -> None:
@@ -45,7 +45,7 @@ class GroupsRepository:
 		if group is None:
 			return
 		db.delete(group)
-		db.commit()
+		commit_or_flush(db)
 		return
 
 
@@ -1,19 +1,32 @@
 from __future__ import annotations
 
-from typing import Optional, List, Protocol
+from typing import Any, Optional, List, Protocol
 from sqlalchemy.orm import Session
 
 from backend.db.models import Invitation, RecipientCaregiverAccess, GroupMemberInvite, Dependent
+from backend.utils.pagination import CursorKey
 
 
 class InvitationsRepo(Protocol):
 	def get_pending_by_id(self, db: Session, invitation_id) -> Optional[Invitation]:
 		...
 
-	def list_pending_for_caregiver(self, db: Session, caregiver_id, caregiver_email: str) -> List[Invitation]:
+	def list_pending_for_caregiver(self, db: Session, caregiver_id, caregiver_email: str, *, limit: Optional[int] = None, offset: Optional[int] = None) -> List[Any]:
 		...
 
-	def list_pending_for_recipient(self, db: Session, recipient_id, recipient_email: str) -> List[Invitation]:
+	def count_pending_for_caregiver(self, db: Session, caregiver_id, caregiver_email: str) -> int:
+		...
+
+	def list_pending_for_recipient(self, db: Session, recipient_id, recipient_email: str, *, limit: Optional[int] = None, offset: Optional[int] = None) -> List[Any]:
+		...
+
+	def count_pending_for_recipient(self, db: Session, recipient_id, recipient_email: str) -> int:
+		...
+
+	def list_pending_sent_by_recipient(self, db: Session, recipient_id, *, limit: Optional[int] = None, offset: Optional[int] = None) -> List[Invitation]:
+		...
+
+	def count_pending_sent_by_recipient(self, db: Session, recipient_id) -> int:
 		...
 
 	def create(
@@ -44,6 +57,9 @@ class AccessRepo(Protocol):
 	def upsert(self, db: Session, *, recipient_id, caregiver_id, access_level: Optional[str]) -> RecipientCaregiverAccess:
 		...
 
+	def ensure(self, db: Session, *, recipient_id, caregiver_id) -> None:
+		...
+
 	def delete(self, db: Session, *, recipient_id, caregiver_id) -> None:
 		...
 
@@ -58,7 +74,7 @@ class GroupMemberInvitesRepo(Protocol):
 	def get_pending_by_email(self, db: Session, *, group_id: str, email: str) -> Optional[GroupMemberInvite]:
 		...
 
-	def list_pending_paginated(self, db: Session, *, group_id: str, limit: int, offset: int) -> List[GroupMemberInvite]:
+	def list_pending_paginated(self, db: Session, *, group_id: str, limit: int, offset: int, after: Optional[CursorKey] = None) -> List[GroupMemberInvite]:
 		...
 
 	def count_pending(self, db: Session, *, group_id: str) -> int:
@@ -75,7 +91,7 @@ class DependentsRepo(Protocol):
 	def get(self, db: Session, *, dependent_id: str) -> Optional[Dependent]:
 		...
 
-	def list_by_group_paginated(self, db: Session, *, group_id: str, limit: int, offset: int) -> List[Dependent]:
+	def list_by_group_paginated(self, db: Session, *, group_id: str, limit: int, offset: int, after: Optional[CursorKey] = None) -> List[Dependent]:
 		...
 
 	def count_by_group(self, db: Session, *, group_id: str) -> int:
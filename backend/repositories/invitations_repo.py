@@ -1,11 +1,64 @@
 from __future__ import annotations
 
-from typing import Optional
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from typing import Any, Optional
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session, aliased
 
-from backend.db.models import Invitation
-from backend.core.constants import InvitationStatus
+from backend.db.models import Invitation, User
+from backend.db.session import commit_or_flush
+from backend.core.constants import InvitationStatus, Roles
+
+
+def _with_sender(*criteria: Any):
+	"""Invitations plus the sender's id/email/full_name in one query (no per-row user lookups)."""
+	sender = aliased(User)
+	sender_id = case((Invitation.sent_by == Roles.CAREGIVER, Invitation.caregiver_id), else_=Invitation.recipient_id)
+	return (
+		select(
+			Invitation,
+			sender.id.label("sender_id"),
+			sender.email.label("sender_email"),
+			sender.full_name.label("sender_full_name"),
+		)
+		.outerjoin(sender, sender.id == sender_id)
+		.where(*criteria)
+	)
+
+
+def _page(stmt, limit: Optional[int], offset: Optional[int]):
+	"""Stable order (ties on created_at broken by id) and optional LIMIT/OFFSET pushed into SQL."""
+	stmt = stmt.order_by(Invitation.created_at, Invitation.id)
+	if limit is not None:
+		stmt = stmt.limit(limit)
+	if offset:
+		stmt = stmt.offset(offset)
+	return stmt
+
+
+def _pending_for_caregiver(caregiver_id, caregiver_email: str) -> tuple:
+	return (
+		Invitation.status == InvitationStatus.PENDING,
+		(Invitation.caregiver_id == caregiver_id) | (Invitation.invited_email == caregiver_email),
+	)
+
+
+def _pending_for_recipient(recipient_id, recipient_email: str) -> tuple:
+	return (
+		Invitation.status == InvitationStatus.PENDING,
+		(Invitation.recipient_id == recipient_id) | (Invitation.invited_email == recipient_email),
+	)
+
+
+def _pending_sent_by_recipient(recipient_id) -> tuple:
+	return (
+		Invitation.recipient_id == recipient_id,
+		Invitation.status == InvitationStatus.PENDING,
+		Invitation.sent_by == Roles.RECIPIENT,
+	)
+
+
+def _count(db: Session, criteria: tuple) -> int:
+	return int(db.scalar(select(func.count()).select_from(Invitation).where(*criteria)) or 0)
 
 
 class InvitationsRepository:
@@ -14,21 +67,25 @@ class InvitationsRepository:
 			select(Invitation).where(Invitation.id == invitation_id, Invitation.status == InvitationStatus.PENDING)
 		)
 
-	def list_pending_for_caregiver(self, db: Session, caregiver_id, caregiver_email: str) -> list[Invitation]:
-		return db.scalars(
-			select(Invitation).where(
-				Invitation.status == InvitationStatus.PENDING,
-				(Invitation.caregiver_id == caregiver_id) | (Invitation.invited_email == caregiver_email),
-			)
-		).all()
-
-	def list_pending_for_recipient(self, db: Session, recipient_id, recipient_email: str) -> list[Invitation]:
-		return db.scalars(
-			select(Invitation).where(
-				Invitation.status == InvitationStatus.PENDING,
-				(Invitation.recipient_id == recipient_id) | (Invitation.invited_email == recipient_email),
-			)
-		).all()
+	def list_pending_for_caregiver(self, db: Session, caregiver_id, caregiver_email: str, *, limit: Optional[int] = None, offset: Optional[int] = None) -> list[Any]:
+		"""Rows of (Invitation, sender_id, sender_email, sender_full_name)."""
+		return db.execute(_page(_with_sender(*_pending_for_caregiver(caregiver_id, caregiver_email)), limit, offset)).all()
+
+	def count_pending_for_caregiver(self, db: Session, caregiver_id, caregiver_email: str) -> int:
+		return _count(db, _pending_for_caregiver(caregiver_id, caregiver_email))
+
+	def list_pending_for_recipient(self, db: Session, recipient_id, recipient_email: str, *, limit: Optional[int] = None, offset: Optional[int] = None) -> list[Any]:
+		"""Rows of (Invitation, sender_id, sender_email, sender_full_name)."""
+		return db.execute(_page(_with_sender(*_pending_for_recipient(recipient_id, recipient_email)), limit, offset)).all()
+
+	def count_pending_for_recipient(self, db: Session, recipient_id, recipient_email: str) -> int:
+		return _count(db, _pending_for_recipient(recipient_id, recipient_email))
+
+	def list_pending_sent_by_recipient(self, db: Session, recipient_id, *, limit: Optional[int] = None, offset: Optional[int] = None) -> list[Invitation]:
+		return db.scalars(_page(select(Invitation).where(*_pending_sent_by_recipient(recipient_id)), limit, offset)).all()
+
+	def count_pending_sent_by_recipient(self, db: Session, recipient_id) -> int:
+		return _count(db, _pending_sent_by_recipient(recipient_id))
 
 	def create(
 		self,
@@ -47,14 +104,12 @@ class InvitationsRepository:
 		)
 		inv.sent_by = sent_by
 		db.add(inv)
-		db.commit()
-		db.refresh(inv)
+		commit_or_flush(db, inv)
 		return inv
 
 	def set_status(self, db: Session, inv: Invitation, status: str) -> Invitation:
 		inv.status = status
-		db.commit()
-		db.refresh(inv)
+		commit_or_flush(db, inv)
 		return inv
 
 
@@ -6,15 +6,16 @@ from sqlalchemy import select, func
 from datetime import datetime, timezone
 
 from backend.db.models import GroupPaymentCode
+from backend.db.session import commit_or_flush
 from backend.core.constants import PaymentCodeStatus
+from backend.utils.pagination import CursorKey, seek
 
 
 class PaymentCodesRepository:
 	def create(self, db: Session, *, group_id: str, code: str, created_by: str, expires_at: Optional[datetime]) -> GroupPaymentCode:
 		row = GroupPaymentCode(group_id=group_id, code=code, created_by=created_by, expires_at=expires_at, status=PaymentCodeStatus.ACTIVE)
 		db.add(row)
-		db.commit()
-		db.refresh(row)
+		commit_or_flush(db, row)
 		return row
 
 	def get_by_code(self, db: Session, *, code: str) -> Optional[GroupPaymentCode]:
@@ -28,27 +29,28 @@ class PaymentCodesRepository:
 			db.scalar(select(func.count()).select_from(GroupPaymentCode).where(GroupPaymentCode.group_id == group_id)) or 0
 		)
 
-	def list_for_group_paginated(self, db: Session, *, group_id: str, limit: int, offset: int) -> List[GroupPaymentCode]:
+	def list_for_group_paginated(self, db: Session, *, group_id: str, limit: int, offset: int, after: Optional[CursorKey] = None) -> List[GroupPaymentCode]:
 		return db.scalars(
-			select(GroupPaymentCode)
-			.where(GroupPaymentCode.group_id == group_id)
-			.order_by(GroupPaymentCode.created_at)
-			.limit(limit)
-			.offset(offset)
+			seek(
+				select(GroupPaymentCode).where(GroupPaymentCode.group_id == group_id),
+				GroupPaymentCode.created_at,
+				GroupPaymentCode.id,
+				limit=limit,
+				offset=offset,
+				after=after,
+			)
 		).all()
 
 	def void(self, db: Session, *, row: GroupPaymentCode) -> GroupPaymentCode:
 		row.status = PaymentCodeStatus.EXPIRED
-		db.commit()
-		db.refresh(row)
+		commit_or_flush(db, row)
 		return row
 
 	def mark_redeemed(self, db: Session, *, row: GroupPaymentCode, user_id: str) -> GroupPaymentCode:
 		row.status = PaymentCodeStatus.REDEEMED
 		row.redeemed_by = user_id
 		row.redeemed_at = datetime.now(timezone.utc)
-		db.commit()
-		db.refresh(row)
+		commit_or_flush(db, row)
 		return row
 
 
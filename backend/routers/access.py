@@ -19,7 +19,7 @@ from backend.schemas.invitation import (
     PublicInvitationActionEnvelope,
 )
 from backend.routers.deps import get_current_user, get_invitations_service, get_access_service, get_group_member_invites_service
-from backend.db.database import get_db
+from backend.db.runner import DbRunner, get_db_runner, get_read_db_runner
 from backend.db.models import Invitation, User, RecipientCaregiverAccess
 from backend.core.constants import Roles
 from backend.services import InvitationsService, AccessService
@@ -60,15 +60,30 @@ def _err(detail: str) -> str:
     return detail if detail in known else Errors.INVALID_PAYLOAD
 
 
+def _cancel_invitation(db: Session, caregiver_id: str, inv_uuid: uuid.UUID) -> bool:
+    invitation = db.scalar(
+        select(Invitation).where(
+            Invitation.id == inv_uuid,
+            Invitation.caregiver_id == caregiver_id,
+            Invitation.status == InvitationStatus.PENDING,
+        )
+    )
+    if invitation is None:
+        return False
+    # Mark as declined (cancelled)
+    invitation.status = InvitationStatus.DECLINED
+    db.commit()
+    return True
+
 
 @recipient_access_router.get(Routes.ROOT, summary=Summaries.RECIPIENT_CAREGIVERS_LIST, response_model=RecipientCaregiversEnvelope)
 async def list_recipient_caregivers(
     recipientId: str,
     response: Response,
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_read_db_runner),
     access_service: AccessService = Depends(get_access_service),
 ) -> Dict[str, Any]:
-    result = access_service.list_recipient_caregivers(db, recipient_id=recipientId)
+    result = await run(access_service.list_recipient_caregivers, recipient_id=recipientId)
     items = result.get(Keys.ITEMS, [])
     response.headers[Headers.TOTAL_COUNT] = str(len(items))
     return result
@@ -80,7 +95,7 @@ async def assign_caregiver(
     recipientId: str,
     request: Request,
     payload: Dict[str, Any] = Body(default=None),
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_db_runner),
     access_service: AccessService = Depends(get_access_service),
 ) -> Dict[str, Any]:
     caregiver_id = (payload or {}).get(Keys.CAREGIVER_ID) or (payload or {}).get("caregiverId")
@@ -88,7 +103,7 @@ async def assign_caregiver(
     if not caregiver_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=Errors.INVALID_PAYLOAD)
     try:
-        return access_service.assign(db, recipient_id=recipientId, caregiver_id=caregiver_id, access_level=access_level)
+        return await run(access_service.assign, recipient_id=recipientId, caregiver_id=caregiver_id, access_level=access_level)
     except ValueError as e:
         detail = _err(str(e))
         raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -100,10 +115,10 @@ async def revoke_caregiver_access(
     recipientId: str,
     caregiverId: str,
     request: Request,
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_db_runner),
     access_service: AccessService = Depends(get_access_service),
 ) -> None:
-    access_service.revoke(db, recipient_id=recipientId, caregiver_id=caregiverId)
+    await run(access_service.revoke, recipient_id=recipientId, caregiver_id=caregiverId)
     return
 
 
@@ -114,11 +129,11 @@ async def update_caregiver_access(
     caregiverId: str,
     request: Request,
     payload: CaregiverAccessUpdate = Body(default=None),
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_db_runner),
     access_service: AccessService = Depends(get_access_service),
 ) -> Dict[str, Any]:
     try:
-        return access_service.update(db, recipient_id=recipientId, caregiver_id=caregiverId, access_level=payload.access_level)
+        return await run(access_service.update, recipient_id=recipientId, caregiver_id=caregiverId, access_level=payload.access_level)
     except ValueError as e:
         detail = _err(str(e))
         raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -127,10 +142,10 @@ async def update_caregiver_access(
 async def list_caregiver_recipients(
     caregiverId: str,
     response: Response,
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_read_db_runner),
     access_service: AccessService = Depends(get_access_service),
 ) -> Dict[str, Any]:
-    result = access_service.list_caregiver_recipients(db, caregiver_id=caregiverId)
+    result = await run(access_service.list_caregiver_recipients, caregiver_id=caregiverId)
     items = result.get(Keys.ITEMS, [])
     response.headers[Headers.TOTAL_COUNT] = str(len(items))
     return result
@@ -138,10 +153,10 @@ async def list_caregiver_recipients(
 
 @caregiver_recipients_router.get(Routes.RECIPIENT_ID, summary=Summaries.CAREGIVER_RECIPIENT_GET, response_model=CaregiverRecipientGetResponse)
 async def get_caregiver_recipient(
-    caregiverId: str, recipientId: str, db: Session = Depends(get_db), access_service: AccessService = Depends(get_access_service)
+    caregiverId: str, recipientId: str, run: DbRunner = Depends(get_read_db_runner), access_service: AccessService = Depends(get_access_service)
 ) -> Dict[str, Any]:
     try:
-        return access_service.get_caregiver_recipient(db, caregiver_id=caregiverId, recipient_id=recipientId)
+        return await run(access_service.get_caregiver_recipient, caregiver_id=caregiverId, recipient_id=recipientId)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=_err(str(e)))
 
@@ -157,11 +172,11 @@ async def send_invitation(
     caregiverId: str,
     request: Request,
     payload: RecipientInvitationCreate = Body(default=None),
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_db_runner),
     invitations_service: InvitationsService = Depends(get_invitations_service),
 ) -> Dict[str, Any]:
     try:
-        data = invitations_service.send_from_caregiver(db, caregiver_id=caregiverId, email=str(payload.email))
+        data = await run(invitations_service.send_from_caregiver, caregiver_id=caregiverId, email=str(payload.email))
     except ValueError as e:
         detail = _err(str(e))
         raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -176,12 +191,12 @@ async def list_sent_invitations(
     response: Response,
     limit: int = PaginationConsts.DEFAULT_LIMIT,
     offset: int = PaginationConsts.DEFAULT_OFFSET,
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_read_db_runner),
     invitations_service: InvitationsService = Depends(get_invitations_service),
 ) -> Dict[str, Any]:
     limit, offset = clamp_limit_offset(limit, offset, max_limit=PaginationConsts.MAX_LIMIT)
     try:
-        result = invitations_service.list_for_caregiver(db, caregiver_id=caregiverId, limit=limit, offset=offset)
+        result = await run(invitations_service.list_for_caregiver, caregiver_id=caregiverId, limit=limit, offset=offset)
     except ValueError as e:
         detail = _err(str(e))
         raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -191,23 +206,13 @@ async def list_sent_invitations(
 
 @caregiver_invitations_router.delete(Routes.INVITATION_ID, status_code=status.HTTP_204_NO_CONTENT, summary=Summaries.INVITATION_CANCEL)
 @rl_mutation()
-async def cancel_invitation(caregiverId: str, invitationId: str, request: Request, db: Session = Depends(get_db)) -> None:
+async def cancel_invitation(caregiverId: str, invitationId: str, request: Request, run: DbRunner = Depends(get_db_runner)) -> None:
     try:
         inv_uuid = uuid.UUID(invitationId)
     except Exception:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=Errors.USER_NOT_FOUND)
-    invitation = db.scalar(
-        select(Invitation).where(
-            Invitation.id == inv_uuid,
-            Invitation.caregiver_id == caregiverId,
-            Invitation.status == InvitationStatus.PENDING,
-        )
-    )
-    if invitation is None:
+    if not await run(_cancel_invitation, caregiverId, inv_uuid):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=Errors.USER_NOT_FOUND)
-    # Mark as declined (cancelled)
-    invitation.status = InvitationStatus.DECLINED
-    db.commit()
     return
 
 
@@ -219,12 +224,12 @@ async def list_recipient_invitations(
     response: Response,
     limit: int = PaginationConsts.DEFAULT_LIMIT,
     offset: int = PaginationConsts.DEFAULT_OFFSET,
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_read_db_runner),
     invitations_service: InvitationsService = Depends(get_invitations_service),
 ) -> Dict[str, Any]:
     limit, offset = clamp_limit_offset(limit, offset, max_limit=PaginationConsts.MAX_LIMIT)
     try:
-        result = invitations_service.list_for_recipient(db, recipient_id=recipientId, limit=limit, offset=offset)
+        result = await run(invitations_service.list_for_recipient, recipient_id=recipientId, limit=limit, offset=offset)
     except ValueError as e:
         detail = _err(str(e))
         raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -235,10 +240,10 @@ async def list_recipient_invitations(
 @recipient_invitations_router.post(Routes.INVITATION_ACCEPT, summary=Summaries.INVITATION_ACCEPT, response_model=RecipientInvitationActionEnvelope)
 @rl_mutation()
 async def accept_invitation(
-    recipientId: str, invitationId: str, request: Request, db: Session = Depends(get_db), invitations_service: InvitationsService = Depends(get_invitations_service)
+    recipientId: str, invitationId: str, request: Request, run: DbRunner = Depends(get_db_runner), invitations_service: InvitationsService = Depends(get_invitations_service)
 ) -> Dict[str, Any]:
     try:
-        return invitations_service.recipient_accept(db, recipient_id=recipientId, invitation_id=invitationId)
+        return await run(invitations_service.recipient_accept, recipient_id=recipientId, invitation_id=invitationId)
     except ValueError as e:
         detail = _err(str(e))
         raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -247,10 +252,10 @@ async def accept_invitation(
 @recipient_invitations_router.post(Routes.INVITATION_DECLINE, summary=Summaries.INVITATION_DECLINE, response_model=RecipientInvitationActionEnvelope)
 @rl_mutation()
 async def decline_invitation(
-    recipientId: str, invitationId: str, request: Request, db: Session = Depends(get_db), invitations_service: InvitationsService = Depends(get_invitations_service)
+    recipientId: str, invitationId: str, request: Request, run: DbRunner = Depends(get_db_runner), invitations_service: InvitationsService = Depends(get_invitations_service)
 ) -> Dict[str, Any]:
     try:
-        return invitations_service.recipient_decline(db, recipient_id=recipientId, invitation_id=invitationId)
+        return await run(invitations_service.recipient_decline, recipient_id=recipientId, invitation_id=invitationId)
     except ValueError as e:
         detail = _err(str(e))
         raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -272,11 +277,11 @@ async def create_recipient_invitation(
     recipientId: str,
     request: Request,
     payload: RecipientInvitationCreate = Body(default=None),
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_db_runner),
     invitations_service: InvitationsService = Depends(get_invitations_service),
 ) -> Dict[str, Any]:
     try:
-        data = invitations_service.send_from_recipient(db, recipient_id=recipientId, email=str(payload.email))
+        data = await run(invitations_service.send_from_recipient, recipient_id=recipientId, email=str(payload.email))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=_err(str(e)))
     return {Keys.MESSAGE: Messages.INVITATION_SENT, Keys.DATA: data}
@@ -286,10 +291,10 @@ async def create_recipient_invitation(
 @caregiver_invitations_router.post(Routes.INVITATION_ACCEPT, summary=Summaries.INVITATION_ACCEPT, response_model=CaregiverInvitationActionEnvelope)
 @rl_mutation()
 async def caregiver_accept_invitation(
-    caregiverId: str, invitationId: str, request: Request, db: Session = Depends(get_db), invitations_service: InvitationsService = Depends(get_invitations_service)
+    caregiverId: str, invitationId: str, request: Request, run: DbRunner = Depends(get_db_runner), invitations_service: InvitationsService = Depends(get_invitations_service)
 ) -> Dict[str, Any]:
     try:
-        return invitations_service.caregiver_accept(db, caregiver_id=caregiverId, invitation_id=invitationId)
+        return await run(invitations_service.caregiver_accept, caregiver_id=caregiverId, invitation_id=invitationId)
     except ValueError as e:
         detail = _err(str(e))
         raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -298,10 +303,10 @@ async def caregiver_accept_invitation(
 @caregiver_invitations_router.post(Routes.INVITATION_DECLINE, summary=Summaries.INVITATION_DECLINE, response_model=CaregiverInvitationActionEnvelope)
 @rl_mutation()
 async def caregiver_decline_invitation(
-    caregiverId: str, invitationId: str, request: Request, db: Session = Depends(get_db), invitations_service: InvitationsService = Depends(get_invitations_service)
+    caregiverId: str, invitationId: str, request: Request, run: DbRunner = Depends(get_db_runner), invitations_service: InvitationsService = Depends(get_invitations_service)
 ) -> Dict[str, Any]:
     try:
-        return invitations_service.caregiver_decline(db, caregiver_id=caregiverId, invitation_id=invitationId)
+        return await run(invitations_service.caregiver_decline, caregiver_id=caregiverId, invitation_id=invitationId)
     except ValueError as e:
         detail = _err(str(e))
         raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -314,12 +319,12 @@ async def list_recipient_sent_invitations(
     response: Response,
     limit: int = PaginationConsts.DEFAULT_LIMIT,
     offset: int = PaginationConsts.DEFAULT_OFFSET,
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_read_db_runner),
     invitations_service: InvitationsService = Depends(get_invitations_service),
 ) -> Dict[str, Any]:
     limit, offset = clamp_limit_offset(limit, offset, max_limit=PaginationConsts.MAX_LIMIT)
     try:
-        result = invitations_service.list_sent_by_recipient(db, recipient_id=recipientId, limit=limit, offset=offset)
+        result = await run(invitations_service.list_sent_by_recipient, recipient_id=recipientId, limit=limit, offset=offset)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=_err(str(e)))
     response.headers[Headers.TOTAL_COUNT] = str(result.get(Keys.TOTAL, 0))
@@ -332,12 +337,12 @@ async def list_recipient_sent_invitations(
 async def accept_by_token(
     payload: Dict[str, Any] = Body(default=None),
     request: Request = None,
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_db_runner),
     invitations_service: InvitationsService = Depends(get_invitations_service),
 ) -> Dict[str, Any]:
     token = (payload or {}).get(Keys.TOKEN)
     try:
-        return invitations_service.accept_by_token(db, token=token)
+        return await run(invitations_service.accept_by_token, token=token)
     except ValueError as e:
         detail = _err(str(e))
         raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -353,12 +358,12 @@ class GroupMemberAcceptResponse(BaseModel):
 async def accept_group_member_by_token(
     payload: Dict[str, Any] = Body(default=None),
     request: Request = None,
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_db_runner),
     svc: GroupMemberInvitesService = Depends(get_group_member_invites_service),
 ) -> Dict[str, Any]:
     token = (payload or {}).get(Keys.TOKEN)
     try:
-        return svc.accept_by_token(db, token=token)
+        return await run(svc.accept_by_token, token=token)
     except ValueError as e:
         detail = _err(str(e))
         raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -1,12 +1,13 @@
 """Auth endpoints for signup, login, me, logout, and password change."""
 from typing import Any, Dict, Optional
 from fastapi import APIRouter, Body, Depends, HTTPException, Header, status, Request
-from sqlalchemy.orm import Session
 from backend.core.constants import Prefix, Tags, Summaries, Messages, Errors, Routes, Fields
 from backend.rate_limit import rl_public
-from backend.db.database import get_db
+from sqlalchemy.orm import Session
+from backend.db.runner import DbRunner, get_db_runner
 from backend.schemas import SignupRequest, LoginRequest, ChangePasswordRequest, TokenResponse, UserResponse
 from backend.services.auth_service import AuthService
+from backend.services.kdf_pool import hash_password_async, rehash_if_needed, verify_password_async
 from sqlalchemy import select
 from backend.db.models import User, GroupMembership
 from backend.core.constants import Auth as AuthConst
@@ -17,16 +18,21 @@ router = APIRouter(prefix=Prefix.AUTH, tags=[Tags.AUTH])
 service = AuthService()
 
 
+def _group_ids(db: Session, user_id) -> list:
+    return [m.group_id for m in db.scalars(select(GroupMembership).where(GroupMembership.user_id == user_id)).all()]
+
+
 @router.post(Routes.AUTH_SIGNUP, status_code=status.HTTP_201_CREATED, summary=Summaries.SIGNUP, response_model=TokenResponse)
 @rl_public()
-async def signup(request: Request, payload: SignupRequest = Body(default=None), db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def signup(request: Request, payload: SignupRequest = Body(default=None), run: DbRunner = Depends(get_db_runner)) -> Dict[str, Any]:
     """Create a new user and return an access token."""
+    password_hash = await hash_password_async(payload.password)
     try:
-        _, token = service.signup(
-            db,
+        _, token = await run(
+            service.signup,
             username=payload.username,
             email=payload.email,
-            password=payload.password,
+            password_hash=password_hash,
             role=payload.role.value,
             full_name=payload.full_name,
             phone_number=payload.phone_number,
@@ -50,22 +56,26 @@ async def signup(request: Request, payload: SignupRequest = Body(default=None),
 
 @router.post(Routes.AUTH_LOGIN, summary=Summaries.LOGIN, response_model=TokenResponse)
 @rl_public()
-async def login(request: Request, payload: LoginRequest = Body(default=None), db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def login(request: Request, payload: LoginRequest = Body(default=None), run: DbRunner = Depends(get_db_runner)) -> Dict[str, Any]:
     """Authenticate an existing user and return an access token."""
-    try:
-        _, token = service.login(db, username=payload.username, password=payload.password)
-        return {"access_token": token, "token_type": Messages.TOKEN_TYPE_BEARER}
-    except ValueError:
+    user = await run(service.find_login_user, username=payload.username)
+    if user is None or not await verify_password_async(payload.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=Errors.INVALID_CREDENTIALS)
+    # Upgrade hashes written under an older KDF policy while the plaintext is at hand
+    new_hash = await rehash_if_needed(payload.password, user.password_hash)
+    if new_hash is not None:
+        await run(service.upgrade_password_hash, user_id=user.id, old_hash=user.password_hash, new_hash=new_hash)
+    return {"access_token": service.issue_token_for(user), "token_type": Messages.TOKEN_TYPE_BEARER}
 
 
 @router.get(Routes.AUTH_ME, summary=Summaries.AUTH_ME, response_model=UserResponse)
 async def auth_me(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_db_runner),
 ) -> Dict[str, Any]:
     """Return the current authenticated user's profile."""
     user = current_user
+    group_ids = await run(_group_ids, user.id)
     return {
         Fields.ID: user.id,
         Fields.USERNAME: user.username,
@@ -80,7 +90,7 @@ async def auth_me(
         Fields.AVATAR_URI: user.avatar_uri,
         Fields.CORPUS_URI: user.corpus_uri,
         Fields.CHAT_HISTORY_URI: user.chat_history_uri,
-        Fields.GROUP_IDS: [m.group_id for m in db.scalars(select(GroupMembership).where(GroupMembership.user_id == user.id)).all()],
+        Fields.GROUP_IDS: group_ids,
         Fields.ACCOUNT_TYPE: user.account_type,
         Fields.GROUP_ID: user.group_id,
         Fields.GCP_PROJECT_ID: user.gcp_project_id,
@@ -99,19 +109,13 @@ async def logout() -> None:
 async def change_password(
     payload: ChangePasswordRequest = Body(default=None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_db_runner),
 ) -> None:
     """Change the current user's password."""
-    try:
-        service.change_password(
-            db,
-            user=current_user,
-            current_password=payload.current_password,
-            new_password=payload.new_password,
-        )
-    except ValueError as e:
-        if str(e) == Errors.INCORRECT_PASSWORD:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=Errors.INCORRECT_PASSWORD)
-        raise
+    current_hash = await run(service.get_password_hash, user_id=current_user.id)
+    if not await verify_password_async(payload.current_password, current_hash):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=Errors.INCORRECT_PASSWORD)
+    new_hash = await hash_password_async(payload.new_password)
+    await run(service.set_password_hash, user_id=current_user.id, password_hash=new_hash)
     return
 
@@ -4,7 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 from backend.core.constants import Prefix, Tags, Summaries, Messages, Routes, Keys, Fields, Roles, Headers
 from backend.routers.deps import get_current_user
-from backend.db.database import get_db
+from backend.db.runner import DbRunner, get_db_runner
 from backend.db.models import User, RecipientCaregiverAccess
 from backend.schemas.relations import CaregiversListEnvelope
 
@@ -12,20 +12,26 @@ from backend.schemas.relations import CaregiversListEnvelope
 router = APIRouter(prefix=Prefix.CAREGIVERS, tags=[Tags.CAREGIVERS], dependencies=[Depends(get_current_user)])
 
 
+def _caregivers_of(db: Session, recipient_id) -> List[User]:
+    rows = db.scalars(
+        select(RecipientCaregiverAccess).where(RecipientCaregiverAccess.recipient_id == recipient_id)
+    ).all()
+    caregiver_ids = [r.caregiver_id for r in rows if r.caregiver_id is not None]
+    if not caregiver_ids:
+        return []
+    return db.scalars(select(User).where(User.id.in_(caregiver_ids))).all()
+
+
 @router.get(Routes.ROOT, summary=Summaries.CAREGIVERS_LIST, response_model=CaregiversListEnvelope)
 async def list_caregivers(
     response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_db_runner),
 ) -> Dict[str, Any]:
     # Always list caregivers that have access to this user as recipient,
     # regardless of the user's global role label.
-    rows = db.scalars(
-        select(RecipientCaregiverAccess).where(RecipientCaregiverAccess.recipient_id == current_user.id)
-    ).all()
-    caregiver_ids = [r.caregiver_id for r in rows if r.caregiver_id is not None]
-    if caregiver_ids:
-        caregivers = db.scalars(select(User).where(User.id.in_(caregiver_ids))).all()
+    caregivers = await run(_caregivers_of, current_user.id)
+    if caregivers:
         items: List[Dict[str, Any]] = [
             {Fields.ID: u.id, Fields.FULL_NAME: u.full_name or u.username, Fields.ROLE: u.role} for u in caregivers
         ]
@@ -1,12 +1,14 @@
+import hmac
 from typing import Optional
 from uuid import UUID
 
-from fastapi import Depends, Header, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from backend.core.constants import Errors, Auth as AuthConst, Messages
-from backend.db.database import get_db
+from backend.core.constants import DbReplica, Errors, Auth as AuthConst, Messages
+from backend.db.runner import DbRunner, get_db_runner
+from backend.container import get_container
 from backend.db.models import User
 from backend.services.auth_service import AuthService
 from backend.services.groups_service import GroupsService, MembershipsService
@@ -15,29 +17,38 @@ from backend.services.invitations_service import InvitationsService
 from backend.services.access_service import AccessService
 from backend.services import DocsService, IngestionService
 from backend.services.dlp_service import DlpService
-from backend.repositories.groups_repo import GroupsRepository
-from backend.repositories.group_memberships_repo import GroupMembershipsRepository
-from backend.repositories.payment_codes_repo import PaymentCodesRepository
-from backend.repositories.invitations_repo import InvitationsRepository
-from backend.repositories.access_repo import AccessRepository
-from backend.repositories.group_member_invites_repo import GroupMemberInvitesRepository
 from backend.services.group_member_invites_service import GroupMemberInvitesService
-from backend.repositories.dependents_repo import DependentsRepository
 from backend.services.dependents_service import DependentsService
+from backend.security.principal_cache import UserSnapshot, get_principal_cache
+from backend.core.settings import get_settings
 
 
 auth_service = AuthService()
 
 
-def get_current_user(
+def _load_user(db: Session, user_id: UUID) -> Optional[User]:
+    return db.scalar(select(User).where(User.id == user_id))
+
+
+async def get_current_user(
+    request: Request,
     authorization: Optional[str] = Header(default=None),
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_db_runner),
 ) -> User:
     if not authorization:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=Errors.UNAUTHORIZED)
     scheme, _, token = authorization.partition(" ")
     if not token or scheme.lower() != Messages.TOKEN_TYPE_BEARER:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=Errors.UNAUTHORIZED)
+    # Cache hit: token already verified and user loaded; no decode, no DB
+    cache = get_principal_cache()
+    signature = token.rpartition(".")[2]
+    if cache is not None and signature:
+        principal = cache.get(signature)
+        if principal is not None:
+            setattr(request.state, DbReplica.STATE_PRINCIPAL_ID, principal.id)
+            return principal
+    epoch = cache.epoch if cache is not None else 0
     try:
         payload = auth_service.verify_token(token)
         user_id = payload.get(AuthConst.JWT_CLAIM_SUB)
@@ -48,53 +59,68 @@ def get_current_user(
             user_uuid = UUID(user_id)
         except Exception:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=Errors.UNAUTHORIZED)
-        user = db.scalar(select(User).where(User.id == user_uuid))
+        user = await run(_load_user, user_uuid)
         if user is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=Errors.UNAUTHORIZED)
-        return user
+        # Keys the read-your-writes window of db/replica.py
+        setattr(request.state, DbReplica.STATE_PRINCIPAL_ID, user.id)
+        if cache is None:
+            return user
+        # Same read-only shape on hit and miss; writers reload the row by id
+        snapshot = UserSnapshot.of(user)
+        cache.put(signature, snapshot, token_exp=payload.get(AuthConst.JWT_CLAIM_EXP, 0), epoch=epoch)
+        return snapshot
     except HTTPException:
         raise
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=Errors.INVALID_CREDENTIALS)
 
 
+def require_ops_token(authorization: Optional[str] = Header(default=None)) -> None:
+    """Operator-only endpoints: `Authorization: Bearer <OPS_METRICS_TOKEN>`; closed when the token is unset."""
+    expected = get_settings().ops_metrics_token
+    scheme, _, token = (authorization or "").partition(" ")
+    if not expected or scheme.lower() != Messages.TOKEN_TYPE_BEARER or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=Errors.UNAUTHORIZED)
+
+
 
-# Service factories (constructor-based DI)
+# Service providers: app-scoped instances from the container (constructor DI inside; see backend/container.py)
 def get_groups_service() -> GroupsService:
-	return GroupsService(groups_repo=GroupsRepository(), members_repo=GroupMembershipsRepository())
+	return get_container().groups_service
 
 
 def get_memberships_service() -> MembershipsService:
-	return MembershipsService(groups_repo=GroupsRepository(), memberships_repo=GroupMembershipsRepository())
+	return get_container().memberships_service
 
 
 def get_payment_codes_service() -> PaymentCodesService:
-	return PaymentCodesService(repo=PaymentCodesRepository(), members=GroupMembershipsRepository(), groups=GroupsRepository())
+	return get_container().payment_codes_service
 
 
 def get_invitations_service() -> InvitationsService:
-	return InvitationsService(repo=InvitationsRepository())
+	return get_container().invitations_service
 
 
 def get_access_service() -> AccessService:
-	return AccessService(repo=AccessRepository())
+	return get_container().access_service
 
 
 def get_docs_service() -> DocsService:
-	return DocsService()
+	return get_container().docs_service
 
 
 def get_ingestion_service() -> IngestionService:
-	return IngestionService()
+	return get_container().ingestion_service
 
 
 def get_dlp_service() -> DlpService:
-	return DlpService()
+	return get_container().dlp_service
 
 
 def get_group_member_invites_service() -> GroupMemberInvitesService:
-	return GroupMemberInvitesService(repo=GroupMemberInvitesRepository(), memberships=GroupMembershipsRepository())
+	return get_container().group_member_invites_service
 
 def get_dependents_service() -> DependentsService:
-	return DependentsService(repo=DependentsRepository(), memberships=GroupMembershipsRepository())
+	return get_container().dependents_service
 
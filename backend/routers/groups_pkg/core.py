@@ -6,12 +6,12 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select
 
 from backend.core.constants import Routes, Keys, Fields, Errors, Summaries, Headers, GroupRoles, Messages, Roles, Pagination as PaginationConsts
-from backend.db.database import get_db
+from backend.db.runner import DbRunner, get_db_runner, get_read_db_runner
 from backend.routers.deps import get_current_user, get_groups_service, get_memberships_service
 from backend.db.models import User
 from backend.utils.pagination import clamp_limit_offset
 from backend.routers.http_errors import status_for_error
-from backend.services.auth_service import hash_password
+from backend.services.kdf_pool import hash_password_async
 from backend.schemas.groups import (
 	GroupCreate,
 	GroupUpdate,
@@ -30,11 +30,43 @@ import secrets
 router = APIRouter()
 
 
+def _users_by_ids(db: Session, user_ids: List[Any]) -> List[User]:
+	return db.scalars(select(User).where(User.id.in_(user_ids))).all()
+
+
+def _user_by_email(db: Session, normalized: str) -> Optional[User]:
+	return db.scalar(select(User).where(User.email == normalized))
+
+
+def _create_member_user(db: Session, normalized: str, payload: Any, password_hash: str) -> User:
+	"""Auto-create a caregiver account; the temporary password is hashed on the KDF pool by the caller."""
+	target = db.scalar(select(User).where(User.email == normalized))
+	if target is None:
+		age_val: Optional[int] = None
+		if payload.dob:
+			try:
+				dob_dt = date.fromisoformat(payload.dob)
+				today = date.today()
+				age_val = today.year - dob_dt.year - ((today.month, today.day) < (dob_dt.month, dob_dt.day))
+			except Exception:
+				pass
+		if payload.age is not None and isinstance(payload.age, int):
+			age_val = payload.age
+		full_name: Optional[str] = None
+		if payload.first_name or payload.last_name:
+			full_name = f"{(payload.first_name or '').strip()} {(payload.last_name or '').strip()}".strip() or None
+		target = User(username=normalized, email=normalized, password_hash=password_hash, role=Roles.CAREGIVER, full_name=full_name, age=age_val, corpus_uri=f"user://{normalized}/corpus", chat_history_uri=None)
+		db.add(target)
+		db.commit()
+		db.refresh(target)
+	return target
+
+
 @router.post(Routes.ROOT, status_code=status.HTTP_201_CREATED, summary=Summaries.GROUP_CREATE, response_model=GroupDetailEnvelope)
-async def create_group(payload: GroupCreate = Body(default=None), current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: GroupsService = Depends(get_groups_service)) -> Dict[str, Any]:
+async def create_group(payload: GroupCreate = Body(default=None), current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_db_runner), svc: GroupsService = Depends(get_groups_service)) -> Dict[str, Any]:
 	if (getattr(current_user, "account_type", None) or "").lower() != "group":
 		raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=Errors.FORBIDDEN)
-	data = svc.create(db, name=payload.name, description=payload.description, created_by=str(current_user.id))
+	data = await run(svc.create, name=payload.name, description=payload.description, created_by=str(current_user.id))
 	return {Keys.DATA: GroupDetail(**{
 		Fields.ID: data.get(Fields.ID),
 		Fields.NAME: data.get(Fields.NAME),
@@ -45,17 +77,17 @@ async def create_group(payload: GroupCreate = Body(default=None), current_user:
 
 
 @router.get(Routes.ROOT, summary=Summaries.GROUPS_LIST, response_model=GroupsListEnvelope)
-async def list_my_groups(response: Response, current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: GroupsService = Depends(get_groups_service)) -> Dict[str, Any]:
-	rows = svc.list_mine(db, user_id=str(current_user.id))
+async def list_my_groups(response: Response, current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_read_db_runner), svc: GroupsService = Depends(get_groups_service)) -> Dict[str, Any]:
+	rows = await run(svc.list_mine, user_id=str(current_user.id))
 	items = [GroupListItem(id=r["id"], name=r["name"], description=r.get("description")) for r in rows]
 	response.headers[Headers.TOTAL_COUNT] = str(len(items))
 	return {Keys.ITEMS: items}
 
 
 @router.get(Routes.ID, summary=Summaries.GROUP_GET, response_model=GroupDetailEnvelope)
-async def get_group(id: str, current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: GroupsService = Depends(get_groups_service)) -> Dict[str, Any]:
+async def get_group(id: str, current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_read_db_runner), svc: GroupsService = Depends(get_groups_service)) -> Dict[str, Any]:
 	try:
-		data = svc.get(db, group_id=id, user_id=str(current_user.id))
+		data = await run(svc.get, group_id=id, user_id=str(current_user.id))
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -69,9 +101,9 @@ async def get_group(id: str, current_user: User = Depends(get_current_user), db:
 
 
 @router.put(Routes.ID, summary=Summaries.GROUP_UPDATE, response_model=GroupDetailEnvelope)
-async def update_group(id: str, payload: GroupUpdate = Body(default=None), current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: GroupsService = Depends(get_groups_service)) -> Dict[str, Any]:
+async def update_group(id: str, payload: GroupUpdate = Body(default=None), current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_db_runner), svc: GroupsService = Depends(get_groups_service)) -> Dict[str, Any]:
 	try:
-		data = svc.update(db, group_id=id, user_id=str(current_user.id), name=payload.name, description=payload.description)
+		data = await run(svc.update, group_id=id, user_id=str(current_user.id), name=payload.name, description=payload.description)
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -85,9 +117,9 @@ async def update_group(id: str, payload: GroupUpdate = Body(default=None), curre
 
 
 @router.delete(Routes.ID, status_code=status.HTTP_204_NO_CONTENT, summary=Summaries.GROUP_DELETE)
-async def delete_group(id: str, current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: GroupsService = Depends(get_groups_service)) -> None:
+async def delete_group(id: str, current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_db_runner), svc: GroupsService = Depends(get_groups_service)) -> None:
 	try:
-		svc.delete(db, group_id=id, user_id=str(current_user.id))
+		await run(svc.delete, group_id=id, user_id=str(current_user.id))
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -95,27 +127,28 @@ async def delete_group(id: str, current_user: User = Depends(get_current_user),
 
 
 @router.get(Routes.ID + Routes.ACCESS, summary=Summaries.GROUP_MEMBERS_LIST, response_model=MembershipsListEnvelope)
-async def list_members(id: str, response: Response, limit: int = PaginationConsts.DEFAULT_LIMIT, offset: int = PaginationConsts.DEFAULT_OFFSET, current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: MembershipsService = Depends(get_memberships_service)) -> Dict[str, Any]:
+async def list_members(id: str, response: Response, limit: int = PaginationConsts.DEFAULT_LIMIT, offset: int = PaginationConsts.DEFAULT_OFFSET, cursor: Optional[str] = None, current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_read_db_runner), svc: MembershipsService = Depends(get_memberships_service)) -> Dict[str, Any]:
 	limit, offset = clamp_limit_offset(limit, offset, max_limit=PaginationConsts.MAX_LIMIT)
 	try:
-		result = svc.list_by_group(db, group_id=id, actor_id=str(current_user.id), limit=limit, offset=offset)
+		result = await run(svc.list_by_group, group_id=id, actor_id=str(current_user.id), limit=limit, offset=offset, cursor=cursor)
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
 	raw_items = result[Keys.ITEMS]
 	user_ids = [r.get("user_id") or r.get("userId") or r[Keys.USER_ID] for r in raw_items]
-	users_map = {str(u.id): u for u in db.scalars(select(User).where(User.id.in_(user_ids))).all()}
+	users_map = {str(u.id): u for u in await run(_users_by_ids, user_ids)}
 	items = []
 	for r in raw_items:
 		uid = r.get("user_id") if "user_id" in r else (r.get("userId") or r[Keys.USER_ID])
 		u = users_map.get(str(uid))
 		items.append(MembershipItem(id=r["id"], userId=str(uid), role=r["role"], full_name=(u.full_name if u else None), email=(u.email if u else None), age=(u.age if u else None)))
-	response.headers[Headers.TOTAL_COUNT] = str(result.get(Keys.TOTAL, len(items)))
-	return {Keys.ITEMS: items}
+	if result.get(Keys.TOTAL) is not None:
+		response.headers[Headers.TOTAL_COUNT] = str(result[Keys.TOTAL])
+	return {Keys.ITEMS: items, Keys.NEXT_CURSOR: result.get(Keys.NEXT_CURSOR)}
 
 
 @router.post(Routes.ID + Routes.ACCESS, summary=Summaries.GROUP_MEMBER_ADD, response_model=ActionEnvelope)
-async def add_member(id: str, request: Request, payload: "MemberAdd" = Body(default=None), current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: MembershipsService = Depends(get_memberships_service)) -> Dict[str, Any]:
+async def add_member(id: str, request: Request, payload: "MemberAdd" = Body(default=None), current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_db_runner), svc: MembershipsService = Depends(get_memberships_service)) -> Dict[str, Any]:
 	from pydantic import BaseModel
 	class MemberAdd(BaseModel):
 		email: str
@@ -127,27 +160,11 @@ async def add_member(id: str, request: Request, payload: "MemberAdd" = Body(defa
 	try:
 		normalized = (payload.email or "").strip().lower()
 		temp_password: Optional[str] = None
-		target = db.scalar(select(User).where(User.email == normalized))
+		target = await run(_user_by_email, normalized)
 		if target is None:
-			age_val: Optional[int] = None
-			if payload.dob:
-				try:
-					dob_dt = date.fromisoformat(payload.dob)
-					today = date.today()
-					age_val = today.year - dob_dt.year - ((today.month, today.day) < (dob_dt.month, dob_dt.day))
-				except Exception:
-					pass
-			if payload.age is not None and isinstance(payload.age, int):
-				age_val = payload.age
-			full_name: Optional[str] = None
-			if payload.first_name or payload.last_name:
-				full_name = f"{(payload.first_name or '').strip()} {(payload.last_name or '').strip()}".strip() or None
 			temp_password = secrets.token_urlsafe(12)
-			target = User(username=normalized, email=normalized, password_hash=hash_password(temp_password), role=Roles.CAREGIVER, full_name=full_name, age=age_val, corpus_uri=f"user://{normalized}/corpus", chat_history_uri=None)
-			db.add(target)
-			db.commit()
-			db.refresh(target)
-		svc.add(db, group_id=id, actor_id=str(current_user.id), user_id=str(target.id), role=payload.role or GroupRoles.MEMBER)
+			target = await run(_create_member_user, normalized, payload, await hash_password_async(temp_password))
+		await run(svc.add, group_id=id, actor_id=str(current_user.id), user_id=str(target.id), role=payload.role or GroupRoles.MEMBER)
 		if temp_password:
 			import logging
 			logging.getLogger(__name__).info("auto_user_created", extra={"email": normalized, "tempPassword": temp_password, "groupId": id})
@@ -158,12 +175,12 @@ async def add_member(id: str, request: Request, payload: "MemberAdd" = Body(defa
 
 
 @router.put(Routes.ID + Routes.ACCESS + Routes.USER_ID + Routes.ROLE, summary=Summaries.GROUP_MEMBER_UPDATE, response_model=ActionEnvelope)
-async def change_role(id: str, userId: str, request: Request, payload: "MemberRoleUpdate" = Body(default=None), current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: MembershipsService = Depends(get_memberships_service)) -> Dict[str, Any]:
+async def change_role(id: str, userId: str, request: Request, payload: "MemberRoleUpdate" = Body(default=None), current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_db_runner), svc: MembershipsService = Depends(get_memberships_service)) -> Dict[str, Any]:
 	from pydantic import BaseModel
 	class MemberRoleUpdate(BaseModel):
 		role: str
 	try:
-		svc.change_role(db, group_id=id, actor_id=str(current_user.id), user_id=userId, role=payload.role)
+		await run(svc.change_role, group_id=id, actor_id=str(current_user.id), user_id=userId, role=payload.role)
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -171,9 +188,9 @@ async def change_role(id: str, userId: str, request: Request, payload: "MemberRo
 
 
 @router.delete(Routes.ID + Routes.ACCESS + Routes.USER_ID, status_code=status.HTTP_204_NO_CONTENT, summary=Summaries.GROUP_MEMBER_REMOVE)
-async def remove_member(id: str, userId: str, request: Request, current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: MembershipsService = Depends(get_memberships_service)) -> None:
+async def remove_member(id: str, userId: str, request: Request, current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_db_runner), svc: MembershipsService = Depends(get_memberships_service)) -> None:
 	try:
-		svc.remove(db, group_id=id, actor_id=str(current_user.id), user_id=userId)
+		await run(svc.remove, group_id=id, actor_id=str(current_user.id), user_id=userId)
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -181,9 +198,9 @@ async def remove_member(id: str, userId: str, request: Request, current_user: Us
 
 
 @router.post(Routes.ID + Routes.ACCESS + Routes.SELF, status_code=status.HTTP_204_NO_CONTENT, summary=Summaries.GROUP_LEAVE)
-async def leave_group(id: str, current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: MembershipsService = Depends(get_memberships_service)) -> None:
+async def leave_group(id: str, current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_db_runner), svc: MembershipsService = Depends(get_memberships_service)) -> None:
 	try:
-		svc.leave(db, group_id=id, user_id=str(current_user.id))
+		await run(svc.leave, group_id=id, user_id=str(current_user.id))
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
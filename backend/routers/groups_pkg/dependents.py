@@ -1,25 +1,25 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from fastapi import APIRouter, Body, Depends, HTTPException, status, Response, Request
-from sqlalchemy.orm import Session
 
-from backend.core.constants import Routes, Keys, Fields, Summaries, Headers, Pagination as PaginationConsts
-from backend.db.database import get_db
+from backend.core.constants import Routes, Keys, Fields, Summaries, Headers, Auth as AuthConst, Pagination as PaginationConsts
+from backend.db.runner import DbRunner, get_db_runner, get_read_db_runner
 from backend.routers.deps import get_current_user, get_dependents_service
 from backend.db.models import User
 from backend.utils.pagination import clamp_limit_offset
 from backend.routers.http_errors import status_for_error
 from backend.schemas.dependents import DependentCreate, DependentItem, DependentsEnvelope, DependentConvertRequest, DependentConvertResponse
 from backend.services.dependents_service import DependentsService
+from backend.services.kdf_pool import hash_password_async
 
 router = APIRouter()
 
 
 @router.post(Routes.ID + "/dependents", summary="Create dependent", response_model=DependentItem)
-async def create_dependent(id: str, request: Request, payload: DependentCreate = Body(default=None), current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: DependentsService = Depends(get_dependents_service)) -> Dict[str, Any]:
+async def create_dependent(id: str, request: Request, payload: DependentCreate = Body(default=None), current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_db_runner), svc: DependentsService = Depends(get_dependents_service)) -> Dict[str, Any]:
 	try:
-		data = svc.create(db, group_id=id, actor_id=str(current_user.id), full_name=payload.full_name, dob=payload.dob, email=str(payload.email) if payload.email else None)
+		data = await run(svc.create, group_id=id, actor_id=str(current_user.id), full_name=payload.full_name, dob=payload.dob, email=str(payload.email) if payload.email else None)
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -27,22 +27,23 @@ async def create_dependent(id: str, request: Request, payload: DependentCreate =
 
 
 @router.get(Routes.ID + "/dependents", summary="List dependents", response_model=DependentsEnvelope)
-async def list_dependents(id: str, response: Response, limit: int = PaginationConsts.DEFAULT_LIMIT, offset: int = PaginationConsts.DEFAULT_OFFSET, current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: DependentsService = Depends(get_dependents_service)) -> Dict[str, Any]:
+async def list_dependents(id: str, response: Response, limit: int = PaginationConsts.DEFAULT_LIMIT, offset: int = PaginationConsts.DEFAULT_OFFSET, cursor: Optional[str] = None, current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_read_db_runner), svc: DependentsService = Depends(get_dependents_service)) -> Dict[str, Any]:
 	limit, offset = clamp_limit_offset(limit, offset, max_limit=PaginationConsts.MAX_LIMIT)
 	try:
-		result = svc.list(db, group_id=id, actor_id=str(current_user.id), limit=limit, offset=offset)
+		result = await run(svc.list, group_id=id, actor_id=str(current_user.id), limit=limit, offset=offset, cursor=cursor)
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
 	items = [DependentItem(**it) for it in result.get(Keys.ITEMS, [])]
-	response.headers[Headers.TOTAL_COUNT] = str(result.get(Keys.TOTAL, len(items)))
-	return {"items": items}
+	if result.get(Keys.TOTAL) is not None:
+		response.headers[Headers.TOTAL_COUNT] = str(result[Keys.TOTAL])
+	return {"items": items, Keys.NEXT_CURSOR: result.get(Keys.NEXT_CURSOR)}
 
 
 @router.delete(Routes.ID + "/dependents" + Routes.USER_ID, status_code=status.HTTP_204_NO_CONTENT, summary="Delete dependent")
-async def delete_dependent(id: str, userId: str, request: Request, current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: DependentsService = Depends(get_dependents_service)) -> None:
+async def delete_dependent(id: str, userId: str, request: Request, current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_db_runner), svc: DependentsService = Depends(get_dependents_service)) -> None:
 	try:
-		svc.delete(db, group_id=id, actor_id=str(current_user.id), dependent_id=userId)
+		await run(svc.delete, group_id=id, actor_id=str(current_user.id), dependent_id=userId)
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -50,9 +51,10 @@ async def delete_dependent(id: str, userId: str, request: Request, current_user:
 
 
 @router.post(Routes.ID + "/dependents" + Routes.USER_ID + "/convert", summary="Convert dependent to account", response_model=DependentConvertResponse)
-async def convert_dependent(id: str, userId: str, request: Request, payload: DependentConvertRequest = Body(default=None), current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: DependentsService = Depends(get_dependents_service)) -> Dict[str, Any]:
+async def convert_dependent(id: str, userId: str, request: Request, payload: DependentConvertRequest = Body(default=None), current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_db_runner), svc: DependentsService = Depends(get_dependents_service)) -> Dict[str, Any]:
+	password_hash = await hash_password_async(AuthConst.DEPENDENT_TEMP_PASSWORD)
 	try:
-		data = svc.convert_to_account(db, group_id=id, actor_id=str(current_user.id), dependent_id=userId, email=(str(payload.email) if payload and payload.email else None))
+		data = await run(svc.convert_to_account, group_id=id, actor_id=str(current_user.id), dependent_id=userId, email=(str(payload.email) if payload and payload.email else None), password_hash=password_hash)
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
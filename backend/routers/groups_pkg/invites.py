@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from fastapi import APIRouter, Body, Depends, HTTPException, status, Response, Request
-from sqlalchemy.orm import Session
 
 from backend.core.constants import Routes, Keys, Fields, Summaries, Headers, Messages, Pagination as PaginationConsts
-from backend.db.database import get_db
+from backend.db.runner import DbRunner, get_db_runner, get_read_db_runner
+from backend.db.models import User
 from backend.routers.deps import get_current_user, get_group_member_invites_service
 from backend.routers.http_errors import status_for_error
 from backend.schemas.group_invites import GroupMemberInviteCreate, GroupMemberInviteItem, GroupMemberInvitesEnvelope, GroupMemberInviteCreatedEnvelope
@@ -16,9 +16,9 @@ router = APIRouter()
 
 
 @router.post(Routes.ID + Routes.ACCESS + "/invitations", summary="Send group member invite", response_model=GroupMemberInviteCreatedEnvelope)
-async def send_group_member_invite(id: str, request: Request, payload: GroupMemberInviteCreate = Body(default=None), current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: GroupMemberInvitesService = Depends(get_group_member_invites_service)) -> Dict[str, Any]:
+async def send_group_member_invite(id: str, request: Request, payload: GroupMemberInviteCreate = Body(default=None), current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_db_runner), svc: GroupMemberInvitesService = Depends(get_group_member_invites_service)) -> Dict[str, Any]:
 	try:
-		data = svc.send(db, group_id=id, actor_id=str(current_user.id), email=str(payload.email), full_name=payload.full_name)
+		data = await run(svc.send, group_id=id, actor_id=str(current_user.id), email=str(payload.email), full_name=payload.full_name)
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -26,15 +26,16 @@ async def send_group_member_invite(id: str, request: Request, payload: GroupMemb
 
 
 @router.get(Routes.ID + Routes.ACCESS + "/invitations", summary="List pending group member invites", response_model=GroupMemberInvitesEnvelope)
-async def list_group_member_invites(id: str, response: Response, limit: int = PaginationConsts.DEFAULT_LIMIT, offset: int = PaginationConsts.DEFAULT_OFFSET, current_user: User = Depends(get_current_user), db: Session = Depends(get_db), svc: GroupMemberInvitesService = Depends(get_group_member_invites_service)) -> Dict[str, Any]:
+async def list_group_member_invites(id: str, response: Response, limit: int = PaginationConsts.DEFAULT_LIMIT, offset: int = PaginationConsts.DEFAULT_OFFSET, cursor: Optional[str] = None, current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_read_db_runner), svc: GroupMemberInvitesService = Depends(get_group_member_invites_service)) -> Dict[str, Any]:
 	limit, offset = clamp_limit_offset(limit, offset, max_limit=PaginationConsts.MAX_LIMIT)
 	try:
-		result = svc.list_pending(db, group_id=id, limit=limit, offset=offset)
+		result = await run(svc.list_pending, group_id=id, limit=limit, offset=offset, cursor=cursor)
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
 	items = [GroupMemberInviteItem(**it) for it in result.get(Keys.ITEMS, [])]
-	response.headers[Headers.TOTAL_COUNT] = str(result.get(Keys.TOTAL, len(items)))
-	return {Keys.ITEMS: items}
+	if result.get(Keys.TOTAL) is not None:
+		response.headers[Headers.TOTAL_COUNT] = str(result[Keys.TOTAL])
+	return {Keys.ITEMS: items, Keys.NEXT_CURSOR: result.get(Keys.NEXT_CURSOR)}
 
 
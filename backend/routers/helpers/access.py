@@ -6,18 +6,25 @@ from sqlalchemy import select
 
 from backend.core.constants import Errors
 from backend.db.models import User, RecipientCaregiverAccess
+from backend.security.access_cache import get_access_cache
 
 
 def assert_can_access_recipient(db: Session, recipient_id: str, current_user: User) -> None:
-	"""Allow self or caregivers with an access edge to the recipient."""
+	"""Allow self or caregivers with an access edge to the recipient (edge lookups cached briefly)."""
 	if str(current_user.id) == recipient_id:
 		return
-	allowed = db.scalar(
-		select(RecipientCaregiverAccess).where(
-			RecipientCaregiverAccess.recipient_id == recipient_id,
-			RecipientCaregiverAccess.caregiver_id == current_user.id,
-		)
-	)
+	cache = get_access_cache()
+	allowed = cache.get(current_user.id, recipient_id) if cache is not None else None
+	if allowed is None:
+		epoch = cache.epoch if cache is not None else 0
+		allowed = db.scalar(
+			select(RecipientCaregiverAccess.id).where(
+				RecipientCaregiverAccess.recipient_id == recipient_id,
+				RecipientCaregiverAccess.caregiver_id == current_user.id,
+			)
+		) is not None
+		if cache is not None:
+			cache.put(current_user.id, recipient_id, allowed, epoch=epoch)
 	if not allowed:
 		raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=Errors.FORBIDDEN)
 
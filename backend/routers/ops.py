@@ -3,23 +3,29 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 from backend.core.constants import Tags, Summaries, Messages, Routes, Keys, Errors
-from backend.db.database import get_db
+from backend.db.runner import DbRunner, get_db_runner
+from backend.routers.deps import require_ops_token
 from backend.core.settings import get_settings
-from backend.schemas.ops import HealthzResponse, ReadyzResponse
+from backend.core.metrics import metrics
+from backend.schemas.ops import HealthzResponse, ReadyzResponse, MetricsResponse
 
 
 router = APIRouter(tags=[Tags.OPS])
 
 
+def _ping(db: Session) -> None:
+    db.execute(text("SELECT 1"))
+
+
 @router.get(Routes.HEALTHZ, summary=Summaries.HEALTHZ, response_model=HealthzResponse)
 async def healthz() -> Dict[str, Any]:
     return {Keys.STATUS: Messages.OK}
 
 
 @router.get(Routes.READYZ, summary=Summaries.READYZ, response_model=ReadyzResponse)
-async def readyz(db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def readyz(run: DbRunner = Depends(get_db_runner)) -> Dict[str, Any]:
     try:
-        db.execute(text("SELECT 1"))
+        await run(_ping)
         settings = get_settings()
         return {
             Keys.STATUS: Messages.READY,
@@ -33,3 +39,6 @@ async def readyz(db: Session = Depends(get_db)) -> Dict[str, Any]:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=Errors.DB_UNAVAILABLE)
 
 
+@router.get(Routes.METRICS, summary=Summaries.METRICS, response_model=MetricsResponse, dependencies=[Depends(require_ops_token)])
+async def get_metrics() -> Dict[str, Any]:
+    return metrics.snapshot()
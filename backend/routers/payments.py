@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from fastapi import APIRouter, Body, Depends, HTTPException, status, Response, Request
-from sqlalchemy.orm import Session
 
 from backend.core.constants import Prefix, Tags, Routes, Summaries, Errors, Keys, Headers, Pagination as PaginationConsts
-from backend.db.database import get_db
+from backend.db.runner import DbRunner, get_db_runner, get_read_db_runner
 from backend.routers.deps import get_current_user, get_payment_codes_service
 from backend.db.models import User
 from backend.services.payment_codes_service import PaymentCodesService
@@ -31,11 +30,11 @@ async def create_code(
 	request: Request,
 	payload: CodeCreateRequest = Body(default=None),
 	current_user: User = Depends(get_current_user),
-	db: Session = Depends(get_db),
+	run: DbRunner = Depends(get_db_runner),
 	payment_codes_service: PaymentCodesService = Depends(get_payment_codes_service),
 ) -> Dict[str, Any]:
 	try:
-		data = payment_codes_service.create_code(db, group_id=id, actor_id=str(current_user.id), ttl_minutes=payload.ttl_minutes or 0)
+		data = await run(payment_codes_service.create_code, group_id=id, actor_id=str(current_user.id), ttl_minutes=payload.ttl_minutes or 0)
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -48,28 +47,30 @@ async def list_codes(
 	response: Response,
 	limit: int = PaginationConsts.DEFAULT_LIMIT,
 	offset: int = PaginationConsts.DEFAULT_OFFSET,
+	cursor: Optional[str] = None,
 	current_user: User = Depends(get_current_user),
-	db: Session = Depends(get_db),
+	run: DbRunner = Depends(get_read_db_runner),
 	payment_codes_service: PaymentCodesService = Depends(get_payment_codes_service),
 ) -> Dict[str, Any]:
 	limit, offset = clamp_limit_offset(limit, offset, max_limit=PaginationConsts.MAX_LIMIT)
 	try:
-		result = payment_codes_service.list_codes(db, group_id=id, actor_id=str(current_user.id), limit=limit, offset=offset)
+		result = await run(payment_codes_service.list_codes, group_id=id, actor_id=str(current_user.id), limit=limit, offset=offset, cursor=cursor)
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
 	items = [CodeListItem(code=r.get(Keys.CODE), status=r.get(Keys.STATUS), expires_at=r.get(Keys.EXPIRES_AT), redeemed_by=r.get(Keys.REDEEMED_BY)) for r in result[Keys.ITEMS]]
-	response.headers[Headers.TOTAL_COUNT] = str(result.get(Keys.TOTAL, len(items)))
-	return {Keys.ITEMS: items}
+	if result.get(Keys.TOTAL) is not None:
+		response.headers[Headers.TOTAL_COUNT] = str(result[Keys.TOTAL])
+	return {Keys.ITEMS: items, Keys.NEXT_CURSOR: result.get(Keys.NEXT_CURSOR)}
 
 
 @router.post(Prefix.GROUPS + Routes.ID + Routes.PAYMENTS + Routes.CODES + Routes.CODE + Routes.VOID, summary=Summaries.PAYMENT_CODE_VOID, status_code=status.HTTP_204_NO_CONTENT)
 @rl_mutation()
 async def void_code(
-	id: str, code: str, request: Request, current_user: User = Depends(get_current_user), db: Session = Depends(get_db), payment_codes_service: PaymentCodesService = Depends(get_payment_codes_service)
+	id: str, code: str, request: Request, current_user: User = Depends(get_current_user), run: DbRunner = Depends(get_db_runner), payment_codes_service: PaymentCodesService = Depends(get_payment_codes_service)
 ) -> None:
 	try:
-		payment_codes_service.void_code(db, group_id=id, actor_id=str(current_user.id), code=code)
+		await run(payment_codes_service.void_code, group_id=id, actor_id=str(current_user.id), code=code)
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -80,11 +81,11 @@ async def void_code(
 async def redeem_code(
 	payload: RedeemRequest = Body(default=None),
 	current_user: User = Depends(get_current_user),
-	db: Session = Depends(get_db),
+	run: DbRunner = Depends(get_db_runner),
 	payment_codes_service: PaymentCodesService = Depends(get_payment_codes_service),
 ) -> Dict[str, Any]:
 	try:
-		data = payment_codes_service.redeem(db, code=payload.code, user_id=str(current_user.id))
+		data = await run(payment_codes_service.redeem, code=payload.code, user_id=str(current_user.id))
 	except ValueError as e:
 		detail = str(e)
 		raise HTTPException(status_code=status_for_error(detail), detail=detail)
@@ -4,7 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 from backend.core.constants import Prefix, Tags, Summaries, Messages, Routes, Keys, Fields, Roles, Headers
 from backend.routers.deps import get_current_user
-from backend.db.database import get_db
+from backend.db.runner import DbRunner, get_db_runner
 from backend.db.models import User, RecipientCaregiverAccess
 from backend.schemas.relations import RecipientsListEnvelope
 
@@ -12,19 +12,25 @@ from backend.schemas.relations import RecipientsListEnvelope
 router = APIRouter(prefix=Prefix.RECIPIENTS, tags=[Tags.RECIPIENTS], dependencies=[Depends(get_current_user)])
 
 
+def _recipients_of(db: Session, caregiver_id) -> List[User]:
+    rows = db.scalars(select(RecipientCaregiverAccess).where(RecipientCaregiverAccess.caregiver_id == caregiver_id)).all()
+    recipient_ids = [r.recipient_id for r in rows if r.recipient_id is not None]
+    if not recipient_ids:
+        return []
+    return db.scalars(select(User).where(User.id.in_(recipient_ids))).all()
+
+
 @router.get(Routes.ROOT, summary=Summaries.RECIPIENTS_LIST, response_model=RecipientsListEnvelope)
 async def list_recipients(
     response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_db_runner),
 ) -> Dict[str, Any]:
     items: List[Dict[str, Any]] = []
     # If the current user is a caregiver, list recipients they have access to
     if current_user.role == Roles.CAREGIVER:
-        rows = db.scalars(select(RecipientCaregiverAccess).where(RecipientCaregiverAccess.caregiver_id == current_user.id)).all()
-        recipient_ids = [r.recipient_id for r in rows if r.recipient_id is not None]
-        if recipient_ids:
-            recipients = db.scalars(select(User).where(User.id.in_(recipient_ids))).all()
+        recipients = await run(_recipients_of, current_user.id)
+        if recipients:
             items = [{Fields.ID: u.id, Fields.FULL_NAME: u.full_name or u.username} for u in recipients]
     else:
         # Current user is a recipient; include self as the only recipient
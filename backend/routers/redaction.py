@@ -17,6 +17,7 @@ from backend.core.constants import Prefix, Tags, Summaries, MimeTypes, Encoding,
 from backend.services.dlp_service import DlpService
 from backend.routers.deps import get_current_user, get_dlp_service
 from backend.db.models import User
+from backend.utils.uploads import open_upload
 from backend.schemas.redaction import RedactionTestRequest, RedactionTestResponse, RedactionStatusResponse, RedactionTextFileResponse
 
 
@@ -57,6 +58,7 @@ async def redaction_status(
 		Keys.PROJECT_ID: settings.gcp_project_id,
 		Keys.LOCATION: settings.dlp_location,
 		Keys.CLIENT_READY: dlp.is_ready(),
+		Keys.PROVIDER: dlp.provider_name,
 	}
 
 
@@ -72,13 +74,14 @@ async def redact_file(
 	- Text: returns JSON with redactedText and findings
 	- Image: returns redacted bytes as a streamed response
 	"""
-	# Read file bytes
-	data = await file.read()
 	content_type = file.content_type or ""
 
 	# Image flow: return redacted bytes, no findings
 	if content_type.startswith(MimeTypes.IMAGE_PREFIX):
-		redacted_bytes, _ = dlp.redact_content(content=data, mime_type=content_type)
+		with open_upload(file) as upload:
+			redacted_bytes, _ = dlp.redact_content(content=upload.data, mime_type=content_type)
+			# Response outlives the spooled upload, so an unredacted passthrough is copied once here
+			redacted_bytes = bytes(redacted_bytes)
 		if asBase64:
 			b64 = base64.b64encode(redacted_bytes).decode("ascii")
 			return {Keys.IMAGE_BASE64: b64, Keys.MIME_TYPE: content_type or "image/png"}
@@ -86,9 +89,11 @@ async def redact_file(
 
 	# Text flow: return JSON with redactedText and findings
 	if content_type.startswith("text/") or content_type in ("application/json",):
-		redacted_bytes, findings = dlp.redact_content(content=data, mime_type=MimeTypes.TEXT_PLAIN)
+		with open_upload(file) as upload:
+			redacted_bytes, findings = dlp.redact_content(content=upload.data, mime_type=MimeTypes.TEXT_PLAIN)
+			redacted_text = str(redacted_bytes, Encoding.UTF8, errors="ignore")
 		return RedactionTextFileResponse(
-			redactedText=redacted_bytes.decode(Encoding.UTF8, errors="ignore"),
+			redactedText=redacted_text,
 			findings=findings,
 		)
 
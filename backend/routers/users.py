@@ -1,34 +1,99 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 from fastapi import APIRouter, Body, status, Depends, HTTPException, Response, UploadFile, File
 from sqlalchemy import select, func
 from sqlalchemy.orm import Session
-from backend.core.constants import Prefix, Tags, Summaries, Messages, Fields, Errors, Headers, Keys, Routes, Pagination as PaginationConsts
+from backend.core.constants import Prefix, Tags, Summaries, Messages, Fields, Errors, Headers, Keys, Routes, CursorScopes, Pagination as PaginationConsts
 from backend.schemas import UserCreate, UserUpdate, UserResponse
 from backend.schemas.user import UsersListEnvelope
-from backend.db.database import get_db
+from backend.db.runner import DbRunner, get_db_runner, get_read_db_runner
 from backend.db.models import User, GroupMembership
 from backend.routers.deps import get_current_user
 from backend.schemas.user import UserSettingsUpdate
-from backend.utils.pagination import clamp_limit_offset
+from backend.utils.pagination import CursorKey, clamp_limit_offset, decode_cursor, keyset_page, seek
+from backend.security.principal_cache import invalidate_principal
 
 
 router = APIRouter(prefix=Prefix.USERS, tags=[Tags.USERS])
 
 
+def _group_ids(db: Session, user_id) -> List[Any]:
+    return [m.group_id for m in db.scalars(select(GroupMembership).where(GroupMembership.user_id == user_id)).all()]
+
+
+def _list_users_page(db: Session, *, limit: int, offset: int, after: Optional[CursorKey] = None) -> Tuple[Optional[int], List[Tuple[User, List[Any]]], Optional[str]]:
+    # Cursor pages skip COUNT(*) so each page stays constant-cost
+    total = (db.scalar(select(func.count()).select_from(User)) or 0) if after is None else None
+    users = db.scalars(
+        seek(select(User), User.created_at, User.id, limit=limit + 1, offset=offset, after=after)
+    ).all()
+    users, next_cursor = keyset_page(users, limit, CursorScopes.USERS)
+    return total, [(u, _group_ids(db, u.id)) for u in users], next_cursor
+
+
+def _get_user_with_groups(db: Session, user_id: UUID) -> Tuple[Optional[User], List[Any]]:
+    user = db.scalar(select(User).where(User.id == user_id))
+    if user is None:
+        return None, []
+    return user, _group_ids(db, user.id)
+
+
+def _set_avatar(db: Session, user_id: UUID, avatar_uri: str) -> None:
+    user = db.scalar(select(User).where(User.id == user_id))
+    if user is None:
+        return
+    user.avatar_uri = avatar_uri
+    db.commit()
+    invalidate_principal(user_id)
+
+
+def _apply_settings(db: Session, user_id: UUID, data: Dict[str, Any]) -> Tuple[Optional[User], List[Any]]:
+    user = db.scalar(select(User).where(User.id == user_id))
+    if user is None:
+        return None, []
+    if Fields.FULL_NAME in data:
+        user.full_name = data[Fields.FULL_NAME]
+    if Fields.PHONE_NUMBER in data:
+        user.phone_number = data[Fields.PHONE_NUMBER]
+    if Fields.AGE in data:
+        user.age = data[Fields.AGE]
+    if Fields.COUNTRY in data:
+        user.country = data[Fields.COUNTRY]
+    if Fields.AVATAR_URI in data:
+        user.avatar_uri = data[Fields.AVATAR_URI]
+    if Fields.CORPUS_URI in data:
+        user.corpus_uri = data[Fields.CORPUS_URI]
+    if Fields.CHAT_HISTORY_URI in data:
+        user.chat_history_uri = data[Fields.CHAT_HISTORY_URI]
+    if Fields.ACCOUNT_TYPE in data:
+        user.account_type = data[Fields.ACCOUNT_TYPE]
+    if Fields.GCP_PROJECT_ID in data:
+        user.gcp_project_id = data[Fields.GCP_PROJECT_ID]
+    if Fields.TEMP_BUCKET in data:
+        user.temp_bucket = data[Fields.TEMP_BUCKET]
+    if Fields.PAYMENT_INFO in data:
+        user.payment_info = data[Fields.PAYMENT_INFO]
+    db.commit()
+    invalidate_principal(user_id)
+    db.refresh(user)
+    return user, _group_ids(db, user.id)
+
+
 @router.get("", summary=Summaries.USERS_LIST, response_model=UsersListEnvelope)
 async def list_users(
     response: Response,
     limit: int = PaginationConsts.DEFAULT_LIMIT,
     offset: int = PaginationConsts.DEFAULT_OFFSET,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    run: DbRunner = Depends(get_read_db_runner),
 ) -> Dict[str, Any]:
     # Clamp pagination for consistency
     limit, offset = clamp_limit_offset(limit, offset, max_limit=PaginationConsts.MAX_LIMIT)
-    total = db.scalar(select(func.count()).select_from(User)) or 0
-    users = db.scalars(
-        select(User).order_by(User.created_at).limit(limit).offset(offset)
-    ).all()
+    try:
+        after = decode_cursor(cursor, CursorScopes.USERS) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    total, rows, next_cursor = await run(_list_users_page, limit=limit, offset=offset, after=after)
     items: List[Dict[str, Any]] = [
         {
             Fields.ID: u.id,
@@ -44,16 +109,17 @@ async def list_users(
             Fields.UPDATED_AT: u.updated_at,
             Fields.CORPUS_URI: u.corpus_uri,
             Fields.CHAT_HISTORY_URI: u.chat_history_uri,
-            Fields.GROUP_IDS: [m.group_id for m in db.scalars(select(GroupMembership).where(GroupMembership.user_id == u.id)).all()],
+            Fields.GROUP_IDS: group_ids,
             Fields.ACCOUNT_TYPE: u.account_type,
             Fields.GCP_PROJECT_ID: u.gcp_project_id,
             Fields.TEMP_BUCKET: u.temp_bucket,
             Fields.PAYMENT_INFO: u.payment_info,
         }
-        for u in users
+        for u, group_ids in rows
     ]
-    response.headers[Headers.TOTAL_COUNT] = str(total)
-    return {Keys.ITEMS: items}
+    if total is not None:
+        response.headers[Headers.TOTAL_COUNT] = str(total)
+    return {Keys.ITEMS: items, Keys.NEXT_CURSOR: next_cursor}
 
 
 @router.post("", status_code=status.HTTP_201_CREATED, summary=Summaries.USER_CREATE)
@@ -62,12 +128,12 @@ async def create_user(payload: UserCreate = Body(default=None)) -> Dict[str, Any
 
 
 @router.get("/{id}", summary=Summaries.USER_GET, response_model=UserResponse)
-async def get_user(id: str, db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def get_user(id: str, run: DbRunner = Depends(get_read_db_runner)) -> Dict[str, Any]:
     try:
         uuid = UUID(id)
     except Exception:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=Errors.USER_NOT_FOUND)
-    user = db.scalar(select(User).where(User.id == uuid))
+    user, group_ids = await run(_get_user_with_groups, uuid)
     if user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=Errors.USER_NOT_FOUND)
     return {
@@ -84,7 +150,7 @@ async def get_user(id: str, db: Session = Depends(get_db)) -> Dict[str, Any]:
         Fields.UPDATED_AT: user.updated_at,
         Fields.CORPUS_URI: user.corpus_uri,
         Fields.CHAT_HISTORY_URI: user.chat_history_uri,
-        Fields.GROUP_IDS: [m.group_id for m in db.scalars(select(GroupMembership).where(GroupMembership.user_id == user.id)).all()],
+        Fields.GROUP_IDS: group_ids,
         Fields.ACCOUNT_TYPE: user.account_type,
         Fields.GCP_PROJECT_ID: user.gcp_project_id,
         Fields.TEMP_BUCKET: user.temp_bucket,
@@ -95,7 +161,7 @@ async def get_user(id: str, db: Session = Depends(get_db)) -> Dict[str, Any]:
 async def upload_avatar(
     id: str,
     file: UploadFile = File(default=None),
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_db_runner),
     current_user: User = Depends(get_current_user),
 ) -> Dict[str, Any]:
     try:
@@ -108,10 +174,8 @@ async def upload_avatar(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=Errors.MISSING_INGESTION_CONFIG)
     fname = (file.filename or "avatar").split("/")[-1]
     avatar_uri = f"gs://{current_user.temp_bucket}/avatars/{current_user.id}/{fname}"
-    current_user.avatar_uri = avatar_uri
-    db.commit()
-    db.refresh(current_user)
-    return {Fields.ID: current_user.id, Fields.AVATAR_URI: current_user.avatar_uri}
+    await run(_set_avatar, current_user.id, avatar_uri)
+    return {Fields.ID: current_user.id, Fields.AVATAR_URI: avatar_uri}
 
 @router.put("/{id}", summary=Summaries.USER_UPDATE)
 async def update_user(id: str, payload: UserUpdate = Body(default=None)) -> Dict[str, Any]:
@@ -127,7 +191,7 @@ async def delete_user(id: str) -> None:
 async def patch_user(
     id: str,
     payload: UserSettingsUpdate = Body(default=None),
-    db: Session = Depends(get_db),
+    run: DbRunner = Depends(get_db_runner),
     current_user: User = Depends(get_current_user),
 ) -> Dict[str, Any]:
     try:
@@ -136,34 +200,10 @@ async def patch_user(
         raise HTTPException(status_code=404, detail=Errors.USER_NOT_FOUND)
     if current_user.id != uuid:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=Errors.FORBIDDEN)
-    user = db.scalar(select(User).where(User.id == uuid))
+    data = payload.model_dump(exclude_none=True)
+    user, group_ids = await run(_apply_settings, uuid, data)
     if user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=Errors.USER_NOT_FOUND)
-    data = payload.model_dump(exclude_none=True)
-    if Fields.FULL_NAME in data:
-        user.full_name = data[Fields.FULL_NAME]
-    if Fields.PHONE_NUMBER in data:
-        user.phone_number = data[Fields.PHONE_NUMBER]
-    if Fields.AGE in data:
-        user.age = data[Fields.AGE]
-    if Fields.COUNTRY in data:
-        user.country = data[Fields.COUNTRY]
-    if Fields.AVATAR_URI in data:
-        user.avatar_uri = data[Fields.AVATAR_URI]
-    if Fields.CORPUS_URI in data:
-        user.corpus_uri = data[Fields.CORPUS_URI]
-    if Fields.CHAT_HISTORY_URI in data:
-        user.chat_history_uri = data[Fields.CHAT_HISTORY_URI]
-    if Fields.ACCOUNT_TYPE in data:
-        user.account_type = data[Fields.ACCOUNT_TYPE]
-    if Fields.GCP_PROJECT_ID in data:
-        user.gcp_project_id = data[Fields.GCP_PROJECT_ID]
-    if Fields.TEMP_BUCKET in data:
-        user.temp_bucket = data[Fields.TEMP_BUCKET]
-    if Fields.PAYMENT_INFO in data:
-        user.payment_info = data[Fields.PAYMENT_INFO]
-    db.commit()
-    db.refresh(user)
     return {
         Fields.ID: user.id,
         Fields.USERNAME: user.username,
@@ -178,7 +218,7 @@ async def patch_user(
         Fields.UPDATED_AT: user.updated_at,
         Fields.CORPUS_URI: user.corpus_uri,
         Fields.CHAT_HISTORY_URI: user.chat_history_uri,
-        Fields.GROUP_IDS: [m.group_id for m in db.scalars(select(GroupMembership).where(GroupMembership.user_id == user.id)).all()],
+        Fields.GROUP_IDS: group_ids,
         Fields.ACCOUNT_TYPE: user.account_type,
         Fields.GCP_PROJECT_ID: user.gcp_project_id,
         Fields.TEMP_BUCKET: user.temp_bucket,
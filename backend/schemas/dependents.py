@@ -20,6 +20,7 @@ class DependentItem(BaseModel):
 
 class DependentsEnvelope(BaseModel):
 	items: List[DependentItem] = Field(..., description="List of dependents.")
+	next_cursor: Optional[str] = Field(default=None, description="Opaque cursor for the next page; pass back as ?cursor=. Null on the last page.")
 
 
 class DependentConvertRequest(BaseModel):
@@ -19,6 +19,7 @@ class GroupMemberInviteItem(BaseModel):
 
 class GroupMemberInvitesEnvelope(BaseModel):
 	items: List[GroupMemberInviteItem]
+	next_cursor: Optional[str] = None
 
 
 class GroupMemberInviteCreatedEnvelope(BaseModel):
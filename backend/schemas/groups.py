@@ -48,6 +48,7 @@ class GroupDetailEnvelope(BaseModel):
 
 class MembershipsListEnvelope(BaseModel):
 	items: List[MembershipItem] = Field(..., description="Memberships in the group.")
+	next_cursor: Optional[str] = Field(default=None, description="Opaque cursor for the next page; pass back as ?cursor=. Null on the last page.")
 
 
 class ActionEnvelope(BaseModel):
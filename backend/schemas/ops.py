@@ -19,3 +19,9 @@ class ReadyzResponse(BaseModel):
 	results: ReadyzResults
 
 
+
+
+class MetricsResponse(BaseModel):
+	counters: Dict[str, int]
+	gauges: Dict[str, float]
+	histograms: Dict[str, Dict[str, Any]] = {}
@@ -24,6 +24,7 @@ class CodeListItem(BaseModel):
 
 class CodesListEnvelope(BaseModel):
 	items: List[CodeListItem] = Field(..., description="List of codes.")
+	next_cursor: Optional[str] = Field(default=None, description="Opaque cursor for the next page; pass back as ?cursor=. Null on the last page.")
 
 
 class RedeemRequest(BaseModel):
@@ -43,6 +43,7 @@ class RedactionStatusResponse(BaseModel):
 	projectId: str = Field(..., description="Configured GCP project id.")
 	location: str = Field(..., description="Configured DLP location/region.")
 	clientReady: bool = Field(..., description="True if DLP client is initialized.")
+	provider: str = Field(..., description="Redaction engine in use (google or local).")
 
 
 class RedactionTextFileResponse(BaseModel):
@@ -56,4 +56,5 @@ class UserSettingsUpdate(BaseModel):
 
 class UsersListEnvelope(BaseModel):
     items: List[UserResponse]
+    next_cursor: Optional[str] = None
 
@@ -0,0 +1,85 @@
+"""
+Access-edge cache for recipient authorization checks.
+
+Remembers whether a caregiver has an access edge to a recipient (allowed or
+denied) for a short TTL, so polling file endpoints don't query
+recipient_caregiver_access on every request. Writers invalidate the pair
+after commit (AccessRepository.upsert/delete, invitation accept paths).
+Entries are per worker process; other workers converge within the TTL.
+"""
+from __future__ import annotations
+
+import uuid
+from typing import Any, Optional, Tuple
+
+from backend.core.constants import AccessCache, MetricNames
+from backend.core.settings import get_settings
+from backend.core.ttl_cache import CacheMetricNames, EpochTtlCache, SharedCache
+
+EdgeKey = Tuple[str, str]
+
+_METRICS = CacheMetricNames(
+	hits=MetricNames.ACCESS_CACHE_HITS,
+	misses=MetricNames.ACCESS_CACHE_MISSES,
+	hit_rate=MetricNames.ACCESS_CACHE_HIT_RATE,
+	entries=MetricNames.ACCESS_CACHE_ENTRIES,
+	invalidations=MetricNames.ACCESS_CACHE_INVALIDATIONS,
+)
+
+
+def _norm(value: Any) -> str:
+	# Path params arrive as strings in any case; ORM ids as UUID
+	try:
+		return str(uuid.UUID(str(value)))
+	except ValueError:
+		return str(value)
+
+
+def _key(caregiver_id: Any, recipient_id: Any) -> EdgeKey:
+	return _norm(caregiver_id), _norm(recipient_id)
+
+
+class AccessEdgeCache:
+	"""(caregiver_id, recipient_id) -> allowed, on the shared epoch-guarded TTL store."""
+
+	def __init__(self, *, ttl_seconds: int = AccessCache.DEFAULT_TTL_SECONDS, max_entries: int = AccessCache.DEFAULT_MAX_ENTRIES) -> None:
+		self._store: EpochTtlCache[EdgeKey, bool] = EpochTtlCache(ttl_seconds=ttl_seconds, max_entries=max_entries, metric_names=_METRICS)
+
+	@property
+	def epoch(self) -> int:
+		return self._store.epoch
+
+	def get(self, caregiver_id: Any, recipient_id: Any) -> Optional[bool]:
+		return self._store.get(_key(caregiver_id, recipient_id))
+
+	def put(self, caregiver_id: Any, recipient_id: Any, allowed: bool, *, epoch: int) -> None:
+		"""Store a lookup result; dropped if any invalidation happened since `epoch` was read."""
+		self._store.put(_key(caregiver_id, recipient_id), allowed, epoch=epoch)
+
+	def invalidate(self, caregiver_id: Any, recipient_id: Any) -> None:
+		self._store.invalidate(_key(caregiver_id, recipient_id))
+
+	def clear(self) -> None:
+		self._store.clear()
+
+
+def _from_settings() -> Optional[AccessEdgeCache]:
+	settings = get_settings()
+	if not settings.access_cache_enabled:
+		return None
+	return AccessEdgeCache(ttl_seconds=settings.access_cache_ttl_seconds, max_entries=settings.access_cache_max_entries)
+
+
+_shared: SharedCache[AccessEdgeCache] = SharedCache(_from_settings)
+
+
+def get_access_cache() -> Optional[AccessEdgeCache]:
+	"""Shared cache built from settings; None when disabled."""
+	return _shared.get()
+
+
+def invalidate_access_edge(caregiver_id: Any, recipient_id: Any) -> None:
+	"""Call after the transaction that changed the edge has committed."""
+	cache = get_access_cache()
+	if cache is not None:
+		cache.invalidate(caregiver_id, recipient_id)
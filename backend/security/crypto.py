@@ -1,14 +1,27 @@
 from __future__ import annotations
 
+import os
 from typing import Tuple
 
+from backend.core.constants import Crypto
+
+# Optional dependency: AES-GCM comes from `cryptography` when installed
+try:  # pragma: no cover
+	from cryptography.hazmat.primitives.ciphers.aead import AESGCM  # type: ignore
+except Exception:  # pragma: no cover
+	AESGCM = None  # type: ignore
+
 
 class AeadCipher:
 	"""
-	Interface for AEAD operations. AES-GCM implementation will be added later.
-	For now, provide a no-op cipher so wiring can proceed safely.
+	Interface for AEAD operations.
+	The base class is a no-op cipher so wiring can proceed safely when
+	`cryptography` is not installed; see AesGcmCipher for the real one.
 	"""
 
+	# True only for ciphers that actually protect data
+	secure: bool = False
+
 	def encrypt(self, key: bytes, plaintext: bytes, aad: bytes = b"") -> Tuple[bytes, bytes, bytes]:
 		"""
 		Returns (nonce, ciphertext, tag). No-op: echoes plaintext and empty tag.
@@ -24,7 +37,20 @@ class AeadCipher:
 		return ciphertext
 
 
-def get_cipher() -> AeadCipher:
-	return AeadCipher()
+class AesGcmCipher(AeadCipher):
+	"""AES-GCM with a random 96-bit nonce per message; key must be 16/24/32 bytes."""
+
+	secure = True
 
+	def encrypt(self, key: bytes, plaintext: bytes, aad: bytes = b"") -> Tuple[bytes, bytes, bytes]:
+		nonce = os.urandom(Crypto.GCM_NONCE_BYTES)
+		sealed = AESGCM(key).encrypt(nonce, plaintext, aad or None)
+		return nonce, sealed[:-Crypto.GCM_TAG_BYTES], sealed[-Crypto.GCM_TAG_BYTES:]
+
+	def decrypt(self, key: bytes, nonce: bytes, ciphertext: bytes, tag: bytes, aad: bytes = b"") -> bytes:
+		# Raises cryptography.exceptions.InvalidTag on tampering or wrong key
+		return AESGCM(key).decrypt(nonce, ciphertext + tag, aad or None)
 
+
+def get_cipher() -> AeadCipher:
+	return AesGcmCipher() if AESGCM is not None else AeadCipher()
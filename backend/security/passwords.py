@@ -0,0 +1,145 @@
+"""
+Password hashing policy.
+
+Every stored hash carries its own scheme and cost, `scheme$params$salt$hash`:
+- pbkdf2_sha256$<iterations>$<salt hex>$<hash hex>  (original format)
+- scrypt$<n>:<r>:<p>$<salt hex>$<hash hex>          (memory-hard, stdlib hashlib)
+
+so verification never depends on current settings. `KdfPolicy` is the cost
+new hashes are written with (Settings.password_scheme, pbkdf2_iterations,
+scrypt_n/r/p); `needs_rehash` reports hashes written under another policy,
+which login upgrades after a successful verify. The policy is validated and
+built once at startup (`init_kdf_policy`), so a bad scheme or a scrypt cost
+hashlib cannot run fails the boot instead of every login. Tune the cost with
+`scripts/calibrate_kdf.py` rather than by guesswork.
+"""
+from __future__ import annotations
+
+import hmac
+import os
+import secrets
+import threading
+from dataclasses import dataclass
+from hashlib import pbkdf2_hmac, scrypt
+from typing import Optional, Tuple
+
+from backend.core.constants import Auth as AuthConst, Kdf
+from backend.core.settings import get_settings
+
+
+@dataclass(frozen=True)
+class KdfPolicy:
+	scheme: str = AuthConst.PASSWORD_SCHEME_PBKDF2_SHA256
+	pbkdf2_iterations: int = Kdf.DEFAULT_PBKDF2_ITERATIONS
+	scrypt_n: int = Kdf.DEFAULT_SCRYPT_N
+	scrypt_r: int = Kdf.DEFAULT_SCRYPT_R
+	scrypt_p: int = Kdf.DEFAULT_SCRYPT_P
+
+	def __post_init__(self) -> None:
+		if self.scheme not in AuthConst.PASSWORD_SCHEMES:
+			raise ValueError(f"password_scheme {self.scheme!r} is not one of {', '.join(AuthConst.PASSWORD_SCHEMES)}")
+		if self.scheme == AuthConst.PASSWORD_SCHEME_PBKDF2_SHA256 and self.pbkdf2_iterations < 1:
+			raise ValueError(f"pbkdf2_iterations must be positive, got {self.pbkdf2_iterations}")
+		if self.scheme == AuthConst.PASSWORD_SCHEME_SCRYPT:
+			n, r, p = self.scrypt_n, self.scrypt_r, self.scrypt_p
+			if n < 2 or n & (n - 1) or r < 1 or p < 1:
+				raise ValueError(f"scrypt_n must be a power of two > 1 and scrypt_r/scrypt_p positive, got {n}:{r}:{p}")
+			if _scrypt_maxmem(n, r, p) > Kdf.SCRYPT_MAXMEM_LIMIT_BYTES:
+				raise ValueError(f"scrypt {n}:{r}:{p} needs more memory than hashlib allows ({Kdf.SCRYPT_MAXMEM_LIMIT_BYTES} bytes)")
+
+	@classmethod
+	def from_settings(cls) -> "KdfPolicy":
+		settings = get_settings()
+		return cls(
+			scheme=settings.password_scheme,
+			pbkdf2_iterations=int(settings.pbkdf2_iterations),
+			scrypt_n=int(settings.scrypt_n),
+			scrypt_r=int(settings.scrypt_r),
+			scrypt_p=int(settings.scrypt_p),
+		)
+
+	@property
+	def params(self) -> str:
+		"""The params field this policy writes; compared verbatim by needs_rehash."""
+		if self.scheme == AuthConst.PASSWORD_SCHEME_SCRYPT:
+			return f"{self.scrypt_n}:{self.scrypt_r}:{self.scrypt_p}"
+		return str(self.pbkdf2_iterations)
+
+
+_policy: Optional[KdfPolicy] = None
+_policy_lock = threading.Lock()
+
+
+def current_policy() -> KdfPolicy:
+	"""Process-wide policy; built on first use (app startup) from settings."""
+	global _policy
+	if _policy is None:
+		with _policy_lock:
+			if _policy is None:
+				_policy = KdfPolicy.from_settings()
+	return _policy
+
+
+def reset_kdf_policy() -> None:
+	"""Drop the cached policy so the next call re-reads settings (tests, calibration)."""
+	global _policy
+	_policy = None
+
+
+def _scrypt_maxmem(n: int, r: int, p: int) -> int:
+	# hashlib caps memory at 32 MiB by default; OpenSSL needs 128*r*(n+p+2) bytes, plus headroom
+	return 128 * r * (n + p + 2) + Kdf.SCRYPT_MAXMEM_HEADROOM_BYTES
+
+
+def _scrypt(password: bytes, salt: bytes, n: int, r: int, p: int) -> bytes:
+	maxmem = min(_scrypt_maxmem(n, r, p), Kdf.SCRYPT_MAXMEM_LIMIT_BYTES)
+	return scrypt(password, salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=Kdf.DERIVED_KEY_BYTES)
+
+
+def _derive(scheme: str, params: str, password: str, salt: bytes) -> bytes:
+	secret = password.encode("utf-8")
+	if scheme == AuthConst.PASSWORD_SCHEME_PBKDF2_SHA256:
+		return pbkdf2_hmac(AuthConst.PBKDF2_HASH_NAME, secret, salt, int(params))
+	if scheme == AuthConst.PASSWORD_SCHEME_SCRYPT:
+		n, r, p = (int(v) for v in params.split(":"))
+		return _scrypt(secret, salt, n, r, p)
+	raise ValueError(scheme)
+
+
+def _split(encoded: str) -> Tuple[str, str, str, str]:
+	scheme, params, salt_hex, hash_hex = encoded.split("$", 3)
+	return scheme, params, salt_hex, hash_hex
+
+
+def hash_password(password: str, *, policy: Optional[KdfPolicy] = None) -> str:
+	policy = policy or current_policy()
+	salt = os.urandom(Kdf.SALT_BYTES)
+	dk = _derive(policy.scheme, policy.params, password, salt)
+	return f"{policy.scheme}${policy.params}${salt.hex()}${dk.hex()}"
+
+
+def verify_password(password: str, encoded: str) -> bool:
+	"""Verify against the scheme and cost recorded in `encoded`; False for unknown or unusable hashes."""
+	try:
+		scheme, params, salt_hex, hash_hex = _split(encoded)
+		dk = _derive(scheme, params, password, bytes.fromhex(salt_hex))
+		return hmac.compare_digest(dk, bytes.fromhex(hash_hex))
+	except Exception:
+		return False
+
+
+def needs_rehash(encoded: Optional[str], *, policy: Optional[KdfPolicy] = None) -> bool:
+	"""True when a usable hash was written under a different scheme or cost than the current policy."""
+	if not encoded or encoded.startswith(AuthConst.PASSWORD_UNUSABLE_PREFIX):
+		return False
+	policy = policy or current_policy()
+	try:
+		scheme, params, _, _ = _split(encoded)
+	except ValueError:
+		return False
+	return (scheme, params) != (policy.scheme, policy.params)
+
+
+def unusable_password_hash() -> str:
+	"""Marker for accounts whose password is never disclosed; verify_password always rejects it."""
+	return f"{AuthConst.PASSWORD_UNUSABLE_PREFIX}{secrets.token_hex(16)}"
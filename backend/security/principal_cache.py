@@ -0,0 +1,106 @@
+"""
+Authenticated-principal cache for `get_current_user`.
+
+Maps a bearer token (keyed by its HMAC signature segment) to a read-only
+snapshot of the user it resolved to, so repeat requests with the same token
+skip token decoding and the user lookup. Entries live until the shorter of
+the TTL and the token's own expiry. Profile and password changes invalidate
+every entry for that user after commit; entries are per worker process, so
+other workers converge within the TTL.
+"""
+from __future__ import annotations
+
+import time
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from sqlalchemy import inspect as sa_inspect
+
+from backend.core.constants import MetricNames, PrincipalCache
+from backend.core.settings import get_settings
+from backend.core.ttl_cache import CacheMetricNames, EpochTtlCache, SharedCache
+
+_METRICS = CacheMetricNames(
+	hits=MetricNames.PRINCIPAL_CACHE_HITS,
+	misses=MetricNames.PRINCIPAL_CACHE_MISSES,
+	hit_rate=MetricNames.PRINCIPAL_CACHE_HIT_RATE,
+	entries=MetricNames.PRINCIPAL_CACHE_ENTRIES,
+	invalidations=MetricNames.PRINCIPAL_CACHE_INVALIDATIONS,
+)
+
+
+class UserSnapshot:
+	"""
+	Detached, read-only copy of a User's column values (minus secrets).
+	Shared across requests, so assignment raises; writers reload the row by id.
+	"""
+	__slots__ = ("_values",)
+
+	def __init__(self, values: Mapping[str, Any]) -> None:
+		object.__setattr__(self, "_values", MappingProxyType(dict(values)))
+
+	@classmethod
+	def of(cls, user: Any) -> "UserSnapshot":
+		columns = sa_inspect(type(user)).column_attrs
+		return cls({attr.key: getattr(user, attr.key) for attr in columns if attr.key not in PrincipalCache.EXCLUDED_FIELDS})
+
+	def __getattr__(self, name: str) -> Any:
+		try:
+			return self._values[name]
+		except KeyError:
+			raise AttributeError(name) from None
+
+	def __setattr__(self, name: str, value: Any) -> None:
+		raise AttributeError(f"{type(self).__name__} is read-only")
+
+	def __repr__(self) -> str:
+		return f"UserSnapshot(id={self._values.get('id')!r})"
+
+
+class PrincipalCacheStore:
+	"""Token signature -> UserSnapshot on the shared epoch-guarded TTL store, tagged by user id."""
+
+	def __init__(self, *, ttl_seconds: int = PrincipalCache.DEFAULT_TTL_SECONDS, max_entries: int = PrincipalCache.DEFAULT_MAX_ENTRIES) -> None:
+		# Wall clock, so the token's exp can cap an entry's lifetime
+		self._store: EpochTtlCache[str, UserSnapshot] = EpochTtlCache(
+			ttl_seconds=ttl_seconds, max_entries=max_entries, metric_names=_METRICS, clock=time.time
+		)
+
+	@property
+	def epoch(self) -> int:
+		return self._store.epoch
+
+	def get(self, signature: str) -> Optional[UserSnapshot]:
+		return self._store.get(signature)
+
+	def put(self, signature: str, snapshot: UserSnapshot, *, token_exp: float, epoch: int) -> None:
+		"""Cache until min(now + TTL, token exp); dropped if any invalidation happened since `epoch` was read."""
+		self._store.put(signature, snapshot, epoch=epoch, tag=str(snapshot.id), expires_at=float(token_exp))
+
+	def invalidate_user(self, user_id: Any) -> None:
+		self._store.invalidate_tag(str(user_id))
+
+	def clear(self) -> None:
+		self._store.clear()
+
+
+def _from_settings() -> Optional[PrincipalCacheStore]:
+	settings = get_settings()
+	if not settings.principal_cache_enabled:
+		return None
+	return PrincipalCacheStore(ttl_seconds=settings.principal_cache_ttl_seconds, max_entries=settings.principal_cache_max_entries)
+
+
+_shared: SharedCache[PrincipalCacheStore] = SharedCache(_from_settings)
+
+
+def get_principal_cache() -> Optional[PrincipalCacheStore]:
+	"""Shared cache built from settings; None when disabled."""
+	return _shared.get()
+
+
+def invalidate_principal(user_id: Any) -> None:
+	"""Call after the transaction that changed the user row has committed."""
+	cache = get_principal_cache()
+	if cache is not None:
+		cache.invalidate_user(user_id)
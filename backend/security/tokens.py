@@ -0,0 +1,139 @@
+"""
+Access-token codec (HS256 JWT, no external deps).
+
+Built once per process from settings. Each signing key's HMAC state is keyed
+once and copied per token (`hmac.new(secret).copy()`), and each key's header
+segment is pre-encoded, so verification recognises a header by string lookup
+instead of base64+JSON decoding it. Headers this codec did not emit
+byte-for-byte (same claims, other encoding) fall back to a JSON decode.
+
+Rotation: `auth_secret` is the legacy key and signs kid-less tokens.
+`auth_signing_keys` adds kid -> secret pairs that all verify, and
+`auth_active_kid` picks the one new tokens are signed with. To rotate, add the
+new kid, switch `auth_active_kid`, and drop the old kid once
+`auth_token_exp_minutes` has passed.
+"""
+from __future__ import annotations
+
+import base64
+import hmac
+import json
+import threading
+import time
+from hashlib import sha256
+from typing import Any, Dict, Mapping, Optional
+
+from backend.core.constants import Auth as AuthConst, Errors
+from backend.core.settings import get_settings
+
+
+def _b64url(data: bytes) -> str:
+	return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64url_json(obj: Dict[str, Any]) -> str:
+	return _b64url(json.dumps(obj, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+
+
+def _b64url_decode(data: str) -> bytes:
+	pad = "=" * (-len(data) % 4)
+	return base64.urlsafe_b64decode(data + pad)
+
+
+_UNKNOWN = object()
+
+
+def _header(kid: Optional[str]) -> Dict[str, str]:
+	header = {AuthConst.JWT_HEADER_ALG: AuthConst.JWT_ALG_HS256, AuthConst.JWT_HEADER_TYP: AuthConst.JWT_TYP_JWT}
+	if kid is not None:
+		header[AuthConst.JWT_HEADER_KID] = kid
+	return header
+
+
+class TokenCodec:
+	def __init__(self, *, legacy_secret: str, keys: Mapping[str, str], active_kid: Optional[str], ttl_seconds: int) -> None:
+		if active_kid is not None and active_kid not in keys:
+			raise ValueError(f"auth_active_kid {active_kid!r} is not in auth_signing_keys")
+		secrets: Dict[Optional[str], str] = {None: legacy_secret, **keys}
+		# kid -> keyed HMAC state, copied per token; never updated in place
+		self._macs = {kid: hmac.new(secret.encode("utf-8"), digestmod=sha256) for kid, secret in secrets.items()}
+		# encoded header segment -> kid
+		self._headers = {_b64url_json(_header(kid)): kid for kid in secrets}
+		self._active_kid = active_kid
+		self._active_header = _b64url_json(_header(active_kid))
+		self._ttl = ttl_seconds
+
+	@classmethod
+	def from_settings(cls) -> "TokenCodec":
+		settings = get_settings()
+		return cls(
+			legacy_secret=settings.auth_secret,
+			keys=settings.auth_signing_keys,
+			active_kid=settings.auth_active_kid or None,
+			ttl_seconds=settings.auth_token_exp_minutes * 60,
+		)
+
+	def _sign(self, kid: Optional[str], signing_input: bytes) -> bytes:
+		mac = self._macs[kid].copy()
+		mac.update(signing_input)
+		return mac.digest()
+
+	def _kid_for(self, encoded_header: str) -> Optional[str]:
+		kid = self._headers.get(encoded_header, _UNKNOWN)
+		if kid is not _UNKNOWN:
+			return kid
+		# Slow path: equivalent header encoded differently
+		header = json.loads(_b64url_decode(encoded_header).decode("utf-8"))
+		if header.get(AuthConst.JWT_HEADER_ALG) != AuthConst.JWT_ALG_HS256 or header.get(AuthConst.JWT_HEADER_TYP) != AuthConst.JWT_TYP_JWT:
+			raise ValueError(Errors.MALFORMED_TOKEN)
+		kid = header.get(AuthConst.JWT_HEADER_KID)
+		if kid not in self._macs:
+			raise ValueError(Errors.MALFORMED_TOKEN)
+		return kid
+
+	def issue(self, user_id: str, now: Optional[int] = None) -> str:
+		iat = int(now or time.time())
+		payload = {AuthConst.JWT_CLAIM_SUB: user_id, AuthConst.JWT_CLAIM_IAT: iat, AuthConst.JWT_CLAIM_EXP: iat + self._ttl}
+		signing_input = f"{self._active_header}.{_b64url_json(payload)}"
+		return f"{signing_input}.{_b64url(self._sign(self._active_kid, signing_input.encode('ascii')))}"
+
+	def verify(self, token: str) -> Dict[str, Any]:
+		"""Return the payload; ValueError(MALFORMED_TOKEN) for bad shape, ValueError(INVALID_CREDENTIALS) for bad signature or expiry."""
+		try:
+			parts = token.split(".")
+			if len(parts) != 3:
+				raise ValueError(Errors.MALFORMED_TOKEN)
+			encoded_header, encoded_payload, encoded_sig = parts
+			kid = self._kid_for(encoded_header)
+			signing_input = f"{encoded_header}.{encoded_payload}".encode("ascii")
+			if not hmac.compare_digest(self._sign(kid, signing_input), _b64url_decode(encoded_sig)):
+				raise ValueError(Errors.INVALID_CREDENTIALS)
+			# Signature first: only payloads we signed get parsed
+			payload = json.loads(_b64url_decode(encoded_payload).decode("utf-8"))
+			if int(payload.get(AuthConst.JWT_CLAIM_EXP, 0)) < int(time.time()):
+				raise ValueError(Errors.INVALID_CREDENTIALS)
+			return payload
+		except ValueError:
+			raise
+		except Exception:
+			raise ValueError(Errors.MALFORMED_TOKEN)
+
+
+_codec: Optional[TokenCodec] = None
+_codec_lock = threading.Lock()
+
+
+def get_token_codec() -> TokenCodec:
+	"""Process-wide codec; built on first use (app startup) from settings."""
+	global _codec
+	if _codec is None:
+		with _codec_lock:
+			if _codec is None:
+				_codec = TokenCodec.from_settings()
+	return _codec
+
+
+def reset_token_codec() -> None:
+	"""Drop the cached codec so the next call re-reads settings (key rotation without restart, tests)."""
+	global _codec
+	_codec = None
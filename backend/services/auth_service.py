@@ -1,98 +1,28 @@
 """Auth service and helpers: password hashing, token issuance/verification, and user signup/login flows."""
-import base64
-import hmac
-import json
-import os
 import secrets
-import time
-from hashlib import pbkdf2_hmac, sha256
 from typing import Any, Dict, Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
-from backend.core.settings import get_settings
 from backend.db.models import User, Group, GroupMembership
-from backend.core.constants import Auth as AuthConst, Errors, GroupRoles, Fields
-
-
-def _b64url(data: bytes) -> str:
-    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
-
-
-def _b64url_json(obj: Dict[str, Any]) -> str:
-    return _b64url(json.dumps(obj, separators=(",", ":"), sort_keys=True).encode("utf-8"))
-
-def _b64url_decode(data: str) -> bytes:
-    # add padding
-    pad = '=' * (-len(data) % 4)
-    return base64.urlsafe_b64decode(data + pad)
-
-def hash_password(password: str, *, iterations: int = 100_000) -> str:
-    salt = os.urandom(16)
-    dk = pbkdf2_hmac(AuthConst.PBKDF2_HASH_NAME, password.encode("utf-8"), salt, iterations)
-    return f"{AuthConst.PASSWORD_SCHEME_PBKDF2_SHA256}${iterations}${salt.hex()}${dk.hex()}"
-
-
-def verify_password(password: str, encoded: str) -> bool:
-    try:
-        algo, iter_str, salt_hex, hash_hex = encoded.split("$", 3)
-        if algo != AuthConst.PASSWORD_SCHEME_PBKDF2_SHA256:
-            return False
-        iterations = int(iter_str)
-        salt = bytes.fromhex(salt_hex)
-        expected = bytes.fromhex(hash_hex)
-        dk = pbkdf2_hmac(AuthConst.PBKDF2_HASH_NAME, password.encode("utf-8"), salt, iterations)
-        return hmac.compare_digest(dk, expected)
-    except Exception:
-        return False
+from backend.db.session import unit_of_work
+from backend.core.constants import Errors, GroupRoles, Fields
+from backend.security.principal_cache import invalidate_principal
+from backend.security.tokens import get_token_codec
 
 
 def issue_token(user_id: str, now: Optional[int] = None) -> str:
-    """
-    Minimal JWT (HS256) implementation without external deps.
-    """
-    settings = get_settings()
-    secret = settings.auth_secret.encode("utf-8")
-    iat = int(now or time.time())
-    exp = iat + settings.auth_token_exp_minutes * 60
-    header = {AuthConst.JWT_HEADER_ALG: AuthConst.JWT_ALG_HS256, AuthConst.JWT_HEADER_TYP: AuthConst.JWT_TYP_JWT}
-    payload = {AuthConst.JWT_CLAIM_SUB: user_id, AuthConst.JWT_CLAIM_IAT: iat, AuthConst.JWT_CLAIM_EXP: exp}
-    encoded_header = _b64url_json(header)
-    encoded_payload = _b64url_json(payload)
-    signing_input = f"{encoded_header}.{encoded_payload}".encode("ascii")
-    sig = hmac.new(secret, signing_input, sha256).digest()
-    return f"{encoded_header}.{encoded_payload}.{_b64url(sig)}"
+    """Issue an HS256 access token signed with the active key (see security/tokens.py)."""
+    return get_token_codec().issue(user_id, now)
+
 
 def verify_token(token: str) -> Dict[str, Any]:
     """
     Verify HS256 token signature and expiry. Returns payload dict.
     Raises ValueError on failure.
     """
-    try:
-        parts = token.split(".")
-        if len(parts) != 3:
-            raise ValueError(Errors.MALFORMED_TOKEN)
-        encoded_header, encoded_payload, encoded_sig = parts
-        header = json.loads(_b64url_decode(encoded_header).decode("utf-8"))
-        if header.get(AuthConst.JWT_HEADER_ALG) != AuthConst.JWT_ALG_HS256 or header.get(AuthConst.JWT_HEADER_TYP) != AuthConst.JWT_TYP_JWT:
-            raise ValueError(Errors.MALFORMED_TOKEN)
-        payload = json.loads(_b64url_decode(encoded_payload).decode("utf-8"))
-        signing_input = f"{encoded_header}.{encoded_payload}".encode("ascii")
-        settings = get_settings()
-        expected = hmac.new(settings.auth_secret.encode("utf-8"), signing_input, sha256).digest()
-        provided = _b64url_decode(encoded_sig)
-        if not hmac.compare_digest(expected, provided):
-            raise ValueError(Errors.INVALID_CREDENTIALS)
-        now = int(time.time())
-        exp = int(payload.get(AuthConst.JWT_CLAIM_EXP, 0))
-        if exp < now:
-            raise ValueError(Errors.INVALID_CREDENTIALS)
-        return payload
-    except ValueError:
-        raise
-    except Exception:
-        raise ValueError(Errors.MALFORMED_TOKEN)
+    return get_token_codec().verify(token)
 
 
 class AuthService:
@@ -103,7 +33,7 @@ class AuthService:
         *,
         username: str,
         email: str,
-        password: str,
+        password_hash: str,
         role: str,
         full_name: Optional[str],
         phone_number: Optional[str],
@@ -118,7 +48,7 @@ class AuthService:
         temp_bucket: Optional[str] = None,
         payment_info: Optional[Dict[str, Any]] = None,
     ) -> Tuple[User, str]:
-        """Create a new user and return (user, access_token)."""
+        """Create a new user and return (user, access_token); hash the password on the KDF pool first."""
         # normalize email/username casing BEFORE uniqueness checks
         username = (username or "").strip().lower()
         email = (email or "").strip().lower()
@@ -131,7 +61,7 @@ class AuthService:
         user = User(
             username=username,
             email=email,
-            password_hash=hash_password(password),
+            password_hash=password_hash,
             role=role,
             full_name=full_name,
             phone_number=phone_number,
@@ -146,58 +76,56 @@ class AuthService:
             temp_bucket=temp_bucket,
             payment_info=payment_info,
         )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-        # If group plan, create a group and add creator as admin
-        if (account_type or "").lower() == "group":
-            group = Group(name=f"{full_name or username}'s Group", description=None, created_by=user.id)
-            db.add(group)
-            db.commit()
-            db.refresh(group)
-            # optional convenience pointer
-            user.group_id = group.id
+        # One transaction for the user and (group plan) their group + admin membership
+        with unit_of_work(db):
             db.add(user)
-            db.commit()
-            # membership as admin (idempotent insert)
-            gm = GroupMembership(group_id=group.id, user_id=user.id, role=GroupRoles.ADMIN)
-            db.add(gm)
-            db.commit()
+            db.flush()
+            if (account_type or "").lower() == "group":
+                group = Group(name=f"{full_name or username}'s Group", description=None, created_by=user.id)
+                db.add(group)
+                db.flush()
+                # optional convenience pointer
+                user.group_id = group.id
+                db.add(GroupMembership(group_id=group.id, user_id=user.id, role=GroupRoles.ADMIN))
         token = issue_token(str(user.id))
         return user, token
 
-    def login(self, db: Session, *, username: str, password: str) -> Tuple[User, str]:
-        """Authenticate by username or email and return (user, access_token)."""
+    def find_login_user(self, db: Session, *, username: str) -> Optional[User]:
+        """Look up a login candidate by username or email; the caller verifies the password on the KDF pool."""
         # normalize username/email for lookup
         username = (username or "").strip().lower()
         user = db.scalar(select(User).where(User.username == username))
         if user is None:
             # fallback: allow login via email as well
             user = db.scalar(select(User).where(User.email == username))
-        if user is None or not verify_password(password, user.password_hash):
-            raise ValueError(Errors.INVALID_CREDENTIALS)
-        token = issue_token(str(user.id))
-        return user, token
+        return user
+
+    def issue_token_for(self, user: User) -> str:
+        return issue_token(str(user.id))
 
     def verify_token(self, token: str) -> Dict[str, Any]:
         """Verify a bearer token and return its payload or raise ValueError."""
         return verify_token(token)
 
-    def change_password(
-        self,
-        db: Session,
-        *,
-        user: User,
-        current_password: str,
-        new_password: str,
-    ) -> None:
-        """Change the user's password after verifying the current password."""
-        from backend.core.constants import Errors as Err
-
-        if not verify_password(current_password, user.password_hash):
-            raise ValueError(Err.INCORRECT_PASSWORD)
-        user.password_hash = hash_password(new_password)
+    def get_password_hash(self, db: Session, *, user_id: Any) -> Optional[str]:
+        """Stored hash for verifying the current password (the principal snapshot omits it)."""
+        return db.scalar(select(User.password_hash).where(User.id == user_id))
+
+    def set_password_hash(self, db: Session, *, user_id: Any, password_hash: str) -> None:
+        """Store a new password hash computed on the KDF pool."""
+        row = db.scalar(select(User).where(User.id == user_id))
+        if row is None:
+            raise ValueError(Errors.USER_NOT_FOUND)
+        row.password_hash = password_hash
+        db.commit()
+        invalidate_principal(row.id)
+
+    def upgrade_password_hash(self, db: Session, *, user_id: Any, old_hash: str, new_hash: str) -> bool:
+        """Swap in a hash under the current KDF policy unless the password changed meanwhile."""
+        result = db.execute(
+            update(User).where(User.id == user_id, User.password_hash == old_hash).values(password_hash=new_hash)
+        )
         db.commit()
-        db.refresh(user)
+        return bool(result.rowcount)
 
 
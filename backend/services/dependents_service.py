@@ -7,13 +7,14 @@ import logging
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 
-from backend.core.constants import Errors, Keys, Fields, GroupRoles, LogEvents, Roles, Messages
+from backend.core.constants import Errors, Keys, Fields, GroupRoles, LogEvents, Roles, Messages, CursorScopes
 from backend.db.models import User, Group, Dependent
+from backend.db.session import unit_of_work
 from backend.repositories.dependents_repo import DependentsRepository
 from backend.repositories.group_memberships_repo import GroupMembershipsRepository
 from backend.repositories.interfaces import DependentsRepo
 from backend.services.utils import ensure_member, ensure_admin_or_guardian
-from backend.services.auth_service import hash_password
+from backend.utils.pagination import cursor_scope, decode_cursor, keyset_page
 
 
 class DependentsService:
@@ -44,12 +45,15 @@ class DependentsService:
 			Keys.GUARDIAN_USER_ID: str(row.guardian_user_id),
 		}
 
-	def list(self, db: Session, *, group_id: str, actor_id: str, limit: int, offset: int) -> Dict[str, Any]:
-		"""List dependents for a group (any group member)."""
+	def list(self, db: Session, *, group_id: str, actor_id: str, limit: int, offset: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+		"""List dependents for a group (any group member); `cursor` (from next_cursor) seeks instead of OFFSET."""
 		# Any group member can list dependents
 		ensure_member(self.memberships, db, group_id=group_id, actor_id=actor_id)
-		total = self.repo.count_by_group(db, group_id=group_id)
-		rows = self.repo.list_by_group_paginated(db, group_id=group_id, limit=limit, offset=offset)
+		scope = cursor_scope(CursorScopes.DEPENDENTS, group_id)
+		after = decode_cursor(cursor, scope) if cursor else None
+		# Cursor pages skip COUNT(*) so each page stays constant-cost
+		total = self.repo.count_by_group(db, group_id=group_id) if after is None else None
+		rows, next_cursor = keyset_page(self.repo.list_by_group_paginated(db, group_id=group_id, limit=limit + 1, offset=offset, after=after), limit, scope)
 		items = [
 			{
 				Fields.ID: str(r.id),
@@ -60,7 +64,7 @@ class DependentsService:
 			}
 			for r in rows
 		]
-		return {Keys.ITEMS: items, Keys.TOTAL: total}
+		return {Keys.ITEMS: items, Keys.TOTAL: total, Keys.NEXT_CURSOR: next_cursor}
 
 	def delete(self, db: Session, *, group_id: str, actor_id: str, dependent_id: str) -> None:
 		"""Soft-delete a dependent (admin or guardian)."""
@@ -73,8 +77,8 @@ class DependentsService:
 		self.logger.info(LogEvents.DEPENDENT_DELETED, extra={Keys.GROUP_ID: group_id, Keys.ACTOR_ID: actor_id, Keys.DEPENDENT_ID: str(row.id)})
 		return
 
-	def convert_to_account(self, db: Session, *, group_id: str, actor_id: str, dependent_id: str, email: Optional[str]) -> Dict[str, Any]:
-		"""Convert a dependent into a full user account and add to the group."""
+	def convert_to_account(self, db: Session, *, group_id: str, actor_id: str, dependent_id: str, email: Optional[str], password_hash: str) -> Dict[str, Any]:
+		"""Convert a dependent into a full user account and add to the group (temp password hashed by the caller)."""
 		row = self.repo.get(db, dependent_id=dependent_id)
 		if row is None or str(row.group_id) != str(group_id):
 			raise ValueError(Errors.USER_NOT_FOUND)
@@ -83,25 +87,25 @@ class DependentsService:
 		target_email = (row.email or email or "").strip().lower()
 		if not target_email:
 			raise ValueError(Errors.INVALID_PAYLOAD)
-		# Create or get user
-		user = db.scalar(select(User).where(User.email == target_email))
-		if user is None:
-			user = User(
-				username=target_email,
-				email=target_email,
-				password_hash=hash_password("TempPassw0rd!"),
-				role=Roles.CAREGIVER,
-				full_name=row.full_name,
-				corpus_uri=f"user://{target_email}/corpus",
-				chat_history_uri=None,
-			)
-			db.add(user)
-			db.commit()
-			db.refresh(user)
-		# Add membership as member
-		self.memberships.add(db, group_id=str(group_id), user_id=str(user.id), role=GroupRoles.MEMBER)
-		# Soft-delete dependent record after conversion
-		self.repo.soft_delete(db, dependent=row)
+		# Create or get user, add the membership and retire the dependent in one commit
+		with unit_of_work(db):
+			user = db.scalar(select(User).where(User.email == target_email))
+			if user is None:
+				user = User(
+					username=target_email,
+					email=target_email,
+					password_hash=password_hash,
+					role=Roles.CAREGIVER,
+					full_name=row.full_name,
+					corpus_uri=f"user://{target_email}/corpus",
+					chat_history_uri=None,
+				)
+				db.add(user)
+				db.flush()
+			# Add membership as member
+			self.memberships.add(db, group_id=str(group_id), user_id=str(user.id), role=GroupRoles.MEMBER)
+			# Soft-delete dependent record after conversion
+			self.repo.soft_delete(db, dependent=row)
 		self.logger.info(LogEvents.DEPENDENT_CONVERTED, extra={Keys.GROUP_ID: group_id, Keys.ACTOR_ID: actor_id, Keys.DEPENDENT_ID: str(row.id), Keys.USER_ID: str(user.id)})
 		return {Keys.MESSAGE: Messages.GROUP_MEMBER_ADDED, Keys.USER_ID: str(user.id)}
 
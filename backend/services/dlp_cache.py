@@ -0,0 +1,264 @@
+"""
+Redaction result cache.
+
+Repeated uploads of the same document skip the provider: results are keyed
+by HMAC-SHA256 over (content, mime type, DLP config fingerprint) and kept in
+a bounded in-memory LRU with TTL, plus an optional on-disk tier. Values
+(redacted bytes + findings) are PHI-adjacent, so every entry is sealed with
+AES-GCM; the cache is disabled when no real cipher is available.
+
+Key material: DLP_CACHE_KEY_B64 when set (required for the disk tier to
+survive restarts), else the envelope DEK when encryption is enabled, else a
+random per-process key (memory-only in practice).
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import struct
+import threading
+import time
+
+from backend.core.constants import DlpCache, Crypto, MetricNames, LogEvents, Encoding
+from backend.core.metrics import metrics
+from backend.core.settings import get_settings
+from backend.security.crypto import AeadCipher, get_cipher
+from backend.security.keys import get_key_provider
+from backend.utils.uploads import ByteSource
+
+
+logger = logging.getLogger(__name__)
+
+# Disk entry header: expiry (unix seconds, float64)
+_HEADER = struct.Struct(">d")
+
+CachedResult = Tuple[bytes, List[Dict[str, Any]]]
+
+
+def _derive(master: bytes, label: bytes) -> bytes:
+    return hmac.new(master, DlpCache.KEY_INFO + b"|" + label, hashlib.sha256).digest()
+
+
+class DlpResultCache:
+    def __init__(
+        self,
+        *,
+        master_key: bytes,
+        cipher: AeadCipher,
+        max_entries: int = DlpCache.DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DlpCache.DEFAULT_MAX_BYTES,
+        ttl_seconds: int = DlpCache.DEFAULT_TTL_SECONDS,
+        disk_dir: str = "",
+        max_disk_entries: int = DlpCache.DEFAULT_MAX_DISK_ENTRIES,
+    ) -> None:
+        self._enc_key = _derive(master_key, b"enc")
+        self._id_key = _derive(master_key, b"id")
+        self._cipher = cipher
+        self._max_entries = max(1, max_entries)
+        self._max_bytes = max(1, max_bytes)
+        self._ttl = max(1, ttl_seconds)
+        self._disk_dir = disk_dir
+        self._max_disk_entries = max(1, max_disk_entries)
+        self._disk_writes = 0
+        self._lock = threading.Lock()
+        # entry id -> (expires_at, sealed blob)
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        if self._disk_dir:
+            os.makedirs(self._disk_dir, mode=0o700, exist_ok=True)
+
+    def key_for(self, content: ByteSource, mime_type: str, fingerprint: str) -> str:
+        """Keyed digest so cache ids (and disk file names) reveal nothing about content."""
+        mac = hmac.new(self._id_key, digestmod=hashlib.sha256)
+        mac.update((mime_type or "").encode(Encoding.UTF8) + b"\0")
+        mac.update(fingerprint.encode(Encoding.UTF8) + b"\0")
+        mac.update(hashlib.sha256(content).digest())
+        return mac.hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        now = time.time()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                expires_at, blob = item
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                else:
+                    self._drop(key)
+                    item = None
+        if item is not None:
+            value = self._open(key, blob)
+            if value is not None:
+                metrics.inc(MetricNames.DLP_CACHE_HITS)
+                return value
+        value = self._disk_get(key, now)
+        if value is not None:
+            metrics.inc(MetricNames.DLP_CACHE_HITS)
+            metrics.inc(MetricNames.DLP_CACHE_DISK_HITS)
+            return value
+        metrics.inc(MetricNames.DLP_CACHE_MISSES)
+        return None
+
+    def put(self, key: str, redacted: ByteSource, findings: List[Dict[str, Any]]) -> None:
+        payload = json.dumps(
+            {"r": base64.b64encode(redacted).decode("ascii"), "f": findings},
+            separators=(",", ":"),
+        ).encode(Encoding.UTF8)
+        nonce, ciphertext, tag = self._cipher.encrypt(self._enc_key, payload, DlpCache.AAD + key.encode("ascii"))
+        blob = nonce + tag + ciphertext
+        expires_at = time.time() + self._ttl
+        if len(blob) <= self._max_bytes:
+            with self._lock:
+                if key in self._entries:
+                    self._drop(key)
+                self._entries[key] = (expires_at, blob)
+                self._bytes += len(blob)
+                self._evict()
+                metrics.set_gauge(MetricNames.DLP_CACHE_ENTRIES, len(self._entries))
+                metrics.set_gauge(MetricNames.DLP_CACHE_BYTES, self._bytes)
+        self._disk_put(key, expires_at, blob)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    # --- internals ---
+
+    def _drop(self, key: str) -> None:
+        _, blob = self._entries.pop(key)
+        self._bytes -= len(blob)
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self._max_entries or self._bytes > self._max_bytes):
+            _, (_, blob) = self._entries.popitem(last=False)
+            self._bytes -= len(blob)
+            metrics.inc(MetricNames.DLP_CACHE_EVICTIONS)
+
+    def _open(self, key: str, blob: bytes) -> Optional[CachedResult]:
+        n, t = Crypto.GCM_NONCE_BYTES, Crypto.GCM_TAG_BYTES
+        try:
+            payload = self._cipher.decrypt(self._enc_key, blob[:n], blob[n + t:], blob[n:n + t], DlpCache.AAD + key.encode("ascii"))
+            data = json.loads(payload.decode(Encoding.UTF8))
+            return base64.b64decode(data["r"]), list(data["f"])
+        except Exception:
+            # Wrong key (e.g. per-process key after restart) or corrupted entry
+            return None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._disk_dir, key + DlpCache.FILE_SUFFIX)
+
+    def _disk_get(self, key: str, now: float) -> Optional[CachedResult]:
+        if not self._disk_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                raw = fh.read()
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            logger.warning("%s: %s", LogEvents.DLP_CACHE_DISK_ERROR, exc)
+            return None
+        expires_at = _HEADER.unpack_from(raw)[0] if len(raw) > _HEADER.size else 0.0
+        value = self._open(key, raw[_HEADER.size:]) if expires_at > now else None
+        if value is None:
+            self._remove(path)
+            return None
+        # Promote to memory for subsequent hits
+        with self._lock:
+            if key not in self._entries and len(raw) - _HEADER.size <= self._max_bytes:
+                self._entries[key] = (expires_at, raw[_HEADER.size:])
+                self._bytes += len(raw) - _HEADER.size
+                self._evict()
+        return value
+
+    def _disk_put(self, key: str, expires_at: float, blob: bytes) -> None:
+        if not self._disk_dir:
+            return
+        path = self._path(key)
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "wb") as fh:
+                fh.write(_HEADER.pack(expires_at) + blob)
+            os.replace(tmp, path)
+            self._disk_writes += 1
+            if self._disk_writes % DlpCache.DISK_PRUNE_EVERY == 0:
+                self._prune_disk()
+        except OSError as exc:
+            logger.warning("%s: %s", LogEvents.DLP_CACHE_DISK_ERROR, exc)
+
+    def _prune_disk(self) -> None:
+        """Drop expired files, then the oldest ones beyond max_disk_entries."""
+        now = time.time()
+        files: List[Tuple[float, str]] = []
+        for entry in os.scandir(self._disk_dir):
+            if not entry.name.endswith(DlpCache.FILE_SUFFIX):
+                continue
+            try:
+                mtime = entry.stat().st_mtime
+            except OSError:
+                continue
+            if mtime + self._ttl <= now:
+                self._remove(entry.path)
+                continue
+            files.append((mtime, entry.path))
+        if len(files) > self._max_disk_entries:
+            files.sort()
+            for _, path in files[: len(files) - self._max_disk_entries]:
+                self._remove(path)
+                metrics.inc(MetricNames.DLP_CACHE_EVICTIONS)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_cache: Optional[DlpResultCache] = None
+_cache_initialized = False
+_cache_lock = threading.Lock()
+
+
+def _master_key() -> bytes:
+    settings = get_settings()
+    if settings.dlp_cache_key_b64:
+        return base64.b64decode(settings.dlp_cache_key_b64)
+    if settings.enable_encryption:
+        dek = get_key_provider().get_dek()
+        if dek:
+            return dek
+    return os.urandom(Crypto.AES_256_KEY_BYTES)
+
+
+def get_dlp_cache() -> Optional[DlpResultCache]:
+    """Shared cache built from settings; None when disabled or no AEAD cipher is available."""
+    global _cache, _cache_initialized
+    if _cache_initialized:
+        return _cache
+    with _cache_lock:
+        if _cache_initialized:
+            return _cache
+        settings = get_settings()
+        cipher = get_cipher()
+        if not settings.dlp_cache_enabled or not cipher.secure:
+            logger.info("%s: enabled=%s, cipher_secure=%s", LogEvents.DLP_CACHE_DISABLED, settings.dlp_cache_enabled, cipher.secure)
+            _cache = None
+        else:
+            _cache = DlpResultCache(
+                master_key=_master_key(),
+                cipher=cipher,
+                max_entries=settings.dlp_cache_max_entries,
+                max_bytes=settings.dlp_cache_max_bytes,
+                ttl_seconds=settings.dlp_cache_ttl_seconds,
+                disk_dir=settings.dlp_cache_dir,
+                max_disk_entries=settings.dlp_cache_max_disk_entries,
+            )
+        _cache_initialized = True
+        return _cache
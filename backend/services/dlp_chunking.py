@@ -0,0 +1,100 @@
+"""
+Chunking engine for large-text DLP redaction.
+
+Large documents are split at whitespace boundaries into overlapping chunks,
+inspected concurrently, and their findings remapped to document offsets.
+Duplicates from the overlap are dropped and the redaction ([INFO_TYPE]
+replacement) is applied locally over the original text, so there is no
+truncation and no need to stitch provider outputs together.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    start: int  # offset of the chunk in the document (code points)
+    text: str
+
+
+@dataclass(frozen=True)
+class Span:
+    start: int
+    end: int
+    info_type: str
+
+
+def split_text(text: str, chunk_chars: int, overlap_chars: int) -> List[TextChunk]:
+    """
+    Split into chunks of at most chunk_chars, ending on whitespace where
+    possible; each chunk after the first starts overlap_chars before the
+    previous chunk's end so entities straddling a boundary are seen whole.
+    """
+    n = len(text)
+    if n <= chunk_chars:
+        return [TextChunk(0, text)]
+    overlap = max(0, min(overlap_chars, chunk_chars // 2))
+    chunks: List[TextChunk] = []
+    start = 0
+    while start < n:
+        end = min(start + chunk_chars, n)
+        if end < n:
+            # Prefer a line break, then any space, in the last overlap-sized window
+            floor = max(start + 1, end - max(overlap, 1))
+            cut = text.rfind("\n", floor, end)
+            if cut < 0:
+                cut = text.rfind(" ", floor, end)
+            if cut >= 0:
+                end = cut + 1
+        chunks.append(TextChunk(start, text[start:end]))
+        if end >= n:
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
+
+
+def merge_spans(spans: List[Span]) -> List[Span]:
+    """Drop exact duplicates and same-type spans contained in another (overlap re-detections)."""
+    ordered = sorted(set(spans), key=lambda s: (s.start, -(s.end - s.start), s.info_type))
+    kept: List[Span] = []
+    furthest: Dict[str, int] = {}  # info_type -> max end among kept spans (all start earlier)
+    for span in ordered:
+        if span.end <= furthest.get(span.info_type, -1):
+            continue
+        kept.append(span)
+        furthest[span.info_type] = span.end
+    return kept
+
+
+def replacement_spans(spans: List[Span]) -> List[Span]:
+    """Non-overlapping spans to replace: earliest start wins, longest on ties."""
+    out: List[Span] = []
+    for span in sorted(spans, key=lambda s: (s.start, -(s.end - s.start))):
+        if out and span.start < out[-1].end:
+            if span.end > out[-1].end and span.info_type == out[-1].info_type:
+                # Partial detection at a chunk edge; extend to cover the full entity
+                out[-1] = Span(out[-1].start, span.end, span.info_type)
+            continue
+        out.append(span)
+    return out
+
+
+def apply_replacements(text: str, spans: List[Span]) -> str:
+    """Replace each span with [INFO_TYPE], matching replace_with_info_type_config output."""
+    parts: List[str] = []
+    pos = 0
+    for span in replacement_spans(spans):
+        parts.append(text[pos:span.start])
+        parts.append(f"[{span.info_type}]")
+        pos = span.end
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def findings_from_spans(text: str, spans: List[Span]) -> List[Dict[str, Any]]:
+    return [{"info_type": s.info_type, "quote": text[s.start:s.end]} for s in spans]
+
+
+def remap(chunk: TextChunk, local: List[Tuple[int, int, str]]) -> List[Span]:
+    """Shift chunk-relative (start, end, info_type) ranges to document offsets."""
+    return [Span(chunk.start + a, chunk.start + b, t) for a, b, t in local if b > a]
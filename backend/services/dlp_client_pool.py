@@ -0,0 +1,106 @@
+"""
+Process-wide Google DLP client pool.
+
+Building a ``DlpServiceClient`` opens a new gRPC channel (credential lookup,
+TLS handshake), which costs more than a typical DLP call. The pool creates a
+fixed number of clients once at app startup and hands them out round-robin,
+so concurrent uploads share warm channels. It also owns the bounded worker
+pool used for chunked redaction. Closed on app shutdown.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+import itertools
+import logging
+import threading
+
+from backend.core.constants import Dlp, LogEvents
+from backend.core.settings import get_settings
+
+# Optional Google DLP import (safe when library not installed)
+try:  # pragma: no cover
+    from google.cloud import dlp_v2  # type: ignore
+except Exception:  # pragma: no cover
+    dlp_v2 = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+
+class DlpClientPool:
+    """Fixed-size set of DLP clients, each with its own gRPC channel."""
+
+    def __init__(self, clients: List[Any], parent: str, chunk_workers: int = Dlp.DEFAULT_CHUNK_WORKERS) -> None:
+        self._clients = clients
+        self._cycle = itertools.cycle(range(len(clients)))
+        self._lock = threading.Lock()
+        self.parent = parent
+        self.executor = ThreadPoolExecutor(max_workers=max(1, chunk_workers), thread_name_prefix=Dlp.CHUNK_THREAD_NAME_PREFIX)
+
+    @classmethod
+    def from_settings(cls) -> Optional["DlpClientPool"]:
+        """Build the pool when DLP is enabled and configured; None otherwise."""
+        settings = get_settings()
+        if not (settings.enable_dlp and settings.gcp_project_id and dlp_v2 is not None):
+            logger.info("%s: enable_dlp=%s, project_id set=%s", LogEvents.DLP_DISABLED, settings.enable_dlp, bool(settings.gcp_project_id))
+            return None
+        size = max(1, int(settings.dlp_client_pool_size or Dlp.DEFAULT_CLIENT_POOL_SIZE))
+        location = settings.dlp_location or Dlp.DEFAULT_LOCATION
+        try:  # pragma: no cover
+            clients = [dlp_v2.DlpServiceClient() for _ in range(size)]
+        except Exception as exc:
+            logger.warning("%s: %s", LogEvents.DLP_CLIENT_INIT_ERROR, exc)
+            return None
+        parent = Dlp.PARENT_PATH_TEMPLATE.format(project_id=settings.gcp_project_id, location=location)
+        logger.info("%s (location=%s, pool_size=%s)", LogEvents.DLP_ENABLED, location, size)
+        return cls(clients, parent, chunk_workers=int(settings.dlp_chunk_workers or Dlp.DEFAULT_CHUNK_WORKERS))
+
+    @property
+    def size(self) -> int:
+        return len(self._clients)
+
+    def acquire(self) -> Any:
+        """Return the next client round-robin; clients are thread-safe and shared."""
+        with self._lock:
+            idx = next(self._cycle)
+        return self._clients[idx]
+
+    def close(self) -> None:
+        for client in self._clients:
+            try:  # pragma: no cover
+                client.transport.close()
+            except Exception as exc:
+                logger.warning("%s: %s", LogEvents.DLP_CLIENT_CLOSE_ERROR, exc)
+        self._clients = []
+        self.executor.shutdown(wait=False)
+
+
+_pool: Optional[DlpClientPool] = None
+_pool_initialized = False
+_pool_lock = threading.Lock()
+
+
+def init_dlp_client_pool() -> Optional[DlpClientPool]:
+    """Create the shared pool once (app startup); later calls return the same pool."""
+    global _pool, _pool_initialized
+    with _pool_lock:
+        if not _pool_initialized:
+            _pool = DlpClientPool.from_settings()
+            _pool_initialized = True
+        return _pool
+
+
+def get_dlp_client_pool() -> Optional[DlpClientPool]:
+    """Shared pool, initialized lazily if startup did not run (scripts, workers)."""
+    if _pool_initialized:
+        return _pool
+    return init_dlp_client_pool()
+
+
+def close_dlp_client_pool() -> None:
+    """Close all channels (app shutdown)."""
+    global _pool, _pool_initialized
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = None
+        _pool_initialized = False
@@ -0,0 +1,219 @@
+"""
+Google Cloud DLP redaction provider.
+
+Text goes through one deidentify call (or inspect + deidentify), large text
+is inspected in parallel chunks and redacted locally; images use
+redact_image. Clients come from the process-wide pool.
+"""
+from concurrent.futures import Executor
+from typing import Dict, Any, List, Tuple, Optional
+import logging
+import re
+
+from backend.core.constants import Dlp, MimeTypes, Encoding, LogEvents, DlpReq, DlpTextModes, DlpProviders
+from backend.core.settings import get_settings
+from backend.services.dlp_client_pool import DlpClientPool, get_dlp_client_pool
+from backend.services.dlp_templates import DlpRequestTemplates
+from backend.services.dlp_chunking import Span, TextChunk, apply_replacements, findings_from_spans, merge_spans, remap, split_text
+from backend.utils.uploads import ByteSource
+
+# Optional Google DLP imports at module top (safe when library not installed)
+try:  # pragma: no cover
+    from google.cloud import dlp_v2  # type: ignore
+    from google.cloud.dlp_v2 import types  # type: ignore
+except Exception:  # pragma: no cover
+    dlp_v2 = None  # type: ignore
+    types = None  # type: ignore
+
+
+class GoogleDlpProvider:
+    name = DlpProviders.GOOGLE
+    remote = True
+
+    def __init__(self, pool: Optional[DlpClientPool] = None) -> None:
+        self._settings = get_settings()
+        self._logger = logging.getLogger(__name__)
+        self._pool = pool if pool is not None else get_dlp_client_pool()
+        self._parent: Optional[str] = self._pool.parent if self._pool is not None else None
+
+    @property
+    def executor(self) -> Optional[Executor]:
+        return self._pool.executor if self._pool is not None else None
+
+    @property
+    def _client(self) -> Any:
+        # Next warm client from the pool (round-robin); None when DLP is unavailable
+        return self._pool.acquire() if self._pool is not None else None
+
+    def is_ready(self) -> bool:
+        """True when the library is installed and the client pool has a parent path."""
+        return dlp_v2 is not None and self._pool is not None and self._parent is not None
+
+    def mode_key(self) -> str:
+        return (self._settings.dlp_text_mode or DlpTextModes.SINGLE).lower()
+
+    def redact(self, templates: DlpRequestTemplates, content: ByteSource, mime_type: Optional[str]) -> Tuple[ByteSource, List[Dict[str, Any]]]:
+        client = self._client
+        inspect_config = templates.inspect_config
+
+        # Branch by content type
+        if mime_type and mime_type.startswith(MimeTypes.IMAGE_PREFIX):
+            # Image redaction (black boxes over findings)
+            if types is None:
+                return content, []
+            byte_item = {DlpReq.TYPE_: types.ByteContentItem.BytesType.IMAGE, DlpReq.DATA: bytes(content)}
+            response = client.redact_image(
+                request={
+                    DlpReq.PARENT: self._parent,
+                    DlpReq.INSPECT_CONFIG: inspect_config,
+                    DlpReq.BYTE_ITEM: byte_item,
+                    # Default behavior uses black boxes if no specific image_redaction_configs provided
+                }
+            )
+            # redact_image doesn't return textual findings; return empty list
+            return bytes(response.redacted_image), []
+
+        # Default to text processing
+        text_value = str(content, Encoding.UTF8, errors="ignore")
+        # Large inputs are redacted in parallel chunks instead of being truncated
+        chunk_chars = max(1, int(self._settings.dlp_chunk_chars or Dlp.DEFAULT_CHUNK_CHARS))
+        if len(text_value) > chunk_chars or len(content) > Dlp.MAX_TEXT_BYTES:
+            return self._redact_text_chunked(templates, text_value, min(chunk_chars, Dlp.MAX_TEXT_BYTES // 4))
+
+        if self.mode_key() == DlpTextModes.TWO_CALL:
+            return self._redact_text_two_call(client, templates, text_value)
+        return self._redact_text_single_call(client, templates, text_value)
+
+    def needs_chunking(self, content: ByteSource) -> bool:
+        # Byte length bounds the code point count, so this never misses a chunked input
+        chunk_chars = max(1, int(self._settings.dlp_chunk_chars or Dlp.DEFAULT_CHUNK_CHARS))
+        return len(content) > chunk_chars or len(content) > Dlp.MAX_TEXT_BYTES
+
+    def _deidentify(self, client: Any, templates: DlpRequestTemplates, text_value: str) -> Any:
+        # Replace with [INFO_TYPE] to preserve readability
+        return client.deidentify_content(
+            request={
+                DlpReq.PARENT: self._parent,
+                DlpReq.DEIDENTIFY_CONFIG: templates.deidentify_config,
+                DlpReq.INSPECT_CONFIG: templates.inspect_config,
+                DlpReq.ITEM: {DlpReq.VALUE: text_value},
+            }
+        )
+
+    def _redact_text_single_call(self, client: Any, templates: DlpRequestTemplates, text_value: str) -> Tuple[bytes, List[Dict[str, Any]]]:
+        """
+        One deidentify round trip; findings are recovered by aligning the
+        redacted output with the input, falling back to the transformation
+        overview (info types without quotes) if alignment is ambiguous.
+        """
+        deid_resp = self._deidentify(client, templates, text_value)
+        redacted_text = deid_resp.item.value if getattr(deid_resp, "item", None) else text_value
+        counts: Dict[str, int] = {}
+        for summary in getattr(getattr(deid_resp, "overview", None), "transformation_summaries", None) or []:
+            name = summary.info_type.name if getattr(summary, "info_type", None) else ""
+            if not name:
+                continue
+            counts[name] = counts.get(name, 0) + sum(int(getattr(r, "count", 0) or 0) for r in (summary.results or []))
+        findings = align_findings(text_value, redacted_text, counts)
+        if findings is None:
+            findings = [{"info_type": name, "quote": None} for name, n in counts.items() for _ in range(n)]
+        return redacted_text.encode(Encoding.UTF8), findings
+
+    def _redact_text_two_call(self, client: Any, templates: DlpRequestTemplates, text_value: str) -> Tuple[bytes, List[Dict[str, Any]]]:
+        """Inspect for findings, then deidentify the same text (two round trips)."""
+        inspect_resp = client.inspect_content(
+            request={
+                DlpReq.PARENT: self._parent,
+                DlpReq.INSPECT_CONFIG: templates.inspect_config,
+                DlpReq.ITEM: {DlpReq.VALUE: text_value},
+            }
+        )
+        findings: List[Dict[str, Any]] = []
+        for f in inspect_resp.result.findings or []:
+            try:
+                info_type = f.info_type.name if getattr(f, "info_type", None) else None
+                quote = getattr(f, "quote", None)
+                if info_type:
+                    findings.append({"info_type": info_type, "quote": quote})
+            except Exception:
+                # Be resilient to provider changes
+                continue
+        deid_resp = self._deidentify(client, templates, text_value)
+        redacted_text = deid_resp.item.value if getattr(deid_resp, "item", None) else text_value
+        return redacted_text.encode(Encoding.UTF8), findings
+
+
+    def _inspect_spans(self, templates: DlpRequestTemplates, chunk: TextChunk) -> List[Span]:
+        """Inspect one chunk (own pooled client) and return findings at document offsets."""
+        resp = self._client.inspect_content(
+            request={
+                DlpReq.PARENT: self._parent,
+                DlpReq.INSPECT_CONFIG: templates.inspect_config,
+                DlpReq.ITEM: {DlpReq.VALUE: chunk.text},
+            }
+        )
+        local: List[Tuple[int, int, str]] = []
+        for f in resp.result.findings or []:
+            try:
+                rng = f.location.codepoint_range
+                if f.info_type.name:
+                    local.append((int(rng.start), int(rng.end), f.info_type.name))
+            except Exception:
+                # Be resilient to provider changes
+                continue
+        return remap(chunk, local)
+
+    def _redact_text_chunked(self, templates: DlpRequestTemplates, text_value: str, chunk_chars: int) -> Tuple[bytes, List[Dict[str, Any]]]:
+        """
+        Split at whitespace with overlap, inspect chunks concurrently on the
+        pool's bounded executor, de-duplicate overlap findings, then apply
+        [INFO_TYPE] replacements locally over the full text.
+        """
+        overlap = int(self._settings.dlp_chunk_overlap_chars or Dlp.DEFAULT_CHUNK_OVERLAP_CHARS)
+        chunks = split_text(text_value, chunk_chars, overlap)
+        self._logger.info("%s: chars=%s chunks=%s", LogEvents.DLP_TEXT_CHUNKED, len(text_value), len(chunks))
+        futures = [self._pool.executor.submit(self._inspect_spans, templates, c) for c in chunks]
+        spans: List[Span] = []
+        for fut in futures:
+            spans.extend(fut.result())
+        merged = merge_spans(spans)
+        redacted_text = apply_replacements(text_value, merged)
+        return redacted_text.encode(Encoding.UTF8), findings_from_spans(text_value, merged)
+
+
+_REPLACEMENT_TOKEN = re.compile(Dlp.REPLACEMENT_TOKEN_REGEX)
+
+
+def align_findings(original: str, redacted: str, counts: Dict[str, int]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Recover findings (info_type + quote) from a replace-with-info-type output.
+    Text between [INFO_TYPE] tokens is copied verbatim from the input, so the
+    redacted text becomes a pattern (literal runs + one capture per token)
+    matched against the input; each capture is that token's quote.
+    Returns None when alignment fails, disagrees with the provider's per-type
+    counts, or is ambiguous: the shortest-first and longest-first splits are
+    the extremes of all valid splits, so when they differ (e.g. two tokens
+    separated only by a space, "[PHONE_NUMBER] [EMAIL_ADDRESS]") no quote can
+    be trusted.
+    """
+    if not counts:
+        return []
+    tokens = [m for m in _REPLACEMENT_TOKEN.finditer(redacted) if m.group(1) in counts]
+    seen: Dict[str, int] = {}
+    for tok in tokens:
+        seen[tok.group(1)] = seen.get(tok.group(1), 0) + 1
+    if seen != counts:
+        return None
+    literals: List[str] = []
+    r = 0
+    for tok in tokens:
+        literals.append(re.escape(redacted[r:tok.start()]))
+        r = tok.end()
+    literals.append(re.escape(redacted[r:]))
+    lazy = re.fullmatch("(.+?)".join(literals), original, flags=re.DOTALL)
+    if lazy is None:
+        return None
+    greedy = re.fullmatch("(.+)".join(literals), original, flags=re.DOTALL)
+    if greedy is None or greedy.groups() != lazy.groups():
+        return None
+    return [{"info_type": tok.group(1), "quote": quote} for tok, quote in zip(tokens, lazy.groups())]
@@ -0,0 +1,222 @@
+"""
+Local PII candidate scanner.
+
+Precompiled regexes find candidate spans without a network call; card numbers
+are Luhn-checked. Patterns are grouped by how a match can start so each pass
+only tries a small set of positions: a digit-led pass (SSN, card, phone,
+numeric date, ID number) gated by a lookahead on the first character, a
+month-name date pass gated on capitalized month initials, and an email pass
+that only starts where a local-part run starts. Every pass is a single linear
+finditer, so '@'- or digit-dense input cannot make the scan quadratic. Used as
+a pre-filter so clean text can skip the remote DLP call (only when every
+configured info type has a local pattern, see ``covers``), and by the offline
+local provider.
+
+``LocalDlpProvider`` redacts text in-process with the same [INFO_TYPE]
+output and findings shape as the Google provider. Images are redacted with
+black boxes over OCR'd candidate words when pytesseract (and the tesseract
+binary) is installed; otherwise they pass through unchanged.
+"""
+from concurrent.futures import Executor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import io
+import logging
+import re
+
+from backend.core.constants import Dlp, DlpLocal, DlpProviders, MimeTypes, Encoding, LogEvents
+from backend.core.settings import get_settings
+from backend.services.dlp_chunking import Span, apply_replacements, findings_from_spans, merge_spans
+from backend.services.dlp_templates import DlpRequestTemplates
+from backend.utils.uploads import ByteSource
+
+# Optional OCR for local image redaction (safe when not installed)
+try:  # pragma: no cover
+    import pytesseract  # type: ignore
+    from PIL import Image, ImageDraw  # type: ignore
+except Exception:  # pragma: no cover
+    pytesseract = None  # type: ignore
+    Image = None  # type: ignore
+    ImageDraw = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+# Every configured info type name a local pattern can report (including aliases such as DATE_OF_BIRTH)
+_LOCAL_INFO_TYPES = frozenset(
+    alias for info_type in DlpLocal.GROUP_INFO_TYPES.values() for alias in DlpLocal.INFO_TYPE_ALIASES.get(info_type, (info_type,))
+)
+
+
+def luhn_valid(digits: str) -> bool:
+    total = 0
+    parity = len(digits) % 2
+    for i, ch in enumerate(digits):
+        d = ord(ch) - 48
+        if i % 2 == parity:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return total % 10 == 0
+
+
+class LocalPiiScanner:
+    """Multi-pattern scan; alternation order resolves overlaps (SSN before phone, card before phone)."""
+
+    def __init__(self) -> None:
+        digit_led = [
+            ("SSN", Dlp.REGEX_SSN),
+            ("CARD", DlpLocal.REGEX_CARD),
+            ("PHONE", DlpLocal.REGEX_PHONE),
+            ("DATE", DlpLocal.REGEX_DATE_NUMERIC),
+            ("ID", DlpLocal.REGEX_ID_NUMBER),
+        ]
+        self._digit_led = re.compile(
+            DlpLocal.DIGIT_LEAD_LOOKAHEAD + "(?:" + "|".join(f"(?P<{name}>{rx})" for name, rx in digit_led) + ")"
+        )
+        self._named_date = re.compile(DlpLocal.MONTH_LEAD_LOOKAHEAD + DlpLocal.REGEX_DATE_NAMED)
+        self._email = re.compile(DlpLocal.REGEX_EMAIL)
+        self._non_digit = re.compile(r"\D")
+        self._info_types = DlpLocal.GROUP_INFO_TYPES
+
+    def _iter_digit_led(self, text: str) -> Iterator[Span]:
+        for m in self._digit_led.finditer(text):
+            group = m.lastgroup or ""
+            start = m.start()
+            if group == "CARD" and not luhn_valid(self._non_digit.sub("", m.group(0))):
+                continue
+            if group == "ID":
+                # Include the letter prefix matched by lookbehind
+                while start > 0 and text[start - 1].isalpha() and m.start() - start < 2:
+                    start -= 1
+            yield Span(start, m.end(), self._info_types[group])
+
+    def _iter_named_dates(self, text: str) -> Iterator[Span]:
+        for m in self._named_date.finditer(text):
+            yield Span(m.start(), m.end(), self._info_types["DATE"])
+
+    def _iter_emails(self, text: str) -> Iterator[Span]:
+        if "@" not in text:
+            return
+        for m in self._email.finditer(text):
+            # Longer local runs report only their last EMAIL_LOCAL_MAX_CHARS chars
+            start = max(m.start(), m.end("local") - DlpLocal.EMAIL_LOCAL_MAX_CHARS)
+            yield Span(start, m.end(), self._info_types["EMAIL"])
+
+    def scan(self, text: str) -> List[Span]:
+        """All candidate spans in document order."""
+        spans = list(self._iter_digit_led(text)) + list(self._iter_named_dates(text)) + list(self._iter_emails(text))
+        spans.sort(key=lambda s: (s.start, s.end))
+        return spans
+
+    @staticmethod
+    def uncovered(info_types: Iterable[str]) -> Tuple[str, ...]:
+        """Configured info types with no local pattern (e.g. PERSON_NAME, custom types)."""
+        return tuple(t for t in info_types if t not in _LOCAL_INFO_TYPES)
+
+    def covers(self, info_types: Iterable[str]) -> bool:
+        """True when a clean scan means none of `info_types` is present."""
+        return not self.uncovered(info_types)
+
+    def has_candidates(self, text: str) -> bool:
+        """Stops at the first candidate; cheapest pass first."""
+        for it in (self._iter_emails(text), self._iter_named_dates(text), self._iter_digit_led(text)):
+            if next(it, None) is not None:
+                return True
+        return False
+
+
+class LocalDlpProvider:
+    """In-process pattern engine; no network, no credentials."""
+
+    name = DlpProviders.LOCAL
+    remote = False
+    executor: Optional[Executor] = None
+
+    def __init__(self, scanner: Optional[LocalPiiScanner] = None) -> None:
+        self._scanner = scanner if scanner is not None else get_local_scanner()
+        self._ocr_warned = False
+
+    def is_ready(self) -> bool:
+        # ENABLE_DLP stays the master switch for every provider
+        return bool(get_settings().enable_dlp)
+
+    def mode_key(self) -> str:
+        return ""
+
+    def needs_chunking(self, content: ByteSource) -> bool:
+        return False
+
+    def redact(self, templates: DlpRequestTemplates, content: ByteSource, mime_type: Optional[str]) -> Tuple[ByteSource, List[Dict[str, Any]]]:
+        if mime_type and mime_type.startswith(MimeTypes.IMAGE_PREFIX):
+            return self._redact_image(templates, content), []
+        text = str(content, Encoding.UTF8, errors="ignore")
+        spans = merge_spans(self._configured(templates, self._scanner.scan(text)))
+        if not spans:
+            return content, []
+        return apply_replacements(text, spans).encode(Encoding.UTF8), findings_from_spans(text, spans)
+
+    @staticmethod
+    def _configured(templates: DlpRequestTemplates, spans: List[Span]) -> List[Span]:
+        """Keep spans whose type is configured, renamed to the configured alias (e.g. DATE -> DATE_OF_BIRTH)."""
+        enabled = set(templates.info_types) | {Dlp.CUSTOM_SSN_NAME}
+        names: Dict[str, Optional[str]] = {}
+        out: List[Span] = []
+        for span in spans:
+            if span.info_type not in names:
+                aliases = DlpLocal.INFO_TYPE_ALIASES.get(span.info_type, (span.info_type,))
+                names[span.info_type] = next((a for a in aliases if a in enabled), None)
+            name = names[span.info_type]
+            if name is not None:
+                out.append(Span(span.start, span.end, name))
+        return out
+
+    def _redact_image(self, templates: DlpRequestTemplates, content: ByteSource) -> ByteSource:
+        """Black boxes over OCR'd words that fall inside a candidate span; unchanged without OCR."""
+        if pytesseract is None or Image is None:
+            if not self._ocr_warned:
+                logger.warning(LogEvents.DLP_LOCAL_OCR_UNAVAILABLE)
+                self._ocr_warned = True
+            return content
+        image = Image.open(io.BytesIO(content))
+        fmt = image.format or "PNG"
+        image = image.convert("RGB")
+        data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+        # Rebuild the page text one word per token, remembering each word's offsets and box
+        words: List[Tuple[int, int, Tuple[int, int, int, int]]] = []
+        parts: List[str] = []
+        pos = 0
+        for i, word in enumerate(data["text"]):
+            word = (word or "").strip()
+            if not word or float(data["conf"][i]) < DlpLocal.OCR_MIN_CONFIDENCE:
+                continue
+            box = (data["left"][i], data["top"][i], data["left"][i] + data["width"][i], data["top"][i] + data["height"][i])
+            words.append((pos, pos + len(word), box))
+            parts.append(word)
+            pos += len(word) + 1
+        spans = self._configured(templates, self._scanner.scan(" ".join(parts)))
+        if not spans:
+            return content
+        draw = ImageDraw.Draw(image)
+        pad = DlpLocal.OCR_BOX_PADDING_PX
+        for start, end, (x0, y0, x1, y1) in words:
+            if any(s.start < end and start < s.end for s in spans):
+                draw.rectangle((x0 - pad, y0 - pad, x1 + pad, y1 + pad), fill=(0, 0, 0))
+        out = io.BytesIO()
+        image.save(out, format=fmt)
+        return out.getvalue()
+
+
+_scanner = LocalPiiScanner()
+_provider: Optional[LocalDlpProvider] = None
+
+
+def get_local_scanner() -> LocalPiiScanner:
+    return _scanner
+
+
+def get_local_provider() -> LocalDlpProvider:
+    global _provider
+    if _provider is None:
+        _provider = LocalDlpProvider()
+    return _provider
@@ -0,0 +1,50 @@
+"""
+Pluggable redaction providers behind DlpService.
+
+A provider turns (templates, content, mime type) into (redacted bytes,
+findings) with findings shaped as ``{"info_type": ..., "quote": ...}`` and
+text redacted as ``[INFO_TYPE]``. ``Settings.dlp_provider`` selects the
+engine: Google Cloud DLP, or the in-process local engine for staging, load
+tests and air-gapped deployments.
+"""
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+from backend.core.constants import DlpProviders
+from backend.core.settings import get_settings
+from backend.services.dlp_templates import DlpRequestTemplates
+from backend.services.dlp_google import GoogleDlpProvider
+from backend.services.dlp_local import get_local_provider
+from backend.utils.uploads import ByteSource
+
+
+class DlpProvider(Protocol):
+    # Stable engine name (part of result cache keys)
+    name: str
+    # True when calls leave the process (enables the local pre-filter)
+    remote: bool
+
+    @property
+    def executor(self) -> Optional[Executor]:
+        """Background executor for deferred work; None when the provider has none."""
+        ...
+
+    def is_ready(self) -> bool:
+        ...
+
+    def mode_key(self) -> str:
+        """Provider options that change output (part of result cache keys)."""
+        ...
+
+    def needs_chunking(self, content: ByteSource) -> bool:
+        ...
+
+    def redact(self, templates: DlpRequestTemplates, content: ByteSource, mime_type: Optional[str]) -> Tuple[ByteSource, List[Dict[str, Any]]]:
+        ...
+
+
+def get_dlp_provider() -> DlpProvider:
+    """Provider selected by settings; Google unless `dlp_provider` is local."""
+    if (get_settings().dlp_provider or DlpProviders.GOOGLE).lower() == DlpProviders.LOCAL:
+        return get_local_provider()
+    return GoogleDlpProvider()
@@ -1,54 +1,51 @@
 """
 Backend DLP service integration.
 
-Provides in-memory redaction for text and images via Google Cloud DLP,
-with safe fallbacks when disabled or unavailable.
+Provides in-memory redaction for text and images through a pluggable
+provider (Google Cloud DLP or the in-process local engine), with safe
+fallbacks when disabled or unavailable.
 """
 from typing import Dict, Any, List, Tuple, Optional
 import logging
-from backend.core.constants import Keys, Messages, Dlp, MimeTypes, Encoding, LogEvents, DlpReq
+from backend.core.constants import Keys, Messages, MimeTypes, Encoding, LogEvents, DlpPrefilterPolicies, MetricNames
+from backend.core.metrics import metrics
 from backend.core.settings import get_settings
-
-# Optional Google DLP imports at module top (safe when library not installed)
-try:  # pragma: no cover
-    from google.cloud import dlp_v2  # type: ignore
-    from google.cloud.dlp_v2 import types  # type: ignore
-except Exception:  # pragma: no cover
-    dlp_v2 = None  # type: ignore
-    types = None  # type: ignore
+from backend.services.dlp_cache import DlpResultCache, get_dlp_cache
+from backend.services.dlp_templates import DlpRequestTemplates, get_dlp_templates
+from backend.services.dlp_local import get_local_scanner
+from backend.services.dlp_providers import DlpProvider, get_dlp_provider
+from backend.utils.uploads import ByteSource
 
 
 class DlpService:
     """
-    Thin wrapper around Google Cloud DLP for in-memory content redaction.
+    Thin wrapper around a redaction provider for in-memory content redaction.
     - Resilient when DLP is disabled or unavailable: returns original content.
-    - Supports text (inspect + deidentify) and image (redact_image) flows.
+    - Provider selected by settings (`dlp_provider`): google (pooled Cloud DLP clients) or local (offline).
+    - Results are cached (encrypted) by content hash + mime + provider/config fingerprint.
+    - Optional local pre-scan lets text with no PII candidates skip (or defer) a remote provider call.
     - Findings are returned for text to support UX surfacing.
     """
-    def __init__(self) -> None:
+    def __init__(self, provider: Optional[DlpProvider] = None, cache: Optional[DlpResultCache] = None) -> None:
         """
-        Initialize the service and lazily wire the Google DLP client if enabled.
-        Safe in dev environments without GCP credentials or library installed.
+        Initialize the service against the configured provider.
+        Google clients come from the pool created once at app startup; when DLP
+        is disabled or the library/credentials are missing calls are no-ops.
         """
         self._settings = get_settings()
         self._logger = logging.getLogger(__name__)
-        self._client = None
-        self._parent: Optional[str] = None
+        self._provider = provider if provider is not None else get_dlp_provider()
+        self._cache = cache if cache is not None else get_dlp_cache()
+        policy = (self._settings.dlp_prefilter_policy or DlpPrefilterPolicies.OFF).lower()
+        if policy != DlpPrefilterPolicies.OFF and self._provider.remote:
+            # Built once by the container at startup, so this logs once; such text always goes to the provider
+            uncovered = get_local_scanner().uncovered(get_dlp_templates().info_types)
+            if uncovered:
+                self._logger.warning("%s: policy=%s info_types=%s", LogEvents.DLP_PREFILTER_UNCOVERED, policy, ",".join(uncovered))
 
-        # Lazy/optional Google DLP wiring (dev-safe if lib/creds missing)
-        if self._settings.enable_dlp and self._settings.gcp_project_id and dlp_v2 is not None:
-            try:  # pragma: no cover
-                self._client = dlp_v2.DlpServiceClient()
-                location = self._settings.dlp_location or Dlp.DEFAULT_LOCATION
-                self._parent = Dlp.PARENT_PATH_TEMPLATE.format(project_id=self._settings.gcp_project_id, location=location)
-                self._logger.info("%s (location=%s)", LogEvents.DLP_ENABLED, location)
-            except Exception as exc:
-                # Fall back silently to stub behavior; log at WARN for awareness
-                self._client = None
-                self._parent = None
-                self._logger.warning("%s: %s", LogEvents.DLP_CLIENT_INIT_ERROR, exc)
-        else:
-            self._logger.info("%s: enable_dlp=%s, project_id set=%s", LogEvents.DLP_DISABLED, self._settings.enable_dlp, bool(self._settings.gcp_project_id))
+    @property
+    def provider_name(self) -> str:
+        return self._provider.name
 
     def redact(self, *, bucket: str, object_name: str) -> Dict[str, Any]:
         """
@@ -59,120 +56,85 @@ class DlpService:
 
     def is_ready(self) -> bool:
         """
-        Returns True when DLP client is initialized and a valid parent path is set.
+        Returns True when the selected provider can serve requests.
         """
-        return self._client is not None and self._parent is not None
+        return self._provider.is_ready()
 
-    def redact_content(self, *, content: bytes, mime_type: Optional[str] = None) -> Tuple[bytes, List[Dict[str, Any]]]:
+    def redact_content(self, *, content: ByteSource, mime_type: Optional[str] = None) -> Tuple[ByteSource, List[Dict[str, Any]]]:
         """
-        Redact in-memory content using Google Cloud DLP when enabled and available.
+        Redact in-memory content using the configured provider when enabled and available.
+        - Content may be bytes or a buffer view over a spooled upload; unchanged input is returned as-is.
         - Text: returns (redacted_bytes, findings)
         - Images: returns (redacted_bytes, [])
         Falls back to no-op (content, []) if DLP is disabled/unavailable.
         """
-        if not self._client or not self._parent or dlp_v2 is None:
+        if not self.is_ready():
             # No-op stub; DLP disabled or unavailable
             return content, []
 
-        # Build inspect config
-        info_type_names = list(self._settings.dlp_info_types or Dlp.DEFAULT_INFO_TYPES)
-        # Normalize info type names to provider's expected uppercase format
-        info_type_names = [str(t or "").strip().upper() for t in info_type_names if str(t or "").strip()]
-        # Strengthen SSN detection with a simple custom regex fallback (custom, not built-in)
-        custom_info_types: List[Dict[str, Any]] = [
-            {
-                DlpReq.INFO_TYPE: {"name": Dlp.CUSTOM_SSN_NAME},
-                DlpReq.REGEX: {DlpReq.PATTERN: Dlp.REGEX_SSN},
-            }
-        ]
-        # Only pass built-in info types in the standard list; custom type is provided separately
-        built_in_info_type_names = [t for t in info_type_names if t != Dlp.CUSTOM_SSN_NAME]
-        inspect_config: Dict[str, Any] = {
-            DlpReq.INFO_TYPES: [{"name": t} for t in built_in_info_type_names],
-            DlpReq.MIN_LIKELIHOOD: getattr(
-                dlp_v2.Likelihood,
-                (self._settings.dlp_min_likelihood or Dlp.DEFAULT_MIN_LIKELIHOOD).upper(),
-                dlp_v2.Likelihood.POSSIBLE,
-            ),
-            DlpReq.INCLUDE_QUOTE: True,
-            DlpReq.CUSTOM_INFO_TYPES: custom_info_types,
-        }
-
-        # Branch by content type
-        if mime_type and mime_type.startswith(MimeTypes.IMAGE_PREFIX):
-            # Image redaction (black boxes over findings)
-            if types is None:
+        # Prebuilt per settings snapshot (see dlp_templates.rebuild_dlp_templates)
+        templates = get_dlp_templates()
+        cache_key: Optional[str] = None
+        if self._cache is not None:
+            cache_key = self._cache.key_for(content, mime_type or "", self._cache_fingerprint(templates))
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+        if self._prefilter_clean(templates, content, mime_type):
+            policy = (self._settings.dlp_prefilter_policy or DlpPrefilterPolicies.OFF).lower()
+            if policy == DlpPrefilterPolicies.SKIP:
+                metrics.inc(MetricNames.DLP_PREFILTER_SKIPPED)
                 return content, []
-            byte_item = {DlpReq.TYPE_: types.ByteContentItem.BytesType.IMAGE, DlpReq.DATA: content}
-            try:
-                response = self._client.redact_image(
-                    request={
-                        DlpReq.PARENT: self._parent,
-                        DlpReq.INSPECT_CONFIG: inspect_config,
-                        DlpReq.BYTE_ITEM: byte_item,
-                        # Default behavior uses black boxes if no specific image_redaction_configs provided
-                    }
-                )
-                # redact_image doesn't return textual findings; return empty list
-                return bytes(response.redacted_image), []
-            except Exception as exc:
-                self._logger.warning("%s: %s", LogEvents.DLP_REDACT_IMAGE_FAILED, exc)
+            executor = self._provider.executor
+            if policy == DlpPrefilterPolicies.DEFER and executor is not None and not self._provider.needs_chunking(content):
+                # Confirm off the request path; a miss is logged and its result cached for the next upload
+                metrics.inc(MetricNames.DLP_PREFILTER_DEFERRED)
+                # Copied: the caller's upload view is released once the request ends
+                executor.submit(self._confirm_deferred, templates, bytes(content), mime_type, cache_key)
                 return content, []
+        try:
+            redacted, findings = self._provider.redact(templates, content, mime_type)
+        except Exception as exc:
+            if not (mime_type and mime_type.startswith(MimeTypes.IMAGE_PREFIX)):
+                raise
+            # Images fail open with the original bytes; not cached so the next upload retries
+            self._logger.warning("%s: %s", LogEvents.DLP_REDACT_IMAGE_FAILED, exc)
+            return content, []
+        if cache_key is not None:
+            self._cache.put(cache_key, redacted, findings)
+        return redacted, findings
 
-        # Default to text processing
-        text_value = content.decode(Encoding.UTF8, errors="ignore")
-        # Safety cap large inputs
-        if len(text_value.encode(Encoding.UTF8)) > Dlp.MAX_TEXT_BYTES:
-            self._logger.warning("dlp_text_truncated: sizeBytes=%s cap=%s", len(text_value.encode(Encoding.UTF8)), Dlp.MAX_TEXT_BYTES)
-            # Truncate by bytes to avoid splitting multi-byte mid-character
-            text_bytes = text_value.encode(Encoding.UTF8)[: Dlp.MAX_TEXT_BYTES]
-            text_value = text_bytes.decode(Encoding.UTF8, errors="ignore")
-
-        # First inspect to capture findings for caller UX
-        inspect_resp = self._client.inspect_content(
-            request={
-                DlpReq.PARENT: self._parent,
-                DlpReq.INSPECT_CONFIG: inspect_config,
-                DlpReq.ITEM: {DlpReq.VALUE: text_value},
-            }
-        )
-        findings: List[Dict[str, Any]] = []
-        for f in inspect_resp.result.findings or []:
-            try:
-                info_type = f.info_type.name if getattr(f, "info_type", None) else None
-                quote = getattr(f, "quote", None)
-                if info_type:
-                    findings.append({"info_type": info_type, "quote": quote})
-            except Exception:
-                # Be resilient to provider changes
-                continue
-
-        # Then deidentify to redact (mask or replace with [INFO_TYPE])
-        # Using replace-with-info-type to preserve readability by default
-        transformation = {
-            DlpReq.PRIMITIVE_TRANSFORMATION: {
-                DlpReq.REPLACE_WITH_INFO_TYPE_CONFIG: {}
-            }
-        }
-        # Apply transformation to all detected findings (built-in and custom) without enumerating names
-        deidentify_config = {
-            DlpReq.INFO_TYPE_TRANSFORMATIONS: {
-                DlpReq.TRANSFORMATIONS: [
-                    {
-                        **transformation,
-                    }
-                ]
-            }
-        }
-        deid_resp = self._client.deidentify_content(
-            request={
-                DlpReq.PARENT: self._parent,
-                DlpReq.DEIDENTIFY_CONFIG: deidentify_config,
-                DlpReq.INSPECT_CONFIG: inspect_config,
-                DlpReq.ITEM: {DlpReq.VALUE: text_value},
-            }
-        )
-        redacted_text = deid_resp.item.value if getattr(deid_resp, "item", None) else text_value
-        return redacted_text.encode(Encoding.UTF8), findings
+    def _prefilter_clean(self, templates: DlpRequestTemplates, content: ByteSource, mime_type: Optional[str]) -> bool:
+        """
+        True when the policy is on, the provider is remote, every configured info type has a
+        local pattern and the local scan finds no PII candidates (text only).
+        """
+        policy = (self._settings.dlp_prefilter_policy or DlpPrefilterPolicies.OFF).lower()
+        if policy == DlpPrefilterPolicies.OFF or not self._provider.remote:
+            return False
+        if mime_type and mime_type.startswith(MimeTypes.IMAGE_PREFIX):
+            return False
+        scanner = get_local_scanner()
+        # A clean scan says nothing about types the local patterns cannot see (names, addresses, custom types)
+        if not scanner.covers(templates.info_types):
+            return False
+        if scanner.has_candidates(str(content, Encoding.UTF8, errors="ignore")):
+            metrics.inc(MetricNames.DLP_PREFILTER_CANDIDATES)
+            return False
+        metrics.inc(MetricNames.DLP_PREFILTER_CLEAN)
+        return True
 
+    def _confirm_deferred(self, templates: DlpRequestTemplates, content: bytes, mime_type: Optional[str], cache_key: Optional[str]) -> None:
+        try:
+            redacted, findings = self._provider.redact(templates, content, mime_type)
+        except Exception as exc:
+            self._logger.warning("%s: %s", LogEvents.DLP_DEFERRED_FAILED, exc)
+            return
+        if findings:
+            metrics.inc(MetricNames.DLP_PREFILTER_MISSED)
+            self._logger.warning("%s: findings=%s", LogEvents.DLP_PREFILTER_MISSED, len(findings))
+        if cache_key is not None:
+            self._cache.put(cache_key, redacted, findings)
 
+    def _cache_fingerprint(self, templates: DlpRequestTemplates) -> str:
+        return f"{self._provider.name}:{templates.fingerprint}:{self._provider.mode_key()}"
@@ -0,0 +1,105 @@
+"""
+Precompiled DLP request templates.
+
+The inspect/deidentify configs depend only on settings (info types, minimum
+likelihood), so they are built once per settings snapshot and reused by every
+redaction call instead of being rebuilt per upload. Call
+``rebuild_dlp_templates()`` after changing ``dlp_info_types`` or
+``dlp_min_likelihood`` at runtime.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import threading
+
+from backend.core.constants import Dlp, DlpReq
+from backend.core.settings import get_settings
+
+# Optional Google DLP import (safe when library not installed)
+try:  # pragma: no cover
+    from google.cloud import dlp_v2  # type: ignore
+except Exception:  # pragma: no cover
+    dlp_v2 = None  # type: ignore
+
+
+@dataclass(frozen=True)
+class DlpRequestTemplates:
+    """Read-only request fragments shared across calls; never mutate in place."""
+    info_types: Tuple[str, ...]
+    min_likelihood: str
+    # Stable digest of the inspect/deidentify inputs (cache keys, comparisons)
+    fingerprint: str
+    inspect_config: Any
+    deidentify_config: Any
+
+
+_templates: Optional[DlpRequestTemplates] = None
+_lock = threading.Lock()
+
+
+def _normalize_info_types(names: List[str]) -> Tuple[str, ...]:
+    # Provider expects uppercase names; drop blanks
+    return tuple(str(t or "").strip().upper() for t in names if str(t or "").strip())
+
+
+def build_dlp_templates(info_types: Optional[List[str]] = None, min_likelihood: Optional[str] = None) -> DlpRequestTemplates:
+    """Build inspect/deidentify configs; converted to proto messages once when the library is present."""
+    settings = get_settings()
+    names = _normalize_info_types(list(info_types if info_types is not None else (settings.dlp_info_types or Dlp.DEFAULT_INFO_TYPES)))
+    likelihood = (min_likelihood or settings.dlp_min_likelihood or Dlp.DEFAULT_MIN_LIKELIHOOD).upper()
+    # Strengthen SSN detection with a simple custom regex fallback (custom, not built-in)
+    custom_info_types: List[Dict[str, Any]] = [
+        {
+            DlpReq.INFO_TYPE: {DlpReq.NAME: Dlp.CUSTOM_SSN_NAME},
+            DlpReq.REGEX: {DlpReq.PATTERN: Dlp.REGEX_SSN},
+        }
+    ]
+    # Only pass built-in info types in the standard list; custom type is provided separately
+    built_in = [t for t in names if t != Dlp.CUSTOM_SSN_NAME]
+    inspect_config: Dict[str, Any] = {
+        DlpReq.INFO_TYPES: [{DlpReq.NAME: t} for t in built_in],
+        DlpReq.MIN_LIKELIHOOD: likelihood,
+        DlpReq.INCLUDE_QUOTE: True,
+        DlpReq.CUSTOM_INFO_TYPES: custom_info_types,
+    }
+    # Replace every finding (built-in and custom) with [INFO_TYPE] to keep text readable
+    deidentify_config: Dict[str, Any] = {
+        DlpReq.INFO_TYPE_TRANSFORMATIONS: {
+            DlpReq.TRANSFORMATIONS: [
+                {DlpReq.PRIMITIVE_TRANSFORMATION: {DlpReq.REPLACE_WITH_INFO_TYPE_CONFIG: {}}}
+            ]
+        }
+    }
+    if dlp_v2 is not None:  # pragma: no cover
+        inspect_config[DlpReq.MIN_LIKELIHOOD] = getattr(dlp_v2.Likelihood, likelihood, dlp_v2.Likelihood.POSSIBLE)
+        # Marshal to protos once so each request skips dict -> proto conversion
+        inspect_config = dlp_v2.InspectConfig(inspect_config)
+        deidentify_config = dlp_v2.DeidentifyConfig(deidentify_config)
+    fingerprint = hashlib.sha256(
+        "|".join([",".join(names), likelihood, Dlp.CUSTOM_SSN_NAME, Dlp.REGEX_SSN]).encode("utf-8")
+    ).hexdigest()
+    return DlpRequestTemplates(
+        info_types=names,
+        min_likelihood=likelihood,
+        fingerprint=fingerprint,
+        inspect_config=inspect_config,
+        deidentify_config=deidentify_config,
+    )
+
+
+def get_dlp_templates() -> DlpRequestTemplates:
+    """Return the cached templates, building them on first use."""
+    global _templates
+    if _templates is None:
+        with _lock:
+            if _templates is None:
+                _templates = build_dlp_templates()
+    return _templates
+
+
+def rebuild_dlp_templates(info_types: Optional[List[str]] = None, min_likelihood: Optional[str] = None) -> DlpRequestTemplates:
+    """Rebuild after settings change; explicit args override the current settings."""
+    global _templates
+    with _lock:
+        _templates = build_dlp_templates(info_types=info_types, min_likelihood=min_likelihood)
+    return _templates
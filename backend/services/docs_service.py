@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Optional
 
 from backend.core.constants import Keys, Messages, DocKeys
 from backend.clients import VertexRagClient
+from backend.utils.uploads import ByteSource
 
 
 class DocsService:
@@ -28,7 +29,7 @@ class DocsService:
         return self.client.get_document(corpus_uri=corpus_uri, doc_id=doc_id)
 
     def upload_doc(
-        self, *, corpus_uri: str, file_name: str, content_type: Optional[str] = None, content: bytes = b""
+        self, *, corpus_uri: str, file_name: str, content_type: Optional[str] = None, content: ByteSource = b""
     ) -> Dict[str, Any]:
         """Upload a new document into the corpus."""
         created = self.client.add_document(
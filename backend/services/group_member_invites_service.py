@@ -5,19 +5,20 @@ from typing import Any, Dict, Optional
 import logging
 from sqlalchemy.orm import Session
 from sqlalchemy import select
-import secrets
 
-from backend.core.constants import Errors, Keys, Fields, Messages, LogEvents, GroupRoles, DeepLink, TokenTypes, Roles
+from backend.core.constants import Errors, Keys, Fields, Messages, LogEvents, GroupRoles, DeepLink, TokenTypes, Roles, CursorScopes
 from backend.db.models import User, Group
+from backend.db.session import release_connection, unit_of_work
 from backend.repositories.group_member_invites_repo import GroupMemberInvitesRepository
 from backend.repositories.group_memberships_repo import GroupMembershipsRepository
 from backend.services.email_service import send_invite_email
 from backend.services.invite_signing import sign_invite, verify_invite
 from backend.core.settings import get_settings
-from backend.services.auth_service import hash_password
+from backend.security.passwords import unusable_password_hash
 from backend.schemas.common import InvitationStatus
 from backend.repositories.interfaces import GroupMemberInvitesRepo
 from backend.services.utils import ensure_admin
+from backend.utils.pagination import cursor_scope, decode_cursor, keyset_page
 
 
 class GroupMemberInvitesService:
@@ -44,6 +45,8 @@ class GroupMemberInvitesService:
 		# email
 		token = sign_invite({Keys.INVITATION_ID: str(row.id), Keys.GROUP_ID: group_id, Fields.EMAIL: email, Keys.TYPE: TokenTypes.GROUP_MEMBER})
 		accept_url = f"{DeepLink.SCHEME}://{DeepLink.INVITE_ACCEPT_PATH}?{Keys.TOKEN}={token}"
+		# Not needed during the SendGrid round trip
+		release_connection(db)
 		send_invite_email(to_email=email, accept_url=accept_url)
 		self.logger.info(LogEvents.INVITATION_SENT, extra={Keys.GROUP_ID: group_id, Keys.ACTOR_ID: actor_id, Keys.INVITATION_ID: str(row.id), Keys.INVITED_EMAIL: email})
 		resp = {
@@ -58,10 +61,12 @@ class GroupMemberInvitesService:
 			resp[Keys.ACCEPT_URL] = accept_url
 		return resp
 
-	def list_pending(self, db: Session, *, group_id: str, limit: int, offset: int) -> Dict[str, Any]:
-		"""List pending invites for a group."""
-		total = self.repo.count_pending(db, group_id=group_id)
-		rows = self.repo.list_pending_paginated(db, group_id=group_id, limit=limit, offset=offset)
+	def list_pending(self, db: Session, *, group_id: str, limit: int, offset: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+		"""List pending invites for a group; `cursor` (from next_cursor) seeks instead of OFFSET."""
+		scope = cursor_scope(CursorScopes.GROUP_MEMBER_INVITES, group_id)
+		after = decode_cursor(cursor, scope) if cursor else None
+		total = self.repo.count_pending(db, group_id=group_id) if after is None else None
+		rows, next_cursor = keyset_page(self.repo.list_pending_paginated(db, group_id=group_id, limit=limit + 1, offset=offset, after=after), limit, scope)
 		items = [
 			{
 				Fields.ID: str(r.id),
@@ -71,7 +76,7 @@ class GroupMemberInvitesService:
 			}
 			for r in rows
 		]
-		return {Keys.ITEMS: items, Keys.TOTAL: total}
+		return {Keys.ITEMS: items, Keys.TOTAL: total, Keys.NEXT_CURSOR: next_cursor}
 
 	def accept_by_token(self, db: Session, *, token: str) -> Dict[str, Any]:
 		"""Accept an invite via a signed token (deep link)."""
@@ -92,22 +97,24 @@ class GroupMemberInvitesService:
 		group = db.scalar(select(Group).where(Group.id == group_id))
 		if group is None:
 			raise ValueError(Errors.GROUP_NOT_FOUND)
-		user = db.scalar(select(User).where(User.email == email))
-		if user is None:
-			user = User(
-				username=email,
-				email=email,
-				password_hash=hash_password(secrets.token_urlsafe(12)),
-				role=Roles.CAREGIVER,
-				full_name=invite.invited_full_name,
-				corpus_uri=f"user://{email}/corpus",
-				chat_history_uri=None,
-			)
-			db.add(user)
-			db.commit()
-			db.refresh(user)
-		self.memberships.add(db, group_id=str(group_id), user_id=str(user.id), role=GroupRoles.MEMBER)
-		self.repo.set_status(db, invite=invite, status=InvitationStatus.accepted.value)
+		# Account, membership and invite status commit together
+		with unit_of_work(db):
+			user = db.scalar(select(User).where(User.email == email))
+			if user is None:
+				user = User(
+					username=email,
+					email=email,
+					# Random password was never disclosed; skip the KDF entirely
+					password_hash=unusable_password_hash(),
+					role=Roles.CAREGIVER,
+					full_name=invite.invited_full_name,
+					corpus_uri=f"user://{email}/corpus",
+					chat_history_uri=None,
+				)
+				db.add(user)
+				db.flush()
+			self.memberships.add(db, group_id=str(group_id), user_id=str(user.id), role=GroupRoles.MEMBER)
+			self.repo.set_status(db, invite=invite, status=InvitationStatus.accepted.value)
 		self.logger.info(LogEvents.INVITATION_ACCEPTED, extra={Keys.GROUP_ID: str(group_id), Keys.ACTOR_EMAIL: email, Keys.INVITATION_ID: str(invite.id)})
 		return {Keys.MESSAGE: Messages.INVITATION_ACCEPTED, Keys.GROUP_ID: str(group_id), Fields.USERNAME: user.username}
 
@@ -6,10 +6,12 @@ import logging
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 
-from backend.core.constants import Errors, Keys, Fields, GroupRoles, LogEvents
+from backend.core.constants import Errors, Keys, Fields, GroupRoles, LogEvents, CursorScopes
 from backend.db.models import Group, GroupMembership, User
+from backend.db.session import unit_of_work
 from backend.repositories.groups_repo import GroupsRepository
 from backend.repositories.group_memberships_repo import GroupMembershipsRepository
+from backend.utils.pagination import cursor_scope, decode_cursor, keyset_page
 
 
 class GroupsService:
@@ -21,9 +23,10 @@ class GroupsService:
 
 	def create(self, db: Session, *, name: str, description: Optional[str], created_by: str) -> Dict[str, Any]:
 		"""Create a group and add the creator as admin."""
-		group = self.groups_repo.create(db, name=name, description=description, created_by=created_by)
-		# Ensure creator is a member and an admin (idempotent)
-		self.members_repo.add(db, group_id=str(group.id), user_id=created_by, role=GroupRoles.ADMIN)
+		with unit_of_work(db):
+			group = self.groups_repo.create(db, name=name, description=description, created_by=created_by)
+			# Ensure creator is a member and an admin (idempotent)
+			self.members_repo.add(db, group_id=str(group.id), user_id=created_by, role=GroupRoles.ADMIN)
 		self.logger.info(LogEvents.GROUP_CREATED, extra={Keys.GROUP_ID: str(group.id), Keys.ACTOR_ID: created_by})
 		return {
 			Fields.ID: str(group.id),
@@ -96,16 +99,18 @@ class MembershipsService:
 		if m is None or m.role != GroupRoles.ADMIN:
 			raise ValueError(Errors.FORBIDDEN)
 
-	def list_by_group(self, db: Session, *, group_id: str, actor_id: str, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
-		"""List members of a group with roles."""
+	def list_by_group(self, db: Session, *, group_id: str, actor_id: str, limit: int = 50, offset: int = 0, cursor: Optional[str] = None) -> Dict[str, Any]:
+		"""List members of a group with roles; `cursor` (from next_cursor) seeks instead of OFFSET."""
 		# Any member can list
 		m = self.repo.get(db, group_id=group_id, user_id=actor_id)
 		if m is None:
 			raise ValueError(Errors.FORBIDDEN)
-		total = self.repo.count_by_group(db, group_id=group_id)
-		rows = self.repo.list_by_group_paginated(db, group_id=group_id, limit=limit, offset=offset)
+		scope = cursor_scope(CursorScopes.MEMBERSHIPS, group_id)
+		after = decode_cursor(cursor, scope) if cursor else None
+		total = self.repo.count_by_group(db, group_id=group_id) if after is None else None
+		rows, next_cursor = keyset_page(self.repo.list_by_group_paginated(db, group_id=group_id, limit=limit + 1, offset=offset, after=after), limit, scope)
 		items = [{Fields.ID: str(r.id), Keys.USER_ID: str(r.user_id), Fields.ROLE: r.role} for r in rows]
-		return {Keys.ITEMS: items, Keys.TOTAL: total}
+		return {Keys.ITEMS: items, Keys.TOTAL: total, Keys.NEXT_CURSOR: next_cursor}
 
 	def add(self, db: Session, *, group_id: str, actor_id: str, user_id: str, role: str = GroupRoles.MEMBER) -> Dict[str, Any]:
 		"""Add a user to a group (admin only)."""
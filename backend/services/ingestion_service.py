@@ -5,6 +5,7 @@ from typing import Dict, Any
 from backend.core.settings import get_settings
 from backend.core.constants import Keys
 from backend.core.constants import Defaults
+from backend.utils.uploads import ByteSource
 
 
 class IngestionService:
@@ -17,7 +18,7 @@ class IngestionService:
         temp_bucket: str,
         file_name: str,
         content_type: str,
-        content: bytes,
+        content: ByteSource,
     ) -> Dict[str, Any]:
         """
         Stub: In a real implementation, this would:
@@ -1,8 +1,9 @@
 """Invitations service: send/list/accept/decline invitations between users."""
 from __future__ import annotations
 
+import functools
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 import logging
 from sqlalchemy.orm import Session
 from sqlalchemy import select
@@ -17,9 +18,12 @@ from backend.core.constants import (
 	Errors,
 	LogEvents,
 )
-from backend.db.models import User, Invitation, RecipientCaregiverAccess
-from backend.repositories.interfaces import InvitationsRepo
+from backend.db.models import User, Invitation
+from backend.db.session import on_commit, release_connection, unit_of_work
+from backend.repositories.access_repo import AccessRepository
+from backend.repositories.interfaces import AccessRepo, InvitationsRepo
 from backend.repositories.invitations_repo import InvitationsRepository
+from backend.security.access_cache import invalidate_access_edge
 from backend.services.invite_signing import sign_invite, verify_invite
 from backend.services.email_service import send_invite_email
 
@@ -29,8 +33,9 @@ logger = logging.getLogger(__name__)
 
 class InvitationsService:
 	"""Service for managing invitations between caregivers and recipients."""
-	def __init__(self, repo: InvitationsRepo | None = None) -> None:
+	def __init__(self, repo: InvitationsRepo | None = None, access_repo: AccessRepo | None = None) -> None:
 		self.repo: InvitationsRepo = repo or InvitationsRepository()
+		self.access: AccessRepo = access_repo or AccessRepository()
 
 	def _sender(self, user: Optional[User]) -> Dict[str, Optional[str]]:
 		"""Shape sender metadata payload from a user."""
@@ -48,17 +53,31 @@ class InvitationsService:
 		except Exception:
 			return None
 
-	def _map_list_item(self, inv: Invitation, other: Optional[User]) -> Dict[str, Any]:
-		"""Map an invitation to list payload with optional counterparty."""
+	def _sender_from_row(self, row: Any) -> Dict[str, Optional[str]]:
+		"""Shape sender metadata from the projected sender columns of a list row."""
+		return {
+			Keys.SENDER_ID: str(row.sender_id) if row.sender_id else None,
+			Keys.SENDER_EMAIL: row.sender_email,
+			Keys.SENDER_FULL_NAME: row.sender_full_name,
+		}
+
+	def _map_list_item(self, inv: Invitation, sender: Dict[str, Optional[str]]) -> Dict[str, Any]:
+		"""Map an invitation to list payload with counterparty (sender) metadata."""
 		return {
 			Fields.ID: str(inv.id),
 			Keys.CAREGIVER_ID: str(inv.caregiver_id) if inv.caregiver_id else None,
 			Keys.RECIPIENT_ID: str(inv.recipient_id) if inv.recipient_id else None,
 			Keys.STATUS: inv.status,
 			Keys.SENT_BY: inv.sent_by,
-			**self._sender(other),
+			**sender,
 		}
 
+	def _total(self, items: List[Dict[str, Any]], limit: int | None, offset: int | None, count: Callable[[], int]) -> int:
+		"""Total matching rows; a short first page (or unpaginated list) is already complete, so skip COUNT(*)."""
+		if limit is None or (not offset and len(items) < limit):
+			return (offset or 0) + len(items)
+		return count()
+
 	def _map_created(self, inv: Invitation, sender: Optional[User], accept_url: Optional[str]) -> Dict[str, Any]:
 		"""Map an invitation create result with sender and accept URL."""
 		return {
@@ -95,6 +114,8 @@ class InvitationsService:
 			sent_by=Roles.CAREGIVER,
 		)
 		accept_url = self._accept_url({Keys.INVITATION_ID: str(inv.id), Fields.ROLE: Roles.RECIPIENT, Keys.RECIPIENT_ID: str(recipient.id) if recipient else None})
+		# Not needed during the SendGrid round trip
+		release_connection(db)
 		send_invite_email(to_email=str(email), accept_url=accept_url)
 		logger.info(LogEvents.INVITATION_SENT if hasattr(LogEvents, "INVITATION_SENT") else "invitation_sent", extra={Keys.INVITATION_ID: str(inv.id), Keys.SENDER_ROLE: Roles.CAREGIVER, Keys.SENDER_ID: str(caregiver.id)})
 		return self._map_created(inv, caregiver, accept_url)
@@ -114,6 +135,7 @@ class InvitationsService:
 			sent_by=Roles.RECIPIENT,
 		)
 		accept_url = self._accept_url({Keys.INVITATION_ID: str(inv.id), Fields.ROLE: Roles.CAREGIVER, Keys.CAREGIVER_ID: str(caregiver.id) if caregiver else None})
+		release_connection(db)
 		send_invite_email(to_email=str(email), accept_url=accept_url)
 		logger.info(LogEvents.INVITATION_SENT if hasattr(LogEvents, "INVITATION_SENT") else "invitation_sent", extra={Keys.INVITATION_ID: str(inv.id), Keys.SENDER_ROLE: Roles.RECIPIENT, Keys.SENDER_ID: str(recipient.id)})
 		return self._map_created(inv, recipient, accept_url)
@@ -123,16 +145,10 @@ class InvitationsService:
 		caregiver = db.scalar(select(User).where(User.id == caregiver_id))
 		if caregiver is None:
 			raise ValueError(Errors.USER_NOT_FOUND)
-		invites = self.repo.list_pending_for_caregiver(db, caregiver_id, caregiver.email)
-		items: List[Dict[str, Any]] = []
-		for inv in invites:
-			other = db.scalar(
-				select(User).where(User.id == (inv.caregiver_id if inv.sent_by == Roles.CAREGIVER else inv.recipient_id))
-			)
-			items.append(self._map_list_item(inv, other))
-		total = len(items)
-		if limit is not None and offset is not None:
-			items = items[offset : offset + limit]
+		# Sender fields come joined with each invitation; LIMIT/OFFSET and COUNT run in SQL
+		rows = self.repo.list_pending_for_caregiver(db, caregiver_id, caregiver.email, limit=limit, offset=offset)
+		items: List[Dict[str, Any]] = [self._map_list_item(row.Invitation, self._sender_from_row(row)) for row in rows]
+		total = self._total(items, limit, offset, lambda: self.repo.count_pending_for_caregiver(db, caregiver_id, caregiver.email))
 		return {Keys.ITEMS: items, Keys.TOTAL: total}
 
 	def list_for_recipient(self, db: Session, *, recipient_id: str, limit: int | None = None, offset: int | None = None) -> Dict[str, Any]:
@@ -140,16 +156,10 @@ class InvitationsService:
 		recipient = db.scalar(select(User).where(User.id == recipient_id))
 		if recipient is None:
 			raise ValueError(Errors.RECIPIENT_NOT_FOUND)
-		invites = self.repo.list_pending_for_recipient(db, recipient_id, recipient.email)
-		items: List[Dict[str, Any]] = []
-		for inv in invites:
-			other = db.scalar(
-				select(User).where(User.id == (inv.caregiver_id if inv.sent_by == Roles.CAREGIVER else inv.recipient_id))
-			)
-			items.append(self._map_list_item(inv, other))
-		total = len(items)
-		if limit is not None and offset is not None:
-			items = items[offset : offset + limit]
+		# Sender fields come joined with each invitation; LIMIT/OFFSET and COUNT run in SQL
+		rows = self.repo.list_pending_for_recipient(db, recipient_id, recipient.email, limit=limit, offset=offset)
+		items: List[Dict[str, Any]] = [self._map_list_item(row.Invitation, self._sender_from_row(row)) for row in rows]
+		total = self._total(items, limit, offset, lambda: self.repo.count_pending_for_recipient(db, recipient_id, recipient.email))
 		return {Keys.ITEMS: items, Keys.TOTAL: total}
 
 	def list_sent_by_recipient(self, db: Session, *, recipient_id: str, limit: int | None = None, offset: int | None = None) -> Dict[str, Any]:
@@ -157,17 +167,10 @@ class InvitationsService:
 		recipient = db.scalar(select(User).where(User.id == recipient_id))
 		if recipient is None:
 			raise ValueError(Errors.RECIPIENT_NOT_FOUND)
-		invs = db.scalars(
-			select(Invitation).where(
-				Invitation.recipient_id == recipient_id,
-				Invitation.status == InvitationStatus.PENDING,
-				Invitation.sent_by == Roles.RECIPIENT,
-			)
-		).all()
-		items = [self._map_list_item(i, recipient) for i in invs]
-		total = len(items)
-		if limit is not None and offset is not None:
-			items = items[offset : offset + limit]
+		invs = self.repo.list_pending_sent_by_recipient(db, recipient_id, limit=limit, offset=offset)
+		sender = self._sender(recipient)
+		items = [self._map_list_item(i, sender) for i in invs]
+		total = self._total(items, limit, offset, lambda: self.repo.count_pending_sent_by_recipient(db, recipient_id))
 		return {Keys.ITEMS: items, Keys.TOTAL: total}
 
 	def caregiver_accept(self, db: Session, *, caregiver_id: str, invitation_id: str) -> Dict[str, Any]:
@@ -183,11 +186,11 @@ class InvitationsService:
 		)
 		if invitation is None:
 			raise ValueError(Errors.USER_NOT_FOUND)
-		invitation.status = InvitationStatus.ACCEPTED
-		access = RecipientCaregiverAccess(recipient_id=invitation.recipient_id, caregiver_id=invitation.caregiver_id)
-		db.add(access)
-		db.commit()
-		db.refresh(invitation)
+		with unit_of_work(db):
+			invitation.status = InvitationStatus.ACCEPTED
+			# Idempotent: re-accepting for an existing pair keeps the one edge
+			self.access.ensure(db, recipient_id=invitation.recipient_id, caregiver_id=invitation.caregiver_id)
+			on_commit(db, functools.partial(invalidate_access_edge, invitation.caregiver_id, invitation.recipient_id))
 		logger.info(LogEvents.INVITATION_ACCEPTED if hasattr(LogEvents, "INVITATION_ACCEPTED") else "invitation_accepted", extra={Keys.INVITATION_ID: invitation_id, Fields.ROLE: Roles.CAREGIVER, Keys.ACTOR_ID: caregiver_id})
 		return self._map_action(Messages.INVITATION_ACCEPTED, invitation_id=invitation_id, caregiver_id=str(caregiver_id))
 
@@ -225,13 +228,12 @@ class InvitationsService:
 		)
 		if invitation is None:
 			raise ValueError(Errors.USER_NOT_FOUND)
-		invitation.status = InvitationStatus.ACCEPTED
-		if invitation.recipient_id is None:
-			invitation.recipient_id = user.id
-		access = RecipientCaregiverAccess(recipient_id=invitation.recipient_id, caregiver_id=invitation.caregiver_id)
-		db.add(access)
-		db.commit()
-		db.refresh(invitation)
+		with unit_of_work(db):
+			invitation.status = InvitationStatus.ACCEPTED
+			if invitation.recipient_id is None:
+				invitation.recipient_id = user.id
+			self.access.ensure(db, recipient_id=invitation.recipient_id, caregiver_id=invitation.caregiver_id)
+			on_commit(db, functools.partial(invalidate_access_edge, invitation.caregiver_id, invitation.recipient_id))
 		logger.info(LogEvents.INVITATION_ACCEPTED if hasattr(LogEvents, "INVITATION_ACCEPTED") else "invitation_accepted", extra={Keys.INVITATION_ID: invitation_id, Fields.ROLE: Roles.RECIPIENT, Keys.ACTOR_ID: recipient_id})
 		return self._map_action(Messages.INVITATION_ACCEPTED, invitation_id=invitation_id, recipient_id=str(recipient_id))
 
@@ -279,11 +281,11 @@ class InvitationsService:
 			raise ValueError(Errors.RECIPIENT_NOT_REGISTERED)
 		if role == Roles.CAREGIVER and inv.caregiver_id is None:
 			raise ValueError(Errors.CAREGIVER_NOT_REGISTERED)
-		# Accept and create access edge
-		self.repo.set_status(db, inv, InvitationStatus.ACCEPTED)
-		access = RecipientCaregiverAccess(recipient_id=inv.recipient_id, caregiver_id=inv.caregiver_id)
-		db.add(access)
-		db.commit()
+		# Accept and create access edge in one commit
+		with unit_of_work(db):
+			self.repo.set_status(db, inv, InvitationStatus.ACCEPTED)
+			self.access.ensure(db, recipient_id=inv.recipient_id, caregiver_id=inv.caregiver_id)
+			on_commit(db, functools.partial(invalidate_access_edge, inv.caregiver_id, inv.recipient_id))
 		logger.info(LogEvents.INVITATION_ACCEPTED if hasattr(LogEvents, "INVITATION_ACCEPTED") else "invitation_accepted", extra={Keys.INVITATION_ID: str(inv.id), Fields.ROLE: role})
 		return self._map_action(Messages.INVITATION_ACCEPTED, invitation_id=str(inv.id))
 
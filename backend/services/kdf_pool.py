@@ -0,0 +1,116 @@
+"""
+Bounded executor for password hashing (KDF) work.
+
+A PBKDF2 hash at 100k iterations is tens of milliseconds of CPU. Run inline
+in a request it stalls the event loop (db_mode=sync/async) or holds a DB
+worker thread (threadpool). Signup, login, password change and member
+auto-creation await their hashes here instead. At most ``kdf_workers`` hashes
+run at once and ``kdf_queue_limit`` more may wait; beyond that callers get
+ServiceUnavailableError (503 + Retry-After) immediately instead of queueing
+behind a login storm. Closed on app shutdown.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from backend.core.constants import Auth as AuthConst, Errors, Kdf, MetricNames
+from backend.core.exceptions import ServiceUnavailableError
+from backend.core.metrics import metrics
+from backend.core.settings import get_settings
+from backend.security.passwords import hash_password, needs_rehash, verify_password
+
+
+T = TypeVar("T")
+
+
+class KdfPool:
+    """Executor plus an admission limit of workers + queue_limit outstanding jobs."""
+
+    def __init__(self, executor: Executor, *, workers: int, queue_limit: int) -> None:
+        self.executor = executor
+        self.capacity = max(1, workers) + max(0, queue_limit)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "KdfPool":
+        settings = get_settings()
+        workers = max(1, int(settings.kdf_workers or Kdf.DEFAULT_WORKERS))
+        if (settings.kdf_executor or Kdf.EXECUTOR_THREAD).lower() == Kdf.EXECUTOR_PROCESS:
+            executor: Executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=Kdf.THREAD_NAME_PREFIX)
+        return cls(executor, workers=workers, queue_limit=int(settings.kdf_queue_limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(*args) on the pool; raises ServiceUnavailableError when the queue is full."""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                metrics.inc(MetricNames.KDF_REJECTED)
+                raise ServiceUnavailableError(Errors.AUTH_BUSY, retry_after=Kdf.RETRY_AFTER_SECONDS)
+            self._in_flight += 1
+            metrics.set_gauge(MetricNames.KDF_IN_FLIGHT, self._in_flight)
+        try:
+            future = self.executor.submit(functools.partial(fn, *args))
+        except BaseException:
+            self._release()
+            raise
+        # Slot is held until the hash finishes, even if the awaiting request is cancelled
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _: Optional[Future] = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            metrics.set_gauge(MetricNames.KDF_IN_FLIGHT, self._in_flight)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False)
+
+
+_pool: Optional[KdfPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_kdf_pool() -> KdfPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = KdfPool.from_settings()
+    return _pool
+
+
+def shutdown_kdf_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.close()
+    _pool = None
+
+
+async def hash_password_async(password: str) -> str:
+    return await get_kdf_pool().run(hash_password, password)
+
+
+async def verify_password_async(password: str, encoded: Optional[str]) -> bool:
+    # Unusable/missing hashes can never match; don't spend a KDF slot on them
+    if not encoded or encoded.startswith(AuthConst.PASSWORD_UNUSABLE_PREFIX):
+        return False
+    return await get_kdf_pool().run(verify_password, password, encoded)
+
+
+async def rehash_if_needed(password: str, encoded: Optional[str]) -> Optional[str]:
+    """After a successful verify: a hash under the current KDF policy, or None if current (or the pool is busy)."""
+    if not needs_rehash(encoded):
+        return None
+    try:
+        return await hash_password_async(password)
+    except ServiceUnavailableError:
+        # Opportunistic; the next login retries
+        return None
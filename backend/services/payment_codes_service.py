@@ -8,10 +8,11 @@ import logging
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 
-from backend.core.constants import Errors, Keys, Messages, GroupRoles, PaymentCodeStatus, LogEvents, PaymentCodes
+from backend.core.constants import Errors, Keys, Messages, GroupRoles, PaymentCodeStatus, LogEvents, PaymentCodes, CursorScopes
 from backend.repositories.payment_codes_repo import PaymentCodesRepository
 from backend.repositories.group_memberships_repo import GroupMembershipsRepository
 from backend.repositories.groups_repo import GroupsRepository
+from backend.utils.pagination import cursor_scope, decode_cursor, keyset_page
 
 
 class PaymentCodesService:
@@ -49,18 +50,21 @@ class PaymentCodesService:
 		self.logger.info(LogEvents.PAYMENT_CODE_CREATED, extra={Keys.GROUP_ID: group_id, Keys.ACTOR_ID: actor_id, Keys.CODE: code})
 		return {Keys.CODE: row.code, Keys.STATUS: row.status, Keys.EXPIRES_AT: row.expires_at}
 
-	def list_codes(self, db: Session, *, group_id: str, actor_id: str, limit: int | None = None, offset: int | None = None) -> Dict[str, Any]:
-		"""List payment codes for a group, optionally paginated."""
+	def list_codes(self, db: Session, *, group_id: str, actor_id: str, limit: int | None = None, offset: int | None = None, cursor: Optional[str] = None) -> Dict[str, Any]:
+		"""List payment codes for a group, optionally paginated (offset or `cursor` from next_cursor)."""
 		self._ensure_admin(db, group_id=group_id, actor_id=actor_id)
+		next_cursor: Optional[str] = None
 		# pagination (optional)
 		if limit is not None and offset is not None:
-			total = self.repo.count_for_group(db, group_id=group_id)
-			rows = self.repo.list_for_group_paginated(db, group_id=group_id, limit=limit, offset=offset)
+			scope = cursor_scope(CursorScopes.PAYMENT_CODES, group_id)
+			after = decode_cursor(cursor, scope) if cursor else None
+			total = self.repo.count_for_group(db, group_id=group_id) if after is None else None
+			rows, next_cursor = keyset_page(self.repo.list_for_group_paginated(db, group_id=group_id, limit=limit + 1, offset=offset, after=after), limit, scope)
 		else:
 			rows = self.repo.list_for_group(db, group_id=group_id)
 			total = len(rows)
 		items = [{Keys.CODE: r.code, Keys.STATUS: r.status, Keys.EXPIRES_AT: r.expires_at, Keys.REDEEMED_BY: str(r.redeemed_by) if r.redeemed_by else None} for r in rows]
-		return {Keys.ITEMS: items, Keys.TOTAL: total}
+		return {Keys.ITEMS: items, Keys.TOTAL: total, Keys.NEXT_CURSOR: next_cursor}
 
 	def void_code(self, db: Session, *, group_id: str, actor_id: str, code: str) -> Dict[str, Any]:
 		"""Void a payment code (admin only)."""
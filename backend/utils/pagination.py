@@ -1,7 +1,22 @@
 from __future__ import annotations
 
-from typing import Tuple
-from backend.core.constants import Pagination as PaginationConsts
+import base64
+import hashlib
+import hmac
+import json
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import Select, tuple_
+
+from backend.core.constants import Errors, Pagination as PaginationConsts
+from backend.core.settings import get_settings
+
+T = TypeVar("T")
+
+# Last row seen on the previous page: (created_at, id)
+CursorKey = Tuple[datetime, uuid.UUID]
 
 
 def clamp_limit_offset(limit: int, offset: int, *, max_limit: int = 100) -> Tuple[int, int]:
@@ -15,3 +30,61 @@ def clamp_limit_offset(limit: int, offset: int, *, max_limit: int = 100) -> Tupl
 	return limit, offset
 
 
+def _b64url(data: bytes) -> str:
+	return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _unb64url(data: str) -> bytes:
+	return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _cursor_sig(scope: str, body: bytes) -> bytes:
+	# Scope (list name + parent id) is signed, not stored: a cursor only replays against the list that issued it
+	secret = get_settings().pagination_cursor_secret.encode("utf-8")
+	return hmac.new(secret, scope.encode("utf-8") + b"|" + body, hashlib.sha256).digest()[: PaginationConsts.CURSOR_SIG_BYTES]
+
+
+def encode_cursor(scope: str, created_at: datetime, row_id: Any) -> str:
+	"""Opaque signed cursor pointing just past (created_at, id)."""
+	body = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":")).encode("utf-8")
+	return f"{_b64url(body)}.{_b64url(_cursor_sig(scope, body))}"
+
+
+def decode_cursor(cursor: str, scope: str) -> CursorKey:
+	"""Verify and unpack a cursor issued for `scope`. Raises ValueError(Errors.INVALID_CURSOR)."""
+	try:
+		body_b64, sig_b64 = cursor.split(".", 1)
+		body = _unb64url(body_b64)
+		if not hmac.compare_digest(_unb64url(sig_b64), _cursor_sig(scope, body)):
+			raise ValueError(Errors.INVALID_CURSOR)
+		created_at, row_id = json.loads(body)
+		return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+	except (ValueError, TypeError) as e:
+		raise ValueError(Errors.INVALID_CURSOR) from e
+
+
+def cursor_scope(name: str, parent_id: Any = None) -> str:
+	return name if parent_id is None else f"{name}:{parent_id}"
+
+
+def seek(stmt: Select, created_col: Any, id_col: Any, *, limit: int, offset: int, after: Optional[CursorKey] = None) -> Select:
+	"""
+	Order by (created_at, id) and page: seek past `after` (index range scan, constant cost per page)
+	when a cursor is given, else LIMIT/OFFSET.
+	"""
+	stmt = stmt.order_by(created_col, id_col).limit(limit)
+	if after is not None:
+		return stmt.where(tuple_(created_col, id_col) > tuple_(*after))
+	return stmt.offset(offset) if offset else stmt
+
+
+def keyset_page(rows: Sequence[T], limit: int, scope: str) -> Tuple[List[T], Optional[str]]:
+	"""
+	Trim rows fetched with limit + 1 to one page; next_cursor is set only when another page exists.
+	Rows must expose created_at and id.
+	"""
+	page = list(rows[:limit])
+	if len(rows) <= limit or not page:
+		return page, None
+	last = page[-1]
+	return page, encode_cursor(scope, last.created_at, last.id)
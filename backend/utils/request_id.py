@@ -0,0 +1,42 @@
+"""
+Request-id propagation as pure ASGI middleware.
+
+Takes X-Request-Id from the request (or generates a uuid4), exposes it as
+``request.state.request_id`` and adds it to the response start message. It
+never touches the body, so streaming responses pass through chunk by chunk
+and there is no extra task or memory stream per request, unlike
+``BaseHTTPMiddleware``. New cross-cutting middleware should follow the same
+shape (see also ``UploadSizeLimitMiddleware``).
+"""
+from __future__ import annotations
+
+import uuid
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.core.constants import Headers
+
+_HEADER = Headers.REQUEST_ID.lower().encode("latin-1")
+
+
+class RequestIdMiddleware:
+	def __init__(self, app: ASGIApp) -> None:
+		self.app = app
+
+	async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+		if scope["type"] != "http":
+			await self.app(scope, receive, send)
+			return
+		raw = next((value for name, value in scope["headers"] if name == _HEADER), None)
+		raw = raw or str(uuid.uuid4()).encode("latin-1")
+		# Same dict Request.state reads, so handlers and exception handlers see it
+		scope.setdefault("state", {})["request_id"] = raw.decode("latin-1")
+
+		async def send_with_request_id(message: Message) -> None:
+			if message["type"] == "http.response.start":
+				headers = [(name, value) for name, value in message.get("headers", ()) if name != _HEADER]
+				headers.append((_HEADER, raw))
+				message["headers"] = headers
+			await send(message)
+
+		await self.app(scope, receive, send_with_request_id)
@@ -0,0 +1,136 @@
+"""
+Streaming upload helpers.
+
+- ``UploadSizeLimitMiddleware`` (pure ASGI) rejects oversized multipart bodies
+  with 413 before they are parsed: immediately from Content-Length, or as
+  soon as the streamed body crosses the limit (chunked uploads).
+- ``open_upload`` exposes the file Starlette already spooled (memory up to
+  1 MB, then a temp file) as a read-only buffer view (memoryview / mmap), so
+  handlers and downstream services never copy the whole upload into a new
+  ``bytes`` object.
+"""
+from __future__ import annotations
+
+import io
+import mmap
+import os
+from typing import Any, Awaitable, Callable, MutableMapping, Optional, Union
+
+from fastapi import HTTPException, UploadFile, status
+from starlette.responses import JSONResponse
+
+from backend.core.constants import Errors, Upload
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+# Raw upload content: bytes, or a zero-copy view over the spooled upload
+ByteSource = Union[bytes, memoryview]
+
+
+def max_upload_bytes() -> int:
+	return int(Upload.MAX_UPLOAD_MB) * Upload.BYTES_PER_MB
+
+
+class UploadSizeLimitMiddleware:
+	"""Cap multipart request bodies at ``max_body_bytes`` (file limit + form overhead)."""
+
+	def __init__(self, app: Callable[..., Awaitable[None]], max_body_bytes: Optional[int] = None) -> None:
+		self.app = app
+		self.max_body_bytes = max_body_bytes if max_body_bytes is not None else max_upload_bytes() + Upload.MULTIPART_OVERHEAD_BYTES
+
+	async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+		if scope["type"] != "http" or not self._is_multipart(scope):
+			await self.app(scope, receive, send)
+			return
+		declared = self._content_length(scope)
+		if declared is not None and declared > self.max_body_bytes:
+			# Reject before reading a single body chunk
+			await self._reject(scope, receive, send)
+			return
+		limit = self.max_body_bytes
+		received = 0
+
+		async def limited_receive() -> Message:
+			nonlocal received
+			message = await receive()
+			if message["type"] == "http.request":
+				received += len(message.get("body", b""))
+				if received > limit:
+					# Re-raised by FastAPI's body parsing; rendered as 413
+					raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=Errors.PAYLOAD_TOO_LARGE)
+			return message
+
+		await self.app(scope, limited_receive, send)
+
+	@staticmethod
+	def _is_multipart(scope: Scope) -> bool:
+		for name, value in scope.get("headers") or []:
+			if name == b"content-type":
+				return value.lower().startswith(b"multipart/form-data")
+		return False
+
+	@staticmethod
+	def _content_length(scope: Scope) -> Optional[int]:
+		for name, value in scope.get("headers") or []:
+			if name == b"content-length":
+				try:
+					return int(value)
+				except ValueError:
+					return None
+		return None
+
+	@staticmethod
+	async def _reject(scope: Scope, receive: Receive, send: Send) -> None:
+		response = JSONResponse(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, content={"detail": Errors.PAYLOAD_TOO_LARGE}, headers={"Connection": "close"})
+		await response(scope, receive, send)
+
+
+class UploadView:
+	"""Read-only buffer over a spooled upload; release with close() (or use as a context manager)."""
+
+	def __init__(self, file: UploadFile) -> None:
+		spooled = file.file
+		spooled.seek(0, os.SEEK_END)
+		self.size = spooled.tell()
+		spooled.seek(0)
+		self._mmap: Optional[mmap.mmap] = None
+		self.data: memoryview
+		# SpooledTemporaryFile keeps small uploads in a BytesIO; fileno() would force a rollover to disk
+		inner = getattr(spooled, "_file", spooled)
+		if self.size == 0:
+			self.data = memoryview(b"")
+		elif isinstance(inner, io.BytesIO):
+			self.data = inner.getbuffer().toreadonly()
+		else:
+			self._mmap = mmap.mmap(inner.fileno(), 0, access=mmap.ACCESS_READ)
+			self.data = memoryview(self._mmap)
+
+	def close(self) -> None:
+		# Views must be released before the spooled file or mmap can be closed
+		self.data.release()
+		if self._mmap is not None:
+			self._mmap.close()
+			self._mmap = None
+
+	def __enter__(self) -> "UploadView":
+		return self
+
+	def __exit__(self, *exc: Any) -> None:
+		self.close()
+
+
+def open_upload(file: UploadFile, max_bytes: Optional[int] = None) -> UploadView:
+	"""Buffer view over an upload; 413 when it exceeds max_bytes (default Upload.MAX_UPLOAD_MB)."""
+	view = UploadView(file)
+	if view.size > (max_bytes if max_bytes is not None else max_upload_bytes()):
+		view.close()
+		raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=Errors.PAYLOAD_TOO_LARGE)
+	return view
+
+
+def content_changed(original: ByteSource, result: ByteSource) -> bool:
+	"""True when a pipeline stage produced different bytes (identity short-circuits the compare)."""
+	return result is not original and result != original
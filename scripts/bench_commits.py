@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Commits and SQL statements per request for the multi-write flows:
+group-account signup, group create, dependent convert, caregiver invitation
+accept (token) and group member invite accept (token). Each flow runs ROUNDS
+times on freshly seeded rows; the table reports the average per call and
+checks that every flow leaves its rows committed.
+"before" is each flow's write sequence as it was before unit_of_work (a
+commit, and usually a refresh, after every write; kept here as the
+baseline), "after" the current services. Both run the same reads against the
+same repositories, so only the transaction boundaries differ.
+Usage: python scripts/bench_commits.py [database_url] [--rounds 20]
+Defaults to in-memory SQLite: JSONB columns are rendered as JSON and string
+UUID parameters are coerced, as Postgres does. Against Postgres, point it at a
+scratch database; it creates the tables if missing and leaves the rows behind.
+"""
+import argparse
+import sys
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine, event, func, select  # noqa: E402
+from sqlalchemy.dialects.postgresql import JSONB  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlalchemy.sql import sqltypes  # noqa: E402
+
+from backend.core.constants import Fields, GroupRoles, InvitationStatus, Keys, Roles, TokenTypes  # noqa: E402
+from backend.db.models import Base, Dependent, Group, GroupMemberInvite, GroupMembership, Invitation, RecipientCaregiverAccess, User  # noqa: E402
+from backend.schemas.common import InvitationStatus as InviteStatus  # noqa: E402
+from backend.security.access_cache import invalidate_access_edge  # noqa: E402
+from backend.security.passwords import unusable_password_hash  # noqa: E402
+from backend.services.auth_service import AuthService, issue_token  # noqa: E402
+from backend.services.dependents_service import DependentsService  # noqa: E402
+from backend.services.group_member_invites_service import GroupMemberInvitesService  # noqa: E402
+from backend.services.groups_service import GroupsService  # noqa: E402
+from backend.services.invitations_service import InvitationsService  # noqa: E402
+from backend.services.invite_signing import sign_invite, verify_invite  # noqa: E402
+from backend.services.utils import ensure_admin_or_guardian  # noqa: E402
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_sqlite(type_, compiler, **kw):
+	return "JSON"
+
+
+def _coerce_uuid_strings() -> None:
+	# Services pass ids as str; Postgres casts them, SQLite's non-native UUID wants uuid.UUID
+	bind_processor = sqltypes.Uuid.bind_processor
+
+	def coercing(self, dialect):
+		process = bind_processor(self, dialect)
+		if process is None or dialect.name != "sqlite":
+			return process
+		return lambda value: process(uuid.UUID(value) if isinstance(value, str) else value)
+
+	sqltypes.Uuid.bind_processor = coercing
+
+
+class Counter:
+	def __init__(self, engine) -> None:
+		self.commits = 0
+		self.statements = 0
+		event.listen(engine, "commit", self._on_commit)
+		event.listen(engine, "before_cursor_execute", self._on_execute)
+
+	def _on_commit(self, *args) -> None:
+		self.commits += 1
+
+	def _on_execute(self, *args) -> None:
+		self.statements += 1
+
+
+def _email(prefix: str) -> str:
+	return f"{prefix}-{uuid.uuid4().hex[:10]}@example.com"
+
+
+def _user(db: Session, role: str = Roles.CAREGIVER) -> User:
+	email = _email("u")
+	user = User(id=uuid.uuid4(), username=email, email=email, role=role, password_hash="x", corpus_uri="")
+	db.add(user)
+	return user
+
+
+def _group(db: Session, admin: User) -> Group:
+	group = Group(id=uuid.uuid4(), name="bench", created_by=admin.id)
+	db.add(group)
+	db.flush()
+	db.add(GroupMembership(group_id=group.id, user_id=admin.id, role=GroupRoles.ADMIN))
+	return group
+
+
+# Each flow: seed(db) -> args, then call(db, args) (current) or before(db, args) (baseline);
+# only the call is measured
+def _signup() -> Tuple[Callable, Callable, Callable]:
+	def seed(db: Session) -> Dict:
+		return {"email": _email("signup")}
+
+	def call(db: Session, args: Dict) -> None:
+		AuthService().signup(
+			db, username=args["email"], email=args["email"], password_hash="x", role=Roles.CAREGIVER, full_name="Bench",
+			phone_number=None, age=None, country=None, avatar_uri=None, corpus_uri="", chat_history_uri=None, account_type="group",
+		)
+
+	def before(db: Session, args: Dict) -> None:
+		email = args["email"]
+		for column in (User.username, User.email):
+			assert db.scalar(select(User).where(column == email)) is None
+		user = User(username=email, email=email, password_hash="x", role=Roles.CAREGIVER, full_name="Bench", corpus_uri="", account_type="group")
+		db.add(user)
+		db.commit()
+		db.refresh(user)
+		group = Group(name="Bench's Group", description=None, created_by=user.id)
+		db.add(group)
+		db.commit()
+		db.refresh(group)
+		user.group_id = group.id
+		db.add(user)
+		db.commit()
+		db.add(GroupMembership(group_id=group.id, user_id=user.id, role=GroupRoles.ADMIN))
+		db.commit()
+		issue_token(str(user.id))
+	return seed, call, before
+
+
+def _group_create() -> Tuple[Callable, Callable, Callable]:
+	def seed(db: Session) -> Dict:
+		return {"admin": _user(db)}
+
+	def call(db: Session, args: Dict) -> None:
+		GroupsService().create(db, name="bench", description=None, created_by=str(args["admin"].id))
+
+	def before(db: Session, args: Dict) -> None:
+		admin_id = str(args["admin"].id)
+		# GroupsRepository.create committed the group, then the admin membership
+		group = Group(name="bench", description=None, created_by=admin_id)
+		db.add(group)
+		db.commit()
+		db.refresh(group)
+		db.add(GroupMembership(group_id=group.id, user_id=admin_id, role=GroupRoles.ADMIN))
+		db.commit()
+		GroupsService().members_repo.add(db, group_id=str(group.id), user_id=admin_id, role=GroupRoles.ADMIN)
+	return seed, call, before
+
+
+def _dependent_convert() -> Tuple[Callable, Callable, Callable]:
+	def seed(db: Session) -> Dict:
+		admin = _user(db)
+		group = _group(db, admin)
+		dependent = Dependent(id=uuid.uuid4(), group_id=group.id, guardian_user_id=admin.id, full_name="Dep", email=_email("dep"))
+		db.add(dependent)
+		return {"admin": admin, "group": group, "dependent": dependent}
+
+	def call(db: Session, args: Dict) -> None:
+		DependentsService().convert_to_account(
+			db, group_id=str(args["group"].id), actor_id=str(args["admin"].id), dependent_id=str(args["dependent"].id), email=None, password_hash="x",
+		)
+
+	def before(db: Session, args: Dict) -> None:
+		service, group_id = DependentsService(), str(args["group"].id)
+		row = service.repo.get(db, dependent_id=str(args["dependent"].id))
+		ensure_admin_or_guardian(service.memberships, db, group_id=group_id, actor_id=str(args["admin"].id), guardian_user_id=str(row.guardian_user_id))
+		email = row.email.strip().lower()
+		assert db.scalar(select(User).where(User.email == email)) is None
+		user = User(username=email, email=email, password_hash="x", role=Roles.CAREGIVER, full_name=row.full_name, corpus_uri=f"user://{email}/corpus")
+		db.add(user)
+		db.commit()
+		db.refresh(user)
+		service.memberships.add(db, group_id=group_id, user_id=str(user.id), role=GroupRoles.MEMBER)
+		service.repo.soft_delete(db, dependent=row)
+	return seed, call, before
+
+
+def _invitation_accept() -> Tuple[Callable, Callable, Callable]:
+	def seed(db: Session) -> Dict:
+		caregiver, recipient = _user(db), _user(db, Roles.RECIPIENT)
+		invitation = Invitation(id=uuid.uuid4(), caregiver_id=caregiver.id, recipient_id=recipient.id, status=InvitationStatus.PENDING, sent_by=Roles.CAREGIVER)
+		db.add(invitation)
+		return {"token": sign_invite({Keys.INVITATION_ID: str(invitation.id), Fields.ROLE: Roles.RECIPIENT})}
+
+	def call(db: Session, args: Dict) -> None:
+		InvitationsService().accept_by_token(db, token=args["token"])
+
+	def before(db: Session, args: Dict) -> None:
+		service = InvitationsService()
+		inv = service.repo.get_pending_by_id(db, uuid.UUID(verify_invite(args["token"])[Keys.INVITATION_ID]))
+		service.repo.set_status(db, inv, InvitationStatus.ACCEPTED)
+		service.access.ensure(db, recipient_id=inv.recipient_id, caregiver_id=inv.caregiver_id)
+		db.commit()
+		invalidate_access_edge(inv.caregiver_id, inv.recipient_id)
+	return seed, call, before
+
+
+def _group_invite_accept() -> Tuple[Callable, Callable, Callable]:
+	def seed(db: Session) -> Dict:
+		admin = _user(db)
+		group = _group(db, admin)
+		email = _email("invitee")
+		invite = GroupMemberInvite(id=uuid.uuid4(), group_id=group.id, invited_email=email, invited_by=admin.id)
+		db.add(invite)
+		payload = {Keys.INVITATION_ID: str(invite.id), Keys.GROUP_ID: str(group.id), Fields.EMAIL: email, Keys.TYPE: TokenTypes.GROUP_MEMBER}
+		return {"token": sign_invite(payload)}
+
+	def call(db: Session, args: Dict) -> None:
+		GroupMemberInvitesService().accept_by_token(db, token=args["token"])
+
+	def before(db: Session, args: Dict) -> None:
+		service, data = GroupMemberInvitesService(), verify_invite(args["token"])
+		group_id, email = data[Keys.GROUP_ID], data[Fields.EMAIL]
+		invite = service.repo.get(db, invite_id=data[Keys.INVITATION_ID])
+		assert db.scalar(select(Group).where(Group.id == group_id)) is not None
+		assert db.scalar(select(User).where(User.email == email)) is None
+		user = User(
+			username=email, email=email, password_hash=unusable_password_hash(), role=Roles.CAREGIVER,
+			full_name=invite.invited_full_name, corpus_uri=f"user://{email}/corpus",
+		)
+		db.add(user)
+		db.commit()
+		db.refresh(user)
+		service.memberships.add(db, group_id=str(group_id), user_id=str(user.id), role=GroupRoles.MEMBER)
+		service.repo.set_status(db, invite=invite, status=InviteStatus.accepted.value)
+	return seed, call, before
+
+
+FLOWS = (
+	("signup (group account)", _signup, User),
+	("group create", _group_create, Group),
+	("dependent convert", _dependent_convert, GroupMembership),
+	("invitation accept (token)", _invitation_accept, RecipientCaregiverAccess),
+	("group invite accept (token)", _group_invite_accept, GroupMembership),
+)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("database_url", nargs="?", default="sqlite://")
+	parser.add_argument("--rounds", type=int, default=20)
+	args = parser.parse_args()
+
+	if args.database_url.startswith("sqlite"):
+		_coerce_uuid_strings()
+		engine = create_engine(args.database_url, poolclass=StaticPool, connect_args={"check_same_thread": False})
+	else:
+		engine = create_engine(args.database_url)
+	Base.metadata.create_all(engine)
+	factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+	counter = Counter(engine)
+
+	def measure(seed: Callable, call: Callable, model, rounds: int) -> Tuple[float, float]:
+		commits = statements = 0
+		with factory() as db:
+			before = db.scalar(select(func.count()).select_from(model))
+		for _ in range(rounds):
+			with factory() as db:
+				flow_args = seed(db)
+				db.commit()
+				counter.commits = counter.statements = 0
+				call(db, flow_args)
+				commits += counter.commits
+				statements += counter.statements
+		with factory() as db:
+			after = db.scalar(select(func.count()).select_from(model))
+		assert after > before, f"{call.__qualname__}: nothing committed"
+		return commits / rounds, statements / rounds
+
+	rows: List[Tuple[str, Tuple[float, float], Tuple[float, float]]] = []
+	for name, flow, model in FLOWS:
+		seed, call, before = flow()
+		rows.append((name, measure(seed, before, model, args.rounds), measure(seed, call, model, args.rounds)))
+
+	print(f"{'flow':<30} {'commits before -> after':<26} statements before -> after")
+	for name, (commits_before, statements_before), (commits_after, statements_after) in rows:
+		print(f"{name:<30} {commits_before:>14.1f} -> {commits_after:<8.1f} {statements_before:>17.1f} -> {statements_after:.1f}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark DLP redaction providers against the sample corpus.
+Inputs:
+  - samples/text/*.txt (text/plain)
+  - samples/images/*.png (image/png)
+Runs the local provider always and the Google provider when it is ready
+(ENABLE_DLP, GCP_PROJECT_ID and credentials set). Calls providers directly,
+so the result cache and pre-filter are not involved.
+Then times the local scanner on 1 MB and 2 MB of adversarial text ('a@'
+repeated, '@handle' text, digit runs) next to plain prose, and fails if
+doubling the input more than triples the time (a quadratic pass).
+Also checks that single-call finding alignment (align_findings) returns the
+right quotes, and none when the split between tokens is ambiguous.
+Usage: python scripts/bench_dlp_providers.py [iterations]
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from backend.core.constants import MimeTypes  # noqa: E402
+from backend.services.dlp_google import GoogleDlpProvider, align_findings  # noqa: E402
+from backend.services.dlp_local import LocalDlpProvider, LocalPiiScanner  # noqa: E402
+from backend.services.dlp_templates import get_dlp_templates  # noqa: E402
+
+SAMPLES = ROOT / "samples"
+SCAN_INPUTS = (
+    ("prose", "lorem ipsum dolor sit amet, consectetur adipiscing elit "),
+    ("a@", "a@"),
+    ("@handle", "ping @handle and @bob.smith about it "),
+    ("emails", "mail jane.doe@example.com today "),
+    ("digits", "1"),
+)
+SCAN_SIZES = (1_000_000, 2_000_000)
+# (original, redacted, per-type counts, expected quotes or None when ambiguous)
+ALIGN_CASES = (
+    ("Mail a@b.com or call 555-123-4567.", "Mail [EMAIL_ADDRESS] or call [PHONE_NUMBER].", {"EMAIL_ADDRESS": 1, "PHONE_NUMBER": 1}, ["a@b.com", "555-123-4567"]),
+    ("Call (555) 123-4567 a@b.com now", "Call [PHONE_NUMBER] [EMAIL_ADDRESS] now", {"PHONE_NUMBER": 1, "EMAIL_ADDRESS": 1}, None),
+    ("DOB March 3, 2001 555-123-4567", "DOB [DATE_OF_BIRTH] [PHONE_NUMBER]", {"DATE_OF_BIRTH": 1, "PHONE_NUMBER": 1}, None),
+)
+
+
+def corpus():
+    for path in sorted((SAMPLES / "text").glob("*.txt")):
+        yield path.name, path.read_bytes(), MimeTypes.TEXT_PLAIN
+    for path in sorted((SAMPLES / "images").glob("*.png")):
+        yield path.name, path.read_bytes(), MimeTypes.IMAGE_PNG
+
+
+def bench(provider, iterations):
+    templates = get_dlp_templates()
+    for name, content, mime in corpus():
+        timings = []
+        redacted, findings = content, []
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            redacted, findings = provider.redact(templates, content, mime)
+            timings.append((time.perf_counter() - t0) * 1000)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        types = sorted({f["info_type"] for f in findings})
+        print(
+            f"{provider.name:<7} {name:<18} p50={statistics.median(timings):8.3f}ms p95={p95:8.3f}ms "
+            f"changed={redacted != content!s:<5} findings={len(findings)} {','.join(types)}"
+        )
+
+
+def bench_scanner():
+    scanner = LocalPiiScanner()
+    for name, unit in SCAN_INPUTS:
+        timings = []
+        for size in SCAN_SIZES:
+            text = (unit * (size // len(unit) + 1))[:size]
+            best = float("inf")
+            for _ in range(3):
+                t0 = time.perf_counter()
+                spans = scanner.scan(text)
+                best = min(best, (time.perf_counter() - t0) * 1000)
+            timings.append(best)
+            print(f"scan    {name:<18} {size // 1_000_000}MB {best:9.1f}ms spans={len(spans)}")
+        assert timings[1] < timings[0] * 3, f"scan of {name!r} grows superlinearly: {timings}"
+
+
+def check_alignment():
+    for original, redacted, counts, expected in ALIGN_CASES:
+        findings = align_findings(original, redacted, counts)
+        quotes = None if findings is None else [f["quote"] for f in findings]
+        assert quotes == expected, f"align_findings({original!r}) -> {quotes!r}, expected {expected!r}"
+    print(f"align   {len(ALIGN_CASES)} cases ok")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    check_alignment()
+    bench(LocalDlpProvider(), iterations)
+    google = GoogleDlpProvider()
+    if google.is_ready():
+        bench(google, max(1, iterations // 20))
+    else:
+        print("google  skipped (DLP disabled or not configured)")
+    bench_scanner()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Requests/sec on /healthz: pure-ASGI RequestIdMiddleware vs the previous
+BaseHTTPMiddleware version (and no middleware as the floor).
+Each variant is the ops router plus UploadSizeLimitMiddleware and the
+request-id middleware under test, driven in-process over httpx's ASGI
+transport with N concurrent clients, so the numbers are framework + middleware
+overhead only. Also checks that a StreamingResponse reaches the client chunk
+by chunk with the X-Request-Id header.
+Usage: python scripts/bench_healthz.py [--seconds 3] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import StreamingResponse  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from backend.core.constants import Headers, Routes  # noqa: E402
+from backend.routers import ops  # noqa: E402
+from backend.utils.request_id import RequestIdMiddleware  # noqa: E402
+from backend.utils.uploads import UploadSizeLimitMiddleware  # noqa: E402
+
+STREAM_PATH = "/_bench/stream"
+STREAM_CHUNKS = 5
+
+
+class BaseHttpRequestIdMiddleware(BaseHTTPMiddleware):
+	"""The previous implementation, kept here as the baseline."""
+	async def dispatch(self, request: Request, call_next):
+		request_id = request.headers.get(Headers.REQUEST_ID) or str(uuid.uuid4())
+		request.state.request_id = request_id
+		response = await call_next(request)
+		response.headers[Headers.REQUEST_ID] = request_id
+		return response
+
+
+def build_app(middleware: Optional[type]) -> FastAPI:
+	app = FastAPI()
+	app.include_router(ops.router)
+
+	@app.get(STREAM_PATH)
+	async def stream() -> StreamingResponse:
+		async def chunks() -> AsyncIterator[bytes]:
+			for i in range(STREAM_CHUNKS):
+				yield f"chunk-{i}\n".encode()
+				await asyncio.sleep(0)
+		return StreamingResponse(chunks(), media_type="text/plain")
+
+	app.add_middleware(UploadSizeLimitMiddleware)
+	if middleware is not None:
+		app.add_middleware(middleware)
+	return app
+
+
+async def check_streaming(app: FastAPI) -> None:
+	async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+		async with client.stream("GET", STREAM_PATH, headers={Headers.REQUEST_ID: "bench-stream"}) as response:
+			assert response.headers.get(Headers.REQUEST_ID) == "bench-stream", response.headers
+			body = b"".join([chunk async for chunk in response.aiter_raw()])
+	assert body.count(b"chunk-") == STREAM_CHUNKS, body
+
+
+async def requests_per_second(app: FastAPI, seconds: float, concurrency: int) -> float:
+	async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+		for _ in range(100):  # warm-up
+			await client.get(Routes.HEALTHZ)
+		done = 0
+		deadline = time.perf_counter() + seconds
+
+		async def worker() -> None:
+			nonlocal done
+			while time.perf_counter() < deadline:
+				response = await client.get(Routes.HEALTHZ)
+				assert response.status_code == 200
+				done += 1
+
+		start = time.perf_counter()
+		await asyncio.gather(*(worker() for _ in range(concurrency)))
+		return done / (time.perf_counter() - start)
+
+
+async def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--seconds", type=float, default=3.0)
+	parser.add_argument("--concurrency", type=int, default=16)
+	args = parser.parse_args()
+
+	variants = (
+		("no request-id middleware", None),
+		("BaseHTTPMiddleware (before)", BaseHttpRequestIdMiddleware),
+		("pure ASGI (after)", RequestIdMiddleware),
+	)
+	await check_streaming(build_app(RequestIdMiddleware))
+	results = {}
+	for name, middleware in variants:
+		results[name] = await requests_per_second(build_app(middleware), args.seconds, args.concurrency)
+		print(f"{name:<30} {results[name]:>9,.0f} req/s")
+	before, after = results[variants[1][0]], results[variants[2][0]]
+	print(f"pure ASGI vs BaseHTTPMiddleware: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+	asyncio.run(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Query-count regression check for invitation listings.
+Seeds N pending invitations (each from a distinct sender) and asserts that
+InvitationsService.list_for_caregiver / list_for_recipient issue the same
+number of SQL statements for every N (no per-row sender lookups). Paginated
+calls must return one page with the full total (LIMIT/OFFSET + COUNT in SQL).
+Usage: python scripts/bench_invitation_queries.py [database_url]
+Defaults to in-memory SQLite; JSONB columns are rendered as JSON there.
+"""
+import sys
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.dialects.postgresql import JSONB  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from backend.core.constants import InvitationStatus, Keys, Roles  # noqa: E402
+from backend.db.models import Base, Invitation, User  # noqa: E402
+from backend.services.invitations_service import InvitationsService  # noqa: E402
+
+SIZES = (1, 10, 300)
+PAGE_LIMIT = 25
+PAGE_OFFSET = 5
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_sqlite(type_, compiler, **kw):
+	return "JSON"
+
+
+class QueryCounter:
+	def __init__(self, engine) -> None:
+		self.count = 0
+		event.listen(engine, "before_cursor_execute", self._on_execute)
+
+	def _on_execute(self, *args) -> None:
+		self.count += 1
+
+
+def _user(email: str, role: str) -> User:
+	return User(id=uuid.uuid4(), username=email, email=email, full_name=email.split("@")[0], role=role, password_hash="x", corpus_uri="")
+
+
+def seed(db, n: int):
+	caregiver = _user(f"cg-{uuid.uuid4().hex[:8]}@example.com", Roles.CAREGIVER)
+	recipient = _user(f"rc-{uuid.uuid4().hex[:8]}@example.com", Roles.RECIPIENT)
+	db.add_all([caregiver, recipient])
+	for _ in range(n):
+		# Invites to the caregiver, each sent by a different recipient
+		sender = _user(f"s-{uuid.uuid4().hex[:8]}@example.com", Roles.RECIPIENT)
+		db.add(sender)
+		db.add(Invitation(caregiver_id=caregiver.id, recipient_id=sender.id, status=InvitationStatus.PENDING, sent_by=Roles.RECIPIENT))
+		# Invites to the recipient, each sent by a different caregiver
+		sender = _user(f"s-{uuid.uuid4().hex[:8]}@example.com", Roles.CAREGIVER)
+		db.add(sender)
+		db.add(Invitation(caregiver_id=sender.id, recipient_id=recipient.id, status=InvitationStatus.PENDING, sent_by=Roles.CAREGIVER))
+	db.commit()
+	return caregiver.id, recipient.id
+
+
+def main() -> None:
+	url = sys.argv[1] if len(sys.argv) > 1 else "sqlite://"
+	engine = create_engine(url)
+	Base.metadata.create_all(engine)
+	Session = sessionmaker(bind=engine, expire_on_commit=False)
+	counter = QueryCounter(engine)
+	service = InvitationsService()
+	counts = {}
+	for n in SIZES:
+		with Session() as db:
+			caregiver_id, recipient_id = seed(db, n)
+		for name, call in (
+			("list_for_caregiver", lambda db: service.list_for_caregiver(db, caregiver_id=caregiver_id)),
+			("list_for_recipient", lambda db: service.list_for_recipient(db, recipient_id=recipient_id)),
+		):
+			with Session() as db:
+				counter.count = 0
+				t0 = time.perf_counter()
+				result = call(db)
+				elapsed = (time.perf_counter() - t0) * 1000
+				assert len(result[Keys.ITEMS]) == n, (name, n, len(result[Keys.ITEMS]))
+				assert all(item[Keys.SENDER_EMAIL] for item in result[Keys.ITEMS]), name
+				counts.setdefault(name, []).append(counter.count)
+				print(f"{name:<20} n={n:<4} queries={counter.count} {elapsed:8.2f}ms")
+		for name, call in (
+			("page_for_caregiver", lambda db: service.list_for_caregiver(db, caregiver_id=caregiver_id, limit=PAGE_LIMIT, offset=PAGE_OFFSET)),
+			("page_for_recipient", lambda db: service.list_for_recipient(db, recipient_id=recipient_id, limit=PAGE_LIMIT, offset=PAGE_OFFSET)),
+		):
+			with Session() as db:
+				counter.count = 0
+				t0 = time.perf_counter()
+				result = call(db)
+				elapsed = (time.perf_counter() - t0) * 1000
+				expected = max(0, min(PAGE_LIMIT, n - PAGE_OFFSET))
+				assert len(result[Keys.ITEMS]) == expected, (name, n, len(result[Keys.ITEMS]))
+				assert result[Keys.TOTAL] == n, (name, n, result[Keys.TOTAL])
+				print(f"{name:<20} n={n:<4} queries={counter.count} {elapsed:8.2f}ms total={result[Keys.TOTAL]}")
+	for name, per_size in counts.items():
+		assert len(set(per_size)) == 1, f"{name}: query count grows with list size {dict(zip(SIZES, per_size))}"
+	print("ok: constant query count")
+
+
+if __name__ == "__main__":
+	main()
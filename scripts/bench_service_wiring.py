@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Per-request cost of service wiring: fresh construction vs the app container.
+"before" rebuilds each service graph the way the old routers/deps.py
+providers did (new repositories, a new VertexRagClient + settings read for
+DocsService, a new DlpService); "after" returns the container's app-scoped
+instances. A simulated request resolves a typical handler's providers.
+Reports latency per request and bytes allocated per request (kept alive
+until the "response", as during a real request).
+Usage: python scripts/bench_service_wiring.py [--requests 20000]
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from backend.container import ServiceContainer  # noqa: E402
+from backend.repositories.access_repo import AccessRepository  # noqa: E402
+from backend.repositories.dependents_repo import DependentsRepository  # noqa: E402
+from backend.repositories.group_member_invites_repo import GroupMemberInvitesRepository  # noqa: E402
+from backend.repositories.group_memberships_repo import GroupMembershipsRepository  # noqa: E402
+from backend.repositories.groups_repo import GroupsRepository  # noqa: E402
+from backend.repositories.invitations_repo import InvitationsRepository  # noqa: E402
+from backend.repositories.payment_codes_repo import PaymentCodesRepository  # noqa: E402
+from backend.services import DocsService, IngestionService  # noqa: E402
+from backend.services.access_service import AccessService  # noqa: E402
+from backend.services.dependents_service import DependentsService  # noqa: E402
+from backend.services.dlp_service import DlpService  # noqa: E402
+from backend.services.group_member_invites_service import GroupMemberInvitesService  # noqa: E402
+from backend.services.groups_service import GroupsService, MembershipsService  # noqa: E402
+from backend.services.invitations_service import InvitationsService  # noqa: E402
+from backend.services.payment_codes_service import PaymentCodesService  # noqa: E402
+
+# The previous per-request providers
+BEFORE: Dict[str, Callable[[], Any]] = {
+	"groups_service": lambda: GroupsService(groups_repo=GroupsRepository(), members_repo=GroupMembershipsRepository()),
+	"memberships_service": lambda: MembershipsService(groups_repo=GroupsRepository(), memberships_repo=GroupMembershipsRepository()),
+	"payment_codes_service": lambda: PaymentCodesService(repo=PaymentCodesRepository(), members=GroupMembershipsRepository(), groups=GroupsRepository()),
+	"invitations_service": lambda: InvitationsService(repo=InvitationsRepository(), access_repo=AccessRepository()),
+	"access_service": lambda: AccessService(repo=AccessRepository()),
+	"docs_service": lambda: DocsService(),
+	"ingestion_service": lambda: IngestionService(),
+	"dlp_service": lambda: DlpService(),
+	"group_member_invites_service": lambda: GroupMemberInvitesService(repo=GroupMemberInvitesRepository(), memberships=GroupMembershipsRepository()),
+	"dependents_service": lambda: DependentsService(repo=DependentsRepository(), memberships=GroupMembershipsRepository()),
+}
+
+# Providers resolved per simulated request (upload handler + an access/invitations handler)
+REQUEST = ("docs_service", "ingestion_service", "dlp_service", "invitations_service", "access_service")
+
+
+def simulate(resolve: Callable[[str], Any]) -> List[Any]:
+	return [resolve(name) for name in REQUEST]
+
+
+def latency_us(resolve: Callable[[str], Any], requests: int) -> float:
+	start = time.perf_counter()
+	for _ in range(requests):
+		simulate(resolve)
+	return (time.perf_counter() - start) / requests * 1e6
+
+
+def bytes_per_request(resolve: Callable[[str], Any], requests: int) -> float:
+	tracemalloc.start()
+	try:
+		before, _ = tracemalloc.get_traced_memory()
+		alive = [simulate(resolve) for _ in range(requests)]
+		after, _ = tracemalloc.get_traced_memory()
+	finally:
+		tracemalloc.stop()
+	# Subtract the holding lists themselves
+	overhead = sys.getsizeof(alive) + sum(sys.getsizeof(item) for item in alive)
+	return max(0.0, (after - before - overhead) / requests)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--requests", type=int, default=20_000)
+	args = parser.parse_args()
+
+	container = ServiceContainer()
+	container.start()
+	before = lambda name: BEFORE[name]()  # noqa: E731
+	after = lambda name: getattr(container, name)  # noqa: E731
+	assert simulate(after)[0] is simulate(after)[0]
+
+	sample = max(1, args.requests // 10)
+	rows = (
+		("per-request construction (before)", latency_us(before, args.requests), bytes_per_request(before, sample)),
+		("app-scoped container (after)", latency_us(after, args.requests), bytes_per_request(after, sample)),
+	)
+	print(f"providers per request: {', '.join(REQUEST)}")
+	for name, us, allocated in rows:
+		print(f"{name:<36} {us:>8.2f} us/request {allocated:>10,.0f} bytes/request")
+	print(f"speedup: {rows[0][1] / rows[1][1]:.1f}x")
+
+
+if __name__ == "__main__":
+	main()
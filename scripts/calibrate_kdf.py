@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Pick password-hash cost for this hardware.
+Times one hash under the current policy, then searches for the PBKDF2
+iteration count and the scrypt n (r, p fixed) closest to a target
+milliseconds-per-hash. Prints the matching env settings. Each hash occupies a
+KDF worker for that long, so target_ms * logins/sec / KDF_WORKERS is the CPU
+budget being chosen. Existing hashes are upgraded on next login.
+Usage: python scripts/calibrate_kdf.py [--target-ms 50] [--samples 5] [--scrypt-r 8] [--scrypt-p 1]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from backend.core.constants import Auth as AuthConst, Kdf  # noqa: E402
+from backend.security.passwords import KdfPolicy, current_policy, hash_password, verify_password  # noqa: E402
+
+PASSWORD = "calibration-password"
+# scrypt n is a power of two; stop before the memory cost gets silly (2**20 * 128 * 8 = 1 GiB)
+SCRYPT_LOG2_N = range(10, 21)
+
+
+def time_ms(fn: Callable[[], object], samples: int) -> float:
+	fn()  # warm-up
+	runs = []
+	for _ in range(samples):
+		start = time.perf_counter()
+		fn()
+		runs.append((time.perf_counter() - start) * 1000)
+	return statistics.median(runs)
+
+
+def policy_ms(policy: KdfPolicy, samples: int) -> float:
+	return time_ms(lambda: hash_password(PASSWORD, policy=policy), samples)
+
+
+def calibrate_pbkdf2(target_ms: float, samples: int) -> KdfPolicy:
+	# PBKDF2 cost is linear in iterations: scale from a probe, then confirm
+	probe = KdfPolicy(scheme=AuthConst.PASSWORD_SCHEME_PBKDF2_SHA256, pbkdf2_iterations=20_000)
+	per_iter = policy_ms(probe, samples) / probe.pbkdf2_iterations
+	iterations = max(10_000, int(round(target_ms / per_iter, -3)))
+	return KdfPolicy(scheme=AuthConst.PASSWORD_SCHEME_PBKDF2_SHA256, pbkdf2_iterations=iterations)
+
+
+def calibrate_scrypt(target_ms: float, samples: int, r: int, p: int) -> KdfPolicy:
+	# Largest n at or under the target (n doubles, so the next step is ~2x the time)
+	best = KdfPolicy(scheme=AuthConst.PASSWORD_SCHEME_SCRYPT, scrypt_n=2 ** SCRYPT_LOG2_N[0], scrypt_r=r, scrypt_p=p)
+	for log2_n in SCRYPT_LOG2_N:
+		try:
+			candidate = KdfPolicy(scheme=AuthConst.PASSWORD_SCHEME_SCRYPT, scrypt_n=2 ** log2_n, scrypt_r=r, scrypt_p=p)
+		except ValueError:
+			# Past the memory hashlib allows for this r, p
+			break
+		if policy_ms(candidate, samples) > target_ms:
+			break
+		best = candidate
+	return best
+
+
+def describe(policy: KdfPolicy, samples: int) -> str:
+	encoded = hash_password(PASSWORD, policy=policy)
+	assert verify_password(PASSWORD, encoded)
+	ms = policy_ms(policy, samples)
+	memory = f", ~{128 * policy.scrypt_n * policy.scrypt_r // (1 << 20)} MiB" if policy.scheme == AuthConst.PASSWORD_SCHEME_SCRYPT else ""
+	return f"{policy.scheme}${policy.params}: {ms:.1f} ms/hash{memory}"
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--target-ms", type=float, default=Kdf.DEFAULT_TARGET_MS)
+	parser.add_argument("--samples", type=int, default=5)
+	parser.add_argument("--scrypt-r", type=int, default=Kdf.DEFAULT_SCRYPT_R)
+	parser.add_argument("--scrypt-p", type=int, default=Kdf.DEFAULT_SCRYPT_P)
+	args = parser.parse_args()
+
+	print(f"current  {describe(current_policy(), args.samples)}")
+	pbkdf2 = calibrate_pbkdf2(args.target_ms, args.samples)
+	print(f"pbkdf2   {describe(pbkdf2, args.samples)}")
+	scrypt = calibrate_scrypt(args.target_ms, args.samples, args.scrypt_r, args.scrypt_p)
+	print(f"scrypt   {describe(scrypt, args.samples)}")
+	print(f"\n# target {args.target_ms:g} ms/hash")
+	print(f"PASSWORD_SCHEME={AuthConst.PASSWORD_SCHEME_PBKDF2_SHA256}\nPBKDF2_ITERATIONS={pbkdf2.pbkdf2_iterations}")
+	print(f"# or, memory-hard:\nPASSWORD_SCHEME={AuthConst.PASSWORD_SCHEME_SCRYPT}\nSCRYPT_N={scrypt.scrypt_n}\nSCRYPT_R={scrypt.scrypt_r}\nSCRYPT_P={scrypt.scrypt_p}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+EXPLAIN check for the invitation / access-edge indexes (alembic 20261017_0013)
+and the keyset pagination indexes (alembic 20261017_0014).
+Seeds users, invitations (mostly non-pending), access edges and group rows
+(memberships, payment codes, member invites, dependents; one large group)
+inside a transaction, ANALYZEs, then asserts each hot query plans an index scan
+on the expected index rather than a sequential scan, and that cursor pages
+(seek on (created_at, id)) need no sort. Everything is rolled back.
+Requires PostgreSQL migrated to head (partial indexes are Postgres-only).
+Usage: python scripts/check_index_usage.py [database_url]   (default: DATABASE_URL)
+"""
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine, insert, select, text  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend.core.constants import InvitationStatus, PaymentCodeStatus, Roles  # noqa: E402
+from backend.core.settings import get_settings  # noqa: E402
+from backend.db.models import Dependent, Group, GroupMemberInvite, GroupMembership, GroupPaymentCode, Invitation, RecipientCaregiverAccess, User  # noqa: E402
+from backend.repositories import invitations_repo  # noqa: E402
+from backend.utils.pagination import seek  # noqa: E402
+
+USERS = 20_000
+INVITATIONS = 50_000
+PENDING_SHARE = 0.05
+EDGES = 20_000
+GROUPS = 50
+# Share of the group rows (and all but GROUPS of the memberships) in the one large group
+LARGE_GROUP_SHARE = 0.3
+GROUP_ROWS = 20_000
+INVITE_PENDING_SHARE = 0.5
+PAGE = 50
+BASE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def seed(db: Session) -> Tuple[User, User]:
+	rng = random.Random(13)
+	user_rows = [
+		{
+			"id": uuid.uuid4(), "username": f"idx-{i}", "email": f"idx-{i}@example.com", "full_name": f"idx {i}",
+			"role": Roles.CAREGIVER if i % 2 else Roles.RECIPIENT, "password_hash": "x", "corpus_uri": "", "created_at": BASE_TIME + timedelta(seconds=i),
+		}
+		for i in range(USERS)
+	]
+	db.execute(insert(User), user_rows)
+	ids = [u["id"] for u in user_rows]
+	statuses = (InvitationStatus.ACCEPTED, InvitationStatus.DECLINED)
+	db.execute(
+		insert(Invitation),
+		[
+			{
+				"caregiver_id": rng.choice(ids),
+				"recipient_id": rng.choice(ids),
+				"status": InvitationStatus.PENDING if rng.random() < PENDING_SHARE else rng.choice(statuses),
+				"sent_by": rng.choice((Roles.CAREGIVER, Roles.RECIPIENT)),
+			}
+			for _ in range(INVITATIONS)
+		],
+	)
+	edges = {(rng.choice(ids), rng.choice(ids)) for _ in range(EDGES)}
+	db.execute(insert(RecipientCaregiverAccess), [{"recipient_id": r, "caregiver_id": c} for r, c in edges])
+	# Odd rows are caregivers, even rows recipients
+	caregiver = db.scalar(select(User).where(User.id == ids[1]))
+	recipient = db.scalar(select(User).where(User.id == ids[0]))
+	return caregiver, recipient
+
+
+def seed_groups(db: Session) -> uuid.UUID:
+	"""Group rows with distinct created_at (NOW() is constant within the transaction); returns the large group."""
+	rng = random.Random(14)
+	ids = list(db.scalars(select(User.id)))
+	group_ids = [uuid.uuid4() for _ in range(GROUPS)]
+	db.execute(insert(Group), [{"id": g, "name": f"idx-group-{i}", "created_by": ids[i]} for i, g in enumerate(group_ids)])
+	large = group_ids[0]
+
+	def group_for(i: int) -> uuid.UUID:
+		return large if rng.random() < LARGE_GROUP_SHARE else group_ids[1 + i % (GROUPS - 1)]
+
+	def at(i: int) -> datetime:
+		return BASE_TIME + timedelta(seconds=i)
+
+	# One membership per user: the small groups get one member each, the large group the rest
+	db.execute(
+		insert(GroupMembership),
+		[{"group_id": large if i >= GROUPS - 1 else group_ids[1 + i], "user_id": u, "created_at": at(i)} for i, u in enumerate(ids)],
+	)
+	db.execute(
+		insert(GroupPaymentCode),
+		[
+			{"group_id": group_for(i), "code": f"idx-code-{i}", "created_by": rng.choice(ids), "status": PaymentCodeStatus.ACTIVE, "created_at": at(i)}
+			for i in range(GROUP_ROWS)
+		],
+	)
+	statuses = (InvitationStatus.ACCEPTED, InvitationStatus.DECLINED)
+	db.execute(
+		insert(GroupMemberInvite),
+		[
+			{
+				"group_id": group_for(i),
+				"invited_email": f"idx-invite-{i}@example.com",
+				"status": InvitationStatus.PENDING if rng.random() < INVITE_PENDING_SHARE else rng.choice(statuses),
+				"invited_by": rng.choice(ids),
+				"created_at": at(i),
+			}
+			for i in range(GROUP_ROWS)
+		],
+	)
+	db.execute(
+		insert(Dependent),
+		[
+			{
+				"group_id": group_for(i),
+				"guardian_user_id": rng.choice(ids),
+				"full_name": f"idx dependent {i}",
+				"deleted_at": at(i) if rng.random() < 0.1 else None,
+				"created_at": at(i),
+			}
+			for i in range(GROUP_ROWS)
+		],
+	)
+	return large
+
+
+def plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+	yield plan
+	for child in plan.get("Plans") or []:
+		yield from plan_nodes(child)
+
+
+def explain(db: Session, stmt) -> List[Dict[str, Any]]:
+	sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+	raw = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + sql).scalar()
+	return list(plan_nodes(raw[0]["Plan"]))
+
+
+def check(db: Session, name: str, stmt, table: str, expected: Set[str], *, ordered: bool = False) -> bool:
+	"""ordered: the index must also deliver the ORDER BY, i.e. no Sort node (keyset pages)."""
+	nodes = explain(db, stmt)
+	on_table = [n for n in nodes if n.get("Relation Name") == table or n.get("Index Name") in expected]
+	seq = [n for n in on_table if n["Node Type"] == "Seq Scan"]
+	used = {n["Index Name"] for n in nodes if n.get("Index Name")}
+	sort = ordered and any(n["Node Type"] in ("Sort", "Incremental Sort") for n in nodes)
+	ok = not seq and not sort and bool(used & expected)
+	print(f"{'ok ' if ok else 'FAIL'} {name:<28} indexes={sorted(used)} seq_scan={bool(seq)}{f' sort={sort}' if ordered else ''}")
+	return ok
+
+
+def keyset_checks(db: Session, group_id: uuid.UUID) -> List[bool]:
+	pages = (
+		("members_page", select(GroupMembership).where(GroupMembership.group_id == group_id), GroupMembership, "group_memberships", "ix_group_memberships_group_created", USERS),
+		(
+			"payment_codes_page",
+			select(GroupPaymentCode).where(GroupPaymentCode.group_id == group_id),
+			GroupPaymentCode,
+			"group_payment_codes",
+			"ix_group_payment_codes_group_created",
+			GROUP_ROWS,
+		),
+		(
+			"member_invites_page",
+			select(GroupMemberInvite).where(GroupMemberInvite.group_id == group_id, GroupMemberInvite.status == InvitationStatus.PENDING),
+			GroupMemberInvite,
+			"group_member_invites",
+			"ix_group_member_invites_group_created_pending",
+			GROUP_ROWS,
+		),
+		("dependents_page", select(Dependent).where(Dependent.group_id == group_id, Dependent.deleted_at.is_(None)), Dependent, "dependents", "ix_dependents_group_created", GROUP_ROWS),
+		("users_page", select(User), User, "users", "ix_users_created_at_id", USERS),
+	)
+	# Cursor from the middle of each table: pages after the first are the ones OFFSET made expensive
+	return [
+		check(
+			db,
+			name,
+			seek(stmt, model.created_at, model.id, limit=PAGE + 1, offset=0, after=(BASE_TIME + timedelta(seconds=rows // 2), uuid.UUID(int=0))),
+			table,
+			{index},
+			ordered=True,
+		)
+		for name, stmt, model, table, index, rows in pages
+	]
+
+
+def main() -> None:
+	url = sys.argv[1] if len(sys.argv) > 1 else get_settings().database_url
+	engine = create_engine(url)
+	if engine.dialect.name != "postgresql":
+		sys.exit("check_index_usage requires PostgreSQL")
+	with Session(engine) as db:
+		try:
+			caregiver, recipient = seed(db)
+			large_group = seed_groups(db)
+			# Planner statistics for the seeded rows (ANALYZE is allowed inside the transaction)
+			db.execute(text("ANALYZE users, invitations, recipient_caregiver_access, groups, group_memberships, group_payment_codes, group_member_invites, dependents"))
+			results = [
+				check(
+					db,
+					"pending_for_caregiver",
+					invitations_repo._page(invitations_repo._with_sender(*invitations_repo._pending_for_caregiver(caregiver.id, caregiver.email)), 50, 0),
+					"invitations",
+					{"ix_invitations_caregiver_pending", "ix_invitations_invited_email_pending"},
+				),
+				check(
+					db,
+					"pending_for_recipient",
+					invitations_repo._page(invitations_repo._with_sender(*invitations_repo._pending_for_recipient(recipient.id, recipient.email)), 50, 0),
+					"invitations",
+					{"ix_invitations_recipient_pending", "ix_invitations_invited_email_pending"},
+				),
+				check(
+					db,
+					"pending_sent_by_recipient",
+					invitations_repo._page(select(Invitation).where(*invitations_repo._pending_sent_by_recipient(recipient.id)), 50, 0),
+					"invitations",
+					{"ix_invitations_recipient_pending"},
+				),
+				check(
+					db,
+					"access_edge",
+					select(RecipientCaregiverAccess).where(
+						RecipientCaregiverAccess.recipient_id == recipient.id,
+						RecipientCaregiverAccess.caregiver_id == caregiver.id,
+					),
+					"recipient_caregiver_access",
+					{"uq_rca_recipient_caregiver"},
+				),
+				check(
+					db,
+					"access_for_caregiver",
+					select(RecipientCaregiverAccess).where(RecipientCaregiverAccess.caregiver_id == caregiver.id),
+					"recipient_caregiver_access",
+					{"ix_rca_caregiver_id"},
+				),
+				*keyset_checks(db, large_group),
+			]
+		finally:
+			db.rollback()
+	if not all(results):
+		sys.exit("index check failed")
+	print("ok: all hot queries use their indexes")
+
+
+if __name__ == "__main__":
+	main()